@@ -1,3 +1,13 @@
-from . import console
+def main():
+    """The entry point of the CLI (the `recodex` script and `python -m recodex_cli`).
+    """
+    # the call commands are executed by the daemon if it is running (the rest of the CLI is not loaded then)
+    from .daemon_command import daemon_client
+    daemon_client.forward_if_running()
 
-console.app()
+    from . import console
+    console.app()
+
+
+if __name__ == "__main__":
+    main()
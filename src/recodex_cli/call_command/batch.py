@@ -0,0 +1,221 @@
+import sys
+import json
+import asyncio
+import contextlib
+import typer
+from typing import Any
+from collections.abc import Iterator
+from recodex.client import Client
+from recodex.client_components.client_response import ClientResponse
+
+from . import command as cmd
+from .command_state import CommandState
+from ..utils import timings
+from ..utils.worker_pool import run_bounded
+
+
+def call_batch(client: Client, batch_path: str, jobs: int, state: CommandState):
+    """Executes all requests from a JSONL file on a bounded worker pool and prints the results as NDJSON.
+
+    Each non-empty line is a JSON object with the following keys:
+    `endpoint` (required, <presenter.action> format), `path` (list of PATH values),
+    `query` (list of <name=value> strings or a name->value object), and `body` (request body object).
+
+    Every printed result is tagged with the (1-based) line number of the request, the results are printed
+    in order of completion. The projection of the state (if any) is applied to every response.
+
+    Args:
+        client (Client): The client object shared by all workers.
+        batch_path (str): The path to the JSONL file, or '-' for stdin.
+        jobs (int): The maximal number of concurrently executed requests.
+        state (CommandState): The state detailing extra info for the command execution.
+
+    Raises:
+        Exception: Thrown when the file could not be opened or if any of the requests failed.
+    """
+
+    def worker(numbered_line: tuple[int, str]) -> ClientResponse:
+        _, line = numbered_line
+        request = parse_batch_line(line)
+        return cmd.send_request(
+            client,
+            request["endpoint"],
+            request["path"],
+            request["query"],
+            request["body"],
+        )
+
+    total, failed = 0, 0
+    with open_batch_file(batch_path) as handle:
+        for (line_number, _), response, error in run_bounded(worker, read_batch_lines(handle), jobs):
+            total += 1
+            failed += not _print_result(line_number, response, error, state)
+
+    _finish_batch(total, failed, state)
+
+
+def call_batch_async(client: Client, batch_path: str, jobs: int, state: CommandState):
+    """Executes all requests from a JSONL file using the asynchronous engine and prints the results as NDJSON.
+    The format of the file and the results is the same as in `call_batch`, but the requests are sent
+    from a single thread by an asyncio event loop (not a thread per request), which is better suited
+    for thousands of small requests.
+
+    Args:
+        client (Client): The client object used to prepare the requests.
+        batch_path (str): The path to the JSONL file, or '-' for stdin.
+        jobs (int): The maximal number of concurrently executed requests.
+        state (CommandState): The state detailing extra info for the command execution.
+
+    Raises:
+        Exception: Thrown when the file could not be opened or if any of the requests failed.
+    """
+
+    from ..utils import async_engine
+
+    async def execute(engine: async_engine.AsyncEngine, line_number: int, line: str) -> bool:
+        try:
+            request = parse_batch_line(line)
+            response = await cmd.async_send_request(
+                engine,
+                request["endpoint"],
+                request["path"],
+                request["query"],
+                request["body"],
+            )
+        except Exception as e:
+            return _print_result(line_number, None, e, state)
+        return _print_result(line_number, response, None, state)
+
+    async def run_batch(engine: async_engine.AsyncEngine) -> tuple[int, int]:
+        total, failed = 0, 0
+        pending: set[asyncio.Task] = set()
+        with open_batch_file(batch_path) as handle:
+            # only a bounded window of lines is read ahead (the same as in the worker pool)
+            for line_number, line in read_batch_lines(handle):
+                if len(pending) >= jobs * 2:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    failed += sum(not task.result() for task in done)
+                pending.add(asyncio.create_task(execute(engine, line_number, line)))
+                total += 1
+        if pending:
+            done, _ = await asyncio.wait(pending)
+            failed += sum(not task.result() for task in done)
+        return total, failed
+
+    total, failed = async_engine.run(client, run_batch, jobs)  # type: ignore
+    _finish_batch(total, failed, state)
+
+
+def parse_batch_line(line: str) -> dict[str, Any]:
+    """Parses a single line of a batch file into request parameters.
+
+    Args:
+        line (str): A JSON object describing the request.
+
+    Raises:
+        Exception: Thrown when the line is not a valid request description.
+
+    Returns:
+        dict[str, Any]: Returns a dictionary with the endpoint, path, query, and body keys.
+    """
+
+    try:
+        request = json.loads(line)
+    except:
+        raise Exception("The line is not a valid JSON.")
+    if not isinstance(request, dict):
+        raise Exception("The line needs to be a JSON object.")
+
+    endpoint = request.get("endpoint")
+    if not isinstance(endpoint, str):
+        raise Exception("The 'endpoint' key is missing or it is not a string.")
+
+    path = request.get("path", [])
+    if not isinstance(path, list):
+        raise Exception("The 'path' key needs to be a list of PATH parameter values.")
+
+    query = request.get("query", [])
+    if isinstance(query, dict):
+        # convert to the <name=value> format used on the command line
+        query = [f"{name}={_query_value_to_str(value)}" for name, value in query.items()]
+    elif not isinstance(query, list):
+        raise Exception("The 'query' key needs to be a list of <name=value> strings or an object.")
+
+    body = request.get("body", {})
+    if body is None:
+        body = {}
+
+    return {
+        "endpoint": endpoint,
+        "path": [str(value) for value in path],
+        "query": [str(value) for value in query],
+        "body": body,
+    }
+
+
+def _print_result(
+    line_number: int, response: ClientResponse | None, error: Exception | None, state: CommandState
+) -> bool:
+    # prints the result tagged with the line number and returns whether the request succeeded
+    # (a response that cannot be projected is reported as a failure of its line)
+    with timings.span("write_output", line=line_number):
+        record: dict[str, Any] = {"line": line_number}
+        if error is None and response is not None:
+            try:
+                record.update(status=response.status, response=_get_response_data(response, state))
+            except Exception as e:
+                error = e
+        if error is not None:
+            record = {"line": line_number, "error": str(error)}
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+    return error is None
+
+
+def _finish_batch(total: int, failed: int, state: CommandState):
+    if state.verbose:
+        typer.echo(f"Processed {total} requests ({failed} failed).", err=True)
+    if failed > 0:
+        raise Exception(f"{failed} of {total} requests failed.")
+
+
+def _query_value_to_str(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    # numbers, booleans, arrays and objects are passed as JSON (same as on the command line)
+    return json.dumps(value)
+
+
+def _get_response_data(response, state: CommandState) -> Any:
+    parsed = response.get_parsed_data()
+    if state.projection is not None:
+        if parsed is None:
+            raise Exception("The response data is not in JSON format.")
+        return state.projection.apply(parsed)
+    if parsed is not None:
+        return parsed
+    return response.get_data_str()
+
+
+def open_batch_file(batch_path: str):
+    """Opens a batch file for reading ('-' stands for stdin, which is not closed afterwards).
+
+    Raises:
+        Exception: Thrown when the file could not be opened.
+    """
+
+    if batch_path == "-":
+        # do not close the stdin after the batch is processed
+        return contextlib.nullcontext(sys.stdin)
+    try:
+        return open(batch_path, "r")
+    except:
+        raise Exception("Could not open the batch file.")
+
+
+def read_batch_lines(handle) -> Iterator[tuple[int, str]]:
+    """Yields the (1-based) line numbers and the non-empty lines of a batch file.
+    """
+
+    for line_number, line in enumerate(handle, start=1):
+        if line.strip() != "":
+            yield line_number, line
@@ -1,16 +1,25 @@
 import typer
 import inquirer
 import click
-from typing import Any
+from typing import Any, TYPE_CHECKING
 from collections.abc import Callable
 from recodex.client import Client
 from recodex.client_components.endpoint_resolver import EndpointResolver
+from recodex.client_components.client_response import ClientResponse
 
 from .response_printer import print_response
 from ..utils import cmd_utils as cmd_utils
+from ..utils.endpoint_index import IndexedEndpointResolver
+from ..utils.endpoint_search import EndpointSearch
 from .help_printer import HelpPrinter
 from .command_state import CommandState
 
+if TYPE_CHECKING:
+    from ..utils.async_engine import AsyncEngine
+
+# the number of the best matching endpoints offered by the interactive search
+SEARCH_CHOICES = 15
+
 
 def call_interactive(client: Client, state: CommandState):
     """Starts an interactive call prompt for the user.
@@ -21,7 +30,7 @@ def call_interactive(client: Client, state: CommandState):
             Defaults to CommandState().
     """
 
-    endpoint_resolver = EndpointResolver()
+    endpoint_resolver = client.endpoint_resolver
     presenter, action = prompt_endpoint(endpoint_resolver)
     endpoint = f"{presenter}.{action}"
     path_param_values, query_param_values, body_string = prompt_request_data(endpoint_resolver, presenter, action)
@@ -53,18 +62,104 @@ def call(
         files (dict, optional): A dictionary of files uploaded to ReCodEx. Defaults to {}.
     """
 
+    if state.verbose:
+        typer.echo("Sending Request...")
+    response = send_request(client, endpoint, path_values, query_values, body, files)
+    print_response(response, state)
+
+
+def send_request(
+    client: Client,
+    endpoint: str | Callable,
+    path_values: list[str] = [],
+    query_values: list[str] = [],
+    body: dict = {},
+    files: dict = {}
+) -> ClientResponse:
+    """Validates the parameters and sends a request to a single ReCodEx endpoint.
+
+    Args:
+        client (Client): The client object used.
+        endpoint (str | Callable): A string name or function of the endpoint.
+        path_values (list[str], optional): A list of PATH parameter values in order of definition. Defaults to [].
+        query_values (list[str], optional): A list of query parameters in the form of "name=value" strings.
+            Defaults to [].
+        body (dict, optional): The body of the request. Defaults to {}.
+        files (dict, optional): A dictionary of files uploaded to ReCodEx. Defaults to {}.
+
+    Returns:
+        ClientResponse: Returns the response object.
+    """
+
     presenter, action = cmd_utils.parse_endpoint_or_throw(endpoint)
 
     # parse params
     path_dict = path_list_to_dict(client.endpoint_resolver, presenter, action, path_values)
     query_dict = query_list_to_dict(client.endpoint_resolver, presenter, action, query_values)
 
+    return client.send_request(presenter, action, body, path_dict, query_dict, files)
+
+
+async def async_call(
+    engine: "AsyncEngine",
+    endpoint: str | Callable,
+    path_values: list[str] = [],
+    query_values: list[str] = [],
+    body: dict = {},
+    state: CommandState = CommandState(),
+):
+    """Calls a single ReCodEx endpoint using the asynchronous engine (the counterpart of `call`).
+    Files cannot be uploaded this way.
+
+    Args:
+        engine (AsyncEngine): The engine used to send the request.
+        endpoint (str | Callable): A string name or function of the endpoint.
+        path_values (list[str], optional): A list of PATH parameter values in order of definition. Defaults to [].
+        query_values (list[str], optional): A list of query parameters in the form of "name=value" strings.
+            Defaults to [].
+        body (dict, optional): The body of the request. Defaults to {}.
+        state (CommandState, optional): The state detailing extra info for the command execution.
+            Defaults to CommandState().
+    """
+
     if state.verbose:
         typer.echo("Sending Request...")
-    response = client.send_request(presenter, action, body, path_dict, query_dict, files)
+    response = await async_send_request(engine, endpoint, path_values, query_values, body)
     print_response(response, state)
 
 
+async def async_send_request(
+    engine: "AsyncEngine",
+    endpoint: str | Callable,
+    path_values: list[str] = [],
+    query_values: list[str] = [],
+    body: dict = {},
+) -> ClientResponse:
+    """Validates the parameters and sends a request to a single ReCodEx endpoint using the asynchronous engine
+    (the counterpart of `send_request`).
+
+    Args:
+        engine (AsyncEngine): The engine used to send the request.
+        endpoint (str | Callable): A string name or function of the endpoint.
+        path_values (list[str], optional): A list of PATH parameter values in order of definition. Defaults to [].
+        query_values (list[str], optional): A list of query parameters in the form of "name=value" strings.
+            Defaults to [].
+        body (dict, optional): The body of the request. Defaults to {}.
+
+    Returns:
+        ClientResponse: Returns the response object.
+    """
+
+    presenter, action = cmd_utils.parse_endpoint_or_throw(endpoint)
+
+    # parse params
+    endpoint_resolver = engine.client.endpoint_resolver
+    path_dict = path_list_to_dict(endpoint_resolver, presenter, action, path_values)
+    query_dict = query_list_to_dict(endpoint_resolver, presenter, action, query_values)
+
+    return await engine.send_request(presenter, action, body, path_dict, query_dict)
+
+
 def path_list_to_dict(
     endpoint_resolver: EndpointResolver,
     presenter: str,
@@ -125,6 +220,45 @@ def query_list_to_dict(
 
 
 def prompt_endpoint(endpoint_resolver: EndpointResolver):
+    # the endpoints are found by the search index (the resolvers without the index offer the lists of all names)
+    if not isinstance(endpoint_resolver, IndexedEndpointResolver):
+        return prompt_endpoint_by_presenter(endpoint_resolver)
+
+    endpoint_search = endpoint_resolver.get_search()
+    while True:
+        question = [
+            inquirer.Text(
+                'query',
+                message="Search for an endpoint (Tab completes the best matches, leave empty to browse all)",
+                autocomplete=lambda text, state: _complete_endpoint(endpoint_search, text, state),
+            ),
+        ]
+        query = inquirer.prompt(question)['query'].strip()  # type: ignore
+        if query == "":
+            return prompt_endpoint_by_presenter(endpoint_resolver)
+
+        matches = endpoint_search.search(query, SEARCH_CHOICES)
+        if len(matches) == 0:
+            typer.echo("No endpoint matches the search.")
+            continue
+        # the endpoint completed by Tab does not need to be selected again
+        if matches[0].endpoint == query:
+            return cmd_utils.parse_endpoint_or_throw(query)
+
+        choices = [(f"{match.endpoint}  {match.summary}", match.endpoint) for match in matches]
+        question = [
+            inquirer.List(
+                'endpoint',
+                message="What endpoint would you like to use?",
+                choices=choices + [("<search again>", None)],
+            ),
+        ]
+        endpoint = inquirer.prompt(question)['endpoint']  # type: ignore
+        if endpoint is not None:
+            return cmd_utils.parse_endpoint_or_throw(endpoint)
+
+
+def prompt_endpoint_by_presenter(endpoint_resolver: EndpointResolver):
     presenter_choices = endpoint_resolver.get_presenters()
     question = [
         inquirer.List(
@@ -148,6 +282,12 @@ def prompt_endpoint(endpoint_resolver: EndpointResolver):
     return presenter, action
 
 
+def _complete_endpoint(endpoint_search: EndpointSearch, text: str, state: int) -> str | None:
+    # the readline-style completer, the repeated Tab presses cycle through the best matches
+    matches = endpoint_search.search(text, SEARCH_CHOICES)
+    return matches[state].endpoint if state < len(matches) else None
+
+
 def prompt_request_data(endpoint_resolver: EndpointResolver, presenter: str, action: str):
     path_params = endpoint_resolver.get_path_params(presenter, action)
     path_param_values = prompt_path_values(path_params)
@@ -1,3 +1,9 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .projection import Projection
+
+
 class CommandState:
     # whether debug error messages should be shown
     verbose: bool = False
@@ -14,5 +20,8 @@ class CommandState:
     # when printing the output, should an extra newline be printed
     output_extra_newline: bool = True
 
+    # if set, only the selected part of the response is printed (see --select and --where)
+    projection: "Projection | None" = None
+
     def __init__(self, verbose: bool = False):
         self.verbose = verbose
@@ -1,9 +1,9 @@
 import click
 from rich.console import Console
 from rich.panel import Panel
-from recodex.client_components.endpoint_resolver import EndpointResolver
 
 from ..utils import cmd_utils as cmd_utils
+from ..utils import client_factory
 
 
 class HelpPrinter:
@@ -87,7 +87,7 @@ class HelpPrinter:
                     lambda: cmd_utils.parse_endpoint_or_throw(endpoint),
                     verbose
                 )
-                endpoint_resolver = EndpointResolver()
+                endpoint_resolver = client_factory.get_endpoint_resolver()
                 self.console = Console()
                 path_params = endpoint_resolver.get_path_params(self.presenter, self.action)
                 query_params = endpoint_resolver.get_query_params(self.presenter, self.action)
@@ -0,0 +1,148 @@
+import sys
+import json
+import typer
+import contextlib
+from typing import Any, TextIO
+from concurrent.futures import ThreadPoolExecutor
+from recodex.client import Client
+from recodex.client_components.endpoint_resolver import EndpointResolver
+
+from . import command as cmd
+from .command_state import CommandState
+from ..utils import cmd_utils as cmd_utils
+from ..utils import timings
+
+# the names of the QUERY parameters of paginated endpoints
+OFFSET_PARAM = "offset"
+LIMIT_PARAM = "limit"
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def is_paginated(endpoint_resolver: EndpointResolver, presenter: str, action: str) -> bool:
+    """Returns whether the endpoint returns its results in pages (it accepts the offset and limit QUERY parameters).
+    """
+
+    names = [param["name"] for param in endpoint_resolver.get_query_params(presenter, action)]
+    return OFFSET_PARAM in names and LIMIT_PARAM in names
+
+
+def call_all_pages(
+    client: Client,
+    endpoint: str,
+    path_values: list[str] = [],
+    query_values: list[str] = [],
+    state: CommandState = CommandState(),
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_items: int | None = None,
+):
+    """Fetches all pages of a paginated endpoint and prints the items as NDJSON (one item per line).
+
+    The next page is requested while the items of the current one are being written,
+    so only two pages are held in memory at any time. The projection of the state (if any)
+    is applied to every item separately.
+
+    Args:
+        client (Client): The client object used.
+        endpoint (str): The name of the endpoint in <presenter.action> format.
+        path_values (list[str], optional): A list of PATH parameter values in order of definition. Defaults to [].
+        query_values (list[str], optional): A list of query parameters in the form of "name=value" strings.
+            The offset parameter sets the first fetched item. Defaults to [].
+        state (CommandState, optional): The state detailing extra info for the command execution.
+            Defaults to CommandState().
+        page_size (int, optional): The number of items requested at once. Defaults to DEFAULT_PAGE_SIZE.
+        max_items (int | None, optional): The maximal number of fetched items. Defaults to None (all items).
+
+    Raises:
+        Exception: Thrown when the endpoint is not paginated, or any of the requests failed.
+    """
+
+    presenter, action = cmd_utils.parse_endpoint_or_throw(endpoint)
+    if not is_paginated(client.endpoint_resolver, presenter, action):
+        raise Exception(
+            f"The endpoint does not support pagination "
+            f"(it has no '{OFFSET_PARAM}' and '{LIMIT_PARAM}' QUERY parameters)."
+        )
+    offset, query_values = _split_offset(query_values)
+
+    def fetch(offset: int, limit: int) -> tuple[list[Any], int | None]:
+        page_query = [*query_values, f"{OFFSET_PARAM}={offset}", f"{LIMIT_PARAM}={limit}"]
+        response = cmd.send_request(client, endpoint, path_values, page_query)
+        return _get_page_items(response.get_parsed_data())
+
+    def get_limit(written: int) -> int:
+        return page_size if max_items is None else min(page_size, max_items - written)
+
+    written, pages = 0, 0
+    with _open_output(state.output_path) as output, ThreadPoolExecutor(max_workers=1) as executor:
+        limit = get_limit(written)
+        next_page = executor.submit(fetch, offset, limit) if limit > 0 else None
+        while next_page is not None:
+            items, total_count = next_page.result()
+            items = items[:limit]
+            pages += 1
+            offset += len(items)
+
+            # request the next page before the current one is written; the server may cap the size of the pages,
+            # so a partial page is the last one only if the total number of items is not known
+            if total_count is not None:
+                has_more = len(items) > 0 and offset < total_count
+            else:
+                has_more = len(items) == limit
+            limit = get_limit(written + len(items))
+            next_page = executor.submit(fetch, offset, limit) if has_more and limit > 0 else None
+
+            with timings.span("write_output", items=len(items)):
+                for item in items:
+                    _write_item(output, item, state)
+            written += len(items)
+
+    if state.verbose:
+        typer.echo(f"Fetched {written} items in {pages} pages.", err=True)
+
+
+def _write_item(output: TextIO, item: Any, state: CommandState):
+    if state.projection is not None:
+        matches, item = state.projection.apply_to_item(item)
+        if not matches:
+            return
+    output.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+
+def _split_offset(query_values: list[str]) -> tuple[int, list[str]]:
+    # returns the initial offset and the other QUERY values
+    offset, rest = 0, []
+    for query_value in query_values:
+        name, _, value = query_value.partition("=")
+        if name == LIMIT_PARAM:
+            raise Exception(f"Use --page-size instead of the '{LIMIT_PARAM}' QUERY parameter.")
+        if name != OFFSET_PARAM:
+            rest.append(query_value)
+            continue
+        try:
+            offset = int(value)
+        except ValueError:
+            raise Exception(f"The '{OFFSET_PARAM}' QUERY parameter needs to be an integer.")
+    return offset, rest
+
+
+def _get_page_items(data: Any) -> tuple[list[Any], int | None]:
+    # returns the items of the page and the total number of items (if the server provided it)
+    if not isinstance(data, dict) or "payload" not in data:
+        raise Exception("Could not parse response data")
+
+    payload = data["payload"]
+    if isinstance(payload, list):
+        return payload, None
+    if isinstance(payload, dict) and isinstance(payload.get("items"), list):
+        return payload["items"], payload.get("totalCount")
+    raise Exception("The response does not contain a list of items.")
+
+
+def _open_output(output_path: str | None) -> contextlib.AbstractContextManager[TextIO]:
+    if output_path is None or output_path == "-":
+        return contextlib.nullcontext(sys.stdout)
+    try:
+        return open(output_path, "w", encoding="utf-8")
+    except OSError as e:
+        raise Exception(f"Could not open the output file: {e}")
@@ -0,0 +1,161 @@
+import re
+import json
+import operator
+from typing import Any
+
+# a path segment: a key optionally followed by list indices or projections (e.g., 'payload', 'items[0]', 'items[]')
+_SEGMENT_PATTERN = re.compile(r"^(?P<key>[^.\[\]{},]*)(?P<brackets>(\[\d*\])*)$")
+_BRACKET_PATTERN = re.compile(r"\[(\d*)\]")
+_CONDITION_PATTERN = re.compile(r"^\s*(?P<path>[^\s=!<>~]+)\s*(?P<operator>==|!=|>=|<=|=|>|<|~)\s*(?P<value>.*?)\s*$")
+
+_OPERATORS = {
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+    "~": lambda value, pattern: str(pattern) in str(value),
+}
+
+
+class Projection:
+    """Selects a part of the decoded response (--select) and filters the items of a list (--where),
+    so that only the requested data is serialized.
+
+    The select expression is a dot-separated path of keys, where `key[n]` selects the n-th item of a list,
+    `key[]` applies the rest of the path to every item of a list, and `{a,b.c}` builds an object from
+    the given (relative) paths. For example, `payload[].{id,name}`.
+
+    The where conditions (`path op value`, where op is one of ==, !=, >, >=, <, <=, or ~ for substrings)
+    are applied to the items of the list marked by the first `[]` in the select expression (or to the items
+    of the payload if there is none). The value is parsed as JSON, otherwise it is used as a string.
+    """
+
+    def __init__(self, select: str | None = None, where: list[str] = []):
+        """
+        Args:
+            select (str | None, optional): The select expression. Defaults to None (the whole response).
+            where (list[str], optional): The conditions that all returned items must satisfy. Defaults to [].
+
+        Raises:
+            Exception: Thrown when an expression is not valid.
+        """
+
+        self.steps = _compile_path(select) if select else []
+        self.conditions = [_compile_condition(condition) for condition in where]
+
+    def apply(self, data: Any) -> Any:
+        """Applies the projection to a decoded response.
+
+        Args:
+            data (Any): The decoded response.
+
+        Raises:
+            Exception: Thrown when the where conditions are not applied to a list.
+
+        Returns:
+            Any: Returns the selected data.
+        """
+
+        if self.conditions and not any(step[0] == "each" for step in self.steps):
+            # filter the payload items of the response envelope
+            payload = data.get("payload") if isinstance(data, dict) else None
+            if not isinstance(payload, list):
+                raise Exception("The --where conditions can be applied only to a list (mark it by [] in --select).")
+            data = {**data, "payload": [item for item in payload if self.matches(item)]}
+        return self._evaluate(self.steps, data, self.conditions)
+
+    def apply_to_item(self, item: Any) -> tuple[bool, Any]:
+        """Applies the projection to a single item (e.g., of a paginated list).
+        The select expression is relative to the item and the where conditions are applied to the item itself.
+
+        Args:
+            item (Any): The decoded item.
+
+        Returns:
+            tuple[bool, Any]: Returns whether the item satisfies the conditions and the selected data.
+        """
+
+        if not self.matches(item):
+            return False, None
+        return True, self._evaluate(self.steps, item, [])
+
+    def matches(self, item: Any) -> bool:
+        """Returns whether the item satisfies all where conditions.
+        """
+
+        for path, compare, expected in self.conditions:
+            value = self._evaluate(path, item, [])
+            try:
+                if value is None or not compare(value, expected):
+                    return False
+            except TypeError:
+                # values of different types (e.g., a string and a number) never match
+                return False
+        return True
+
+    def _evaluate(self, steps: list[tuple], value: Any, conditions: list) -> Any:
+        for position, step in enumerate(steps):
+            kind = step[0]
+            if kind == "key":
+                value = value.get(step[1]) if isinstance(value, dict) else None
+            elif kind == "index":
+                value = value[step[1]] if isinstance(value, list) and step[1] < len(value) else None
+            elif kind == "each":
+                if not isinstance(value, list):
+                    return None
+                # the conditions are applied only at the first projection
+                items = [item for item in value if self.matches(item)] if conditions else value
+                return [self._evaluate(steps[position + 1:], item, []) for item in items]
+            elif kind == "pick":
+                return {label: self._evaluate(path, value, []) for label, path in step[1]}
+        return value
+
+
+def _compile_path(expression: str) -> list[tuple]:
+    steps: list[tuple] = []
+    for segment in _split_top_level(expression.strip(), "."):
+        if segment.startswith("{") and segment.endswith("}"):
+            fields = [field.strip() for field in _split_top_level(segment[1:-1], ",")]
+            if not all(fields):
+                raise Exception(f"Invalid field list '{segment}' in the select expression.")
+            steps.append(("pick", [(field, _compile_path(field)) for field in fields]))
+            continue
+
+        match = _SEGMENT_PATTERN.match(segment)
+        if match is None or (not match.group("key") and not match.group("brackets")):
+            raise Exception(f"Invalid segment '{segment}' in the select expression.")
+        if match.group("key"):
+            steps.append(("key", match.group("key")))
+        for index in _BRACKET_PATTERN.findall(match.group("brackets")):
+            steps.append(("index", int(index)) if index else ("each",))
+    return steps
+
+
+def _compile_condition(condition: str) -> tuple[list[tuple], Any, Any]:
+    match = _CONDITION_PATTERN.match(condition)
+    if match is None:
+        raise Exception(f"Invalid where condition '{condition}', use the <path><operator><value> format.")
+
+    try:
+        expected = json.loads(match.group("value"))
+    except ValueError:
+        expected = match.group("value")
+    return _compile_path(match.group("path")), _OPERATORS[match.group("operator")], expected
+
+
+def _split_top_level(text: str, separator: str) -> list[str]:
+    # splits the text by the separator, except inside braces
+    parts, depth, start = [], 0, 0
+    for position, char in enumerate(text):
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:position])
+            start = position + 1
+    parts.append(text[start:])
+    return parts
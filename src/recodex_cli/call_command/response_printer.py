@@ -1,6 +1,9 @@
+import sys
+import json
 from recodex.client_components.client_response import ClientResponse
 
 from .command_state import CommandState
+from ..utils import timings
 
 
 def print_response(response: ClientResponse, state: CommandState):
@@ -15,24 +18,69 @@ def print_response(response: ClientResponse, state: CommandState):
     """
 
     # get response string
-    if state.output_format == "json":
-        out_string = response.get_json_string(state.output_minimized)
-    elif state.output_format == "yaml":
-        out_string = response.get_yaml_string(state.output_minimized)
-    elif state.output_format == "raw":
-        out_string = response.get_data_binary() if state.output_path else response.get_data_str()
-    else:
-        raise NotImplementedError(f"Unknown output format '{state.output_format}'. Please use 'yaml' or 'json'.")
+    with timings.span("serialize", format=state.output_format):
+        out_string = _get_response_string(response, state)
 
     # print to console or file
+    with timings.span("write_output"):
+        _write_output(out_string, state)
+
+
+def _get_response_string(response: ClientResponse, state: CommandState) -> str | bytes:
+    if state.projection is not None:
+        return _get_projected_string(response, state)
+    if state.output_format == "json":
+        if state.output_minimized:
+            # the server sends minimized JSON already, so the response bytes are passed through as they are
+            # (the data are decoded only when they need to be reformatted)
+            return response.get_data_binary()
+        return response.get_json_string()
+    if state.output_format == "yaml":
+        return response.get_yaml_string(state.output_minimized)
+    if state.output_format == "raw":
+        return response.get_data_binary() if state.output_path else response.get_data_str()
+    raise NotImplementedError(f"Unknown output format '{state.output_format}'. Please use 'yaml' or 'json'.")
+
+
+def _write_output(out_string: str | bytes, state: CommandState):
     if state.output_path is None:
-        if state.output_extra_newline:
+        if isinstance(out_string, bytes):
+            _write_binary_stdout(out_string, state.output_extra_newline)
+        elif state.output_extra_newline:
             print(out_string)
         else:
             print(out_string, end="")
     else:
         with open(state.output_path, "wb") as handle:
-            if state.output_format == "raw":
+            if isinstance(out_string, bytes):
                 handle.write(out_string)
             else:
                 handle.write(out_string.encode('utf-8'))
+
+
+def _write_binary_stdout(data: bytes, extra_newline: bool):
+    # the text layer is flushed first, so that the data are not mixed with the previously printed text
+    sys.stdout.flush()
+    sys.stdout.buffer.write(data)
+    if extra_newline:
+        sys.stdout.buffer.write(b"\n")
+    sys.stdout.buffer.flush()
+
+
+def _get_projected_string(response: ClientResponse, state: CommandState) -> str:
+    # the projection is applied to the decoded data, so only the selected part is serialized
+    data = response.get_parsed_data()
+    if data is None:
+        raise Exception("The response data is not in JSON format.")
+    data = state.projection.apply(data)  # type: ignore
+
+    if state.output_format == "json":
+        if state.output_minimized:
+            return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        return json.dumps(data, indent=2, ensure_ascii=False)
+    if state.output_format == "yaml":
+        import yaml
+        if state.output_minimized:
+            return yaml.dump(data, default_flow_style=True, indent=None, allow_unicode=True)
+        return yaml.dump(data, allow_unicode=True, indent=2)
+    raise Exception("The raw output cannot be combined with --select and --where.")
@@ -0,0 +1,281 @@
+import re
+import json
+import typer
+from typing import Any, TextIO
+from collections.abc import Callable, Iterator
+from jsonschema import validators, exceptions
+from recodex.client_components.endpoint_resolver import EndpointResolver
+
+from . import batch
+from ..utils import cmd_utils as cmd_utils
+
+# the keywords that do not affect the validation (the OpenAPI 'nullable' is ignored by jsonschema as well)
+_ANNOTATIONS = {"description", "example", "examples", "title", "nullable", "format", "default", "deprecated"}
+
+_TYPE_CHECKS: dict[str, Callable[[Any], bool]] = {
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: (
+        (isinstance(value, int) and not isinstance(value, bool)) or (isinstance(value, float) and value.is_integer())
+    ),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "array": lambda value: isinstance(value, list),
+    "object": lambda value: isinstance(value, dict),
+    "null": lambda value: value is None,
+}
+
+
+class _CompiledSchema:
+    """JSON schema validator with a fast path for the simple schemas of the swagger document.
+
+    The fast check is compiled into nested Python functions, the jsonschema validator is used only
+    for the values the fast check does not accept (or the schemas it does not support), so that the errors
+    (and the decisions about unusual values) are always the same as when the request is sent.
+    """
+
+    def __init__(self, schema: dict):
+        self.validator = validators.validator_for(schema)(schema)
+        self.check = _compile_check(schema)
+
+    def get_error(self, value: Any) -> str | None:
+        """Returns the description of the most relevant error, or None if the value is valid.
+        """
+
+        if self.check is not None and self.check(value):
+            return None
+        error = exceptions.best_match(self.validator.iter_errors(value))
+        if error is None:
+            return None
+        location = ".".join(str(key) for key in error.absolute_path)
+        return f"{location}: {error.message}" if location else error.message
+
+
+class EndpointValidator:
+    """Validates the requests of a single endpoint without sending them.
+
+    The checks are the same as when the request is sent (the number of PATH parameters, the names and types
+    of QUERY parameters, and the body schema), but the JSON schemas are compiled only once, so that thousands
+    of requests can be validated quickly.
+    """
+
+    def __init__(self, endpoint_resolver: EndpointResolver, presenter: str, action: str):
+        """
+        Args:
+            endpoint_resolver (EndpointResolver): The resolver holding the endpoint definitions.
+            presenter (str): The name of the endpoint presenter.
+            action (str): The name of the endpoint action.
+        """
+
+        definition = endpoint_resolver.get_endpoint_definition(presenter, action)
+        self.path_params = [
+            (param["name"], param["schema"].get("type"), _compile(param["schema"]))
+            for param in endpoint_resolver.get_path_params(presenter, action)
+        ]
+
+        self.query_params = {}
+        self.required_query_params = []
+        for param in endpoint_resolver.get_query_params(presenter, action):
+            self.query_params[param["name"]] = (param["schema"].get("type"), _compile(param["schema"]))
+            if param.get("required"):
+                self.required_query_params.append(param["name"])
+
+        # only JSON bodies are validated (the same as when the request is sent)
+        content = definition.get("requestBody", {}).get("content", {})
+        body_schema = content.get("application/json", {}).get("schema")
+        self.body_validator = _compile(body_schema) if body_schema is not None else None
+
+    def validate(self, path_values: list[str], query_values: list[str], body: Any) -> list[str]:
+        """Validates the parameters of a request.
+
+        Args:
+            path_values (list[str]): A list of PATH parameter values in order of definition.
+            query_values (list[str]): A list of query parameters in the form of "name=value" strings.
+            body (Any): The body of the request.
+
+        Returns:
+            list[str]: Returns the descriptions of all errors (empty if the request is valid).
+        """
+
+        errors = self._validate_path(path_values)
+        errors += self._validate_query(query_values)
+        if self.body_validator is not None:
+            error = self.body_validator.get_error(body)
+            if error is not None:
+                errors.append(f"Body {error}")
+        return errors
+
+    def _validate_path(self, path_values: list[str]) -> list[str]:
+        # the same messages as in `command.path_list_to_dict`
+        if len(self.path_params) < len(path_values):
+            plural_s = "s" if len(self.path_params) > 1 else ''
+            return [f"Expected {len(self.path_params)} PATH parameter{plural_s}, but got {len(path_values)}."]
+        if len(self.path_params) > len(path_values):
+            missing_params = [name for name, _, _ in self.path_params[len(path_values):]]
+            plural_text = "s are" if len(missing_params) > 1 else ' is'
+            return [f"The following PATH parameter{plural_text} missing: {', '.join(missing_params)}."]
+
+        errors = []
+        for (name, type, validator), value in zip(self.path_params, path_values):
+            error = validator.get_error(_convert_value(value, type))
+            if error is not None:
+                errors.append(f"PATH parameter '{name}': {error}")
+        return errors
+
+    def _validate_query(self, query_values: list[str]) -> list[str]:
+        # the same checks as in `command.query_list_to_dict`
+        errors = []
+        names = set()
+        for query_value in query_values:
+            name, separator, value = query_value.partition("=")
+            if separator == "":
+                errors.append("The query values need to be in <name=value> format.")
+                continue
+            if name not in self.query_params:
+                errors.append(f"Unknown QUERY parameter: {name}.")
+                continue
+
+            names.add(name)
+            type, validator = self.query_params[name]
+            if type == "array" or type == "object":
+                try:
+                    parsed_value = json.loads(value)
+                except ValueError:
+                    errors.append(f"The QUERY parameter '{name}' is not a valid JSON array or object.")
+                    continue
+            else:
+                parsed_value = _convert_value(value, type)
+
+            error = validator.get_error(parsed_value)
+            if error is not None:
+                errors.append(f"QUERY parameter '{name}': {error}")
+
+        errors += [f"Param '{name}' is required." for name in self.required_query_params if name not in names]
+        return errors
+
+
+def validate_batch(endpoint_resolver: EndpointResolver, batch_path: str, verbose: bool = False):
+    """Validates the requests of a batch file (see `batch.call_batch` for the format) without sending them
+    and prints the errors of every invalid request tagged with its line number.
+
+    Args:
+        endpoint_resolver (EndpointResolver): The resolver holding the endpoint definitions.
+        batch_path (str): The path to the JSONL file, or '-' for stdin.
+        verbose (bool, optional): Execution verbosity. Defaults to False.
+
+    Raises:
+        Exception: Thrown when the file could not be opened or if any of the requests is not valid.
+    """
+
+    total, invalid = 0, 0
+    with batch.open_batch_file(batch_path) as handle:
+        for line_number, errors in validate_requests(endpoint_resolver, handle):
+            total += 1
+            invalid += len(errors) > 0
+            for error in errors:
+                typer.echo(f"Line {line_number}: {error}")
+
+    if verbose:
+        typer.echo(f"Validated {total} requests ({invalid} not valid).", err=True)
+    if invalid > 0:
+        raise Exception(f"{invalid} of {total} requests are not valid.")
+
+
+def validate_requests(endpoint_resolver: EndpointResolver, handle: TextIO) -> Iterator[tuple[int, list[str]]]:
+    """Validates the requests of an opened batch file.
+
+    Args:
+        endpoint_resolver (EndpointResolver): The resolver holding the endpoint definitions.
+        handle (TextIO): The opened batch file.
+
+    Returns:
+        Iterator[tuple[int, list[str]]]: Yields the line number and the errors of every request (the list
+        is empty if the request is valid).
+    """
+
+    # the validators (or the errors of unknown endpoints) are created once per endpoint
+    endpoint_validators: dict[str, EndpointValidator | str] = {}
+    for line_number, line in batch.read_batch_lines(handle):
+        try:
+            request = batch.parse_batch_line(line)
+        except Exception as e:
+            yield line_number, [str(e)]
+            continue
+
+        endpoint = request["endpoint"]
+        if endpoint not in endpoint_validators:
+            endpoint_validators[endpoint] = _create_validator(endpoint_resolver, endpoint)
+        validator = endpoint_validators[endpoint]
+        if isinstance(validator, str):
+            yield line_number, [validator]
+        else:
+            yield line_number, validator.validate(request["path"], request["query"], request["body"])
+
+
+def _create_validator(endpoint_resolver: EndpointResolver, endpoint: str) -> EndpointValidator | str:
+    # returns the error message if the endpoint does not exist
+    try:
+        presenter, action = cmd_utils.parse_endpoint_or_throw(endpoint)
+        return EndpointValidator(endpoint_resolver, presenter, action)
+    except Exception as e:
+        # the resolver lists all known actions after the first sentence
+        return str(e).splitlines()[0].partition(" Use one of")[0]
+
+
+def _compile(schema: dict) -> _CompiledSchema:
+    # the same validator class as the one used by `jsonschema.validate` when the request is sent
+    return _CompiledSchema(schema)
+
+
+def _compile_check(schema: Any) -> Callable[[Any], bool] | None:  # noqa: C901
+    # returns a function that accepts only the valid values (it may reject a valid value, which is then
+    # validated by jsonschema), or None if the schema uses keywords that are not supported
+    if not isinstance(schema, dict):
+        return None
+    checks: list[Callable[[Any], bool]] = []
+    for keyword, argument in schema.items():
+        if keyword in _ANNOTATIONS:
+            continue
+        if keyword == "type":
+            types = argument if isinstance(argument, list) else [argument]
+            if any(type not in _TYPE_CHECKS for type in types):
+                return None
+            type_checks = [_TYPE_CHECKS[type] for type in types]
+            checks.append(lambda value, type_checks=type_checks: any(check(value) for check in type_checks))
+        elif keyword == "pattern":
+            pattern = re.compile(argument)
+            checks.append(lambda value, pattern=pattern: not isinstance(value, str) or bool(pattern.search(value)))
+        elif keyword == "minLength":
+            checks.append(lambda value, limit=argument: not isinstance(value, str) or len(value) >= limit)
+        elif keyword == "maxLength":
+            checks.append(lambda value, limit=argument: not isinstance(value, str) or len(value) <= limit)
+        elif keyword == "required":
+            checks.append(lambda value, names=argument: not isinstance(value, dict) or all(n in value for n in names))
+        elif keyword == "properties":
+            properties = {name: _compile_check(subschema) for name, subschema in argument.items()}
+            if any(check is None for check in properties.values()):
+                return None
+            checks.append(lambda value, properties=properties: not isinstance(value, dict) or all(
+                check(value[name]) for name, check in properties.items() if name in value  # type: ignore
+            ))
+        elif keyword == "items":
+            item_check = _compile_check(argument)
+            if item_check is None:
+                return None
+            checks.append(lambda value, check=item_check: not isinstance(value, list) or all(map(check, value)))
+        else:
+            return None
+    return lambda value: all(check(value) for check in checks)
+
+
+def _convert_value(value: str, type: str | None) -> Any:
+    # the string values are converted the same way as by the client (invalid values are kept for the errors)
+    if type == "boolean" and value.lower() in ["true", "false"]:
+        return value.lower() == "true"
+    try:
+        if type == "integer":
+            return int(value)
+        if type == "number":
+            return float(value)
+    except ValueError:
+        pass
+    return value
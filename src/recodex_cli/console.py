@@ -1,30 +1,92 @@
-import typer
-from typing_extensions import Optional, Annotated
-import click
-import json
-
-from recodex.generated.swagger_client import DefaultApi
-
-from .utils import client_factory
-from .utils import cmd_utils as cmd_utils
-from .utils.login_info import LoginInfo
-from .call_command import command as cmd
-from .call_command.command_state import CommandState
-from .plugins import file_plugins, info_plugins
+# the timings of the startup are measured from here (see the --timings option of the call command)
+from .utils import timings
+# the startup profiler needs to be installed before any other (heavy) module is imported
+from .utils import startup_profile  # noqa: E402
+startup_profile.install_if_requested()
+
+import typer  # noqa: E402
+from typing_extensions import Optional, Annotated, Literal  # noqa: E402
+import click  # noqa: E402
+import json  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+
+# only light modules are imported here to keep the startup fast, the modules that load the generated client,
+# the swagger document, inquirer or rich are imported by the commands that actually need them
+from .utils import client_factory  # noqa: E402
+from .utils import cmd_utils as cmd_utils  # noqa: E402
+from .utils import endpoint_completion  # noqa: E402
+from .utils import request_policy  # noqa: E402
+from .utils.login_info import LoginInfo  # noqa: E402
+from .call_command.command_state import CommandState  # noqa: E402
+from .plugins import file_plugins, info_plugins, cache_plugins, daemon_plugins  # noqa: E402
+from .plugins import endpoint_plugins, submit_plugins, export_plugins  # noqa: E402
 
 
 app = typer.Typer()
-state = CommandState()
 
 # register plugins
 app.add_typer(file_plugins.app, name="file")
 app.add_typer(info_plugins.app, name="info")
+app.add_typer(cache_plugins.app, name="cache")
+app.add_typer(daemon_plugins.app, name="daemon")
+app.add_typer(endpoint_plugins.app, name="endpoints")
+app.add_typer(submit_plugins.app, name="submit")
+app.add_typer(export_plugins.app, name="export")
+
+
+@app.callback()
+def main(
+    startup_profile: Annotated[
+        bool, typer.Option(
+            "--startup-profile",
+            help="Print the import-time breakdown to stderr when the command finishes "
+                 f"(the {startup_profile.PROFILE_ENV} environment variable has the same effect)"
+        )
+    ] = False,
+    retries: Annotated[
+        int | None, typer.Option(
+            help="The number of times a failed GET request is repeated (with an exponential backoff), "
+                 f"defaults to {request_policy.DEFAULT_RETRIES} (or the {request_policy.RETRIES_ENV} variable)",
+            min=0
+        )
+    ] = None,
+    rate: Annotated[
+        str | None, typer.Option(
+            help="The maximal number of requests sent per second or minute (e.g., '10/s' or '100/min'), "
+                 f"the {request_policy.RATE_ENV} variable has the same effect"
+        )
+    ] = None,
+):
+    """CLI client for the ReCodEx API.
+    """
+    # the --startup-profile option is processed before the command line is parsed (see the top of the module)
+    timings.command_started()
+
+    # the policy applies to all requests sent by the command
+    try:
+        request_policy.configure(retries, rate)
+    except Exception as e:
+        raise click.BadParameter(str(e))
+
+
+def _help_callback(ctx: click.Context, _, display_help: bool):
+    # the detailed help loads the swagger document and rich, so the module is imported only when needed
+    # (the callback is invoked by every parsing of the command line, including the shell completion)
+    if not display_help:
+        return display_help
+    from .call_command import command as cmd
+    return cmd.help_callback(ctx, _, display_help)
 
 
 @app.command()
 def call(  # noqa: C901
+    ctx: typer.Context,
     endpoint: Annotated[
-        str, typer.Argument(help="Endpoint identifier in <presenter.action> format", is_eager=True)
+        str, typer.Argument(
+            help="Endpoint identifier in <presenter.action> format", is_eager=True,
+            autocompletion=endpoint_completion.complete_endpoint
+        )
     ] = "",
     path: Annotated[
         Optional[list[str]], typer.Argument(help="Pass a series of PATH parameters",
@@ -33,7 +95,8 @@ def call(  # noqa: C901
     query: Annotated[
         list[str], typer.Option(
             help="Pass a single QUERY parameters in <name=value> format",
-            rich_help_panel="Request Parameters"
+            rich_help_panel="Request Parameters",
+            autocompletion=endpoint_completion.complete_query
         )
     ] = [],
     body: Annotated[
@@ -48,6 +111,12 @@ def call(  # noqa: C901
             allow_dash=True
         )
     ] = None,
+    body_format: Annotated[
+        Literal["json", "yaml"] | None, typer.Option(
+            help="The format of the request body, detected from the file extension or the content if not set",
+            rich_help_panel="Request Parameters"
+        )
+    ] = None,
     file: Annotated[
         str | None, typer.Option(help="Filepath to file to be uploaded", rich_help_panel="Request Parameters")
     ] = None,
@@ -63,11 +132,75 @@ def call(  # noqa: C901
     out_path: Annotated[
         str | None, typer.Option(help="If set, the output will be saved to this path", allow_dash=True)
     ] = None,
+    select: Annotated[
+        str | None, typer.Option(
+            help="Print only the selected part of the response (e.g., 'payload[].{id,name}')",
+            rich_help_panel="Projection"
+        )
+    ] = None,
+    where: Annotated[
+        list[str], typer.Option(
+            help="Print only the list items satisfying the condition (e.g., 'points>5'), can be repeated",
+            rich_help_panel="Projection"
+        )
+    ] = [],
+    batch: Annotated[
+        str | None, typer.Option(
+            help="Execute all requests from a JSONL file ('-' for stdin) and print the results as NDJSON",
+            rich_help_panel="Batch Mode",
+            allow_dash=True
+        )
+    ] = None,
+    jobs: Annotated[
+        int, typer.Option(
+            help="Maximal number of concurrent requests in batch mode", min=1, rich_help_panel="Batch Mode"
+        )
+    ] = 4,
+    async_engine: Annotated[
+        bool, typer.Option(
+            help="Send the batch requests from an asyncio event loop instead of a thread pool "
+                 "(suited for thousands of small requests)",
+            rich_help_panel="Batch Mode"
+        )
+    ] = False,
+    all_pages: Annotated[
+        bool, typer.Option(
+            help="Fetch all pages of a paginated endpoint and print the items as NDJSON",
+            rich_help_panel="Pagination"
+        )
+    ] = False,
+    page_size: Annotated[
+        int, typer.Option(help="The number of items fetched by one request", min=1, rich_help_panel="Pagination")
+    ] = 100,
+    max_items: Annotated[
+        int | None, typer.Option(help="The maximal number of fetched items", min=0, rich_help_panel="Pagination")
+    ] = None,
+    cache_ttl: Annotated[
+        float | None, typer.Option(
+            help="Reuse the cached responses of GET endpoints younger than the given number of seconds "
+                 "(older ones are revalidated), the cache is not used if not set",
+            min=0,
+            rich_help_panel="Caching"
+        )
+    ] = None,
+    timings_enabled: Annotated[
+        bool, typer.Option(
+            "--timings",
+            help="Print the time spent in each phase of the command (imports, session, requests, output) to stderr",
+            rich_help_panel="Diagnostics"
+        )
+    ] = False,
+    trace_out: Annotated[
+        str | None, typer.Option(
+            help="Write the measured phases to a Chrome trace file (implies --timings)",
+            rich_help_panel="Diagnostics"
+        )
+    ] = None,
     verbose: Annotated[
         bool, typer.Option(help="Execution Verbosity", is_eager=True)
     ] = False,
     help: Annotated[
-        bool, typer.Option(help="Display Help", callback=cmd.help_callback)
+        bool, typer.Option(help="Display Help", callback=_help_callback)
     ] = False,
 ):
     """Calls a ReCodEx endpoint with the provided parameters.
@@ -77,13 +210,40 @@ def call(  # noqa: C901
     Pass PATH parameter values in order of definition as additional arguments,
     use --query options in <key=value> format to pass QUERY parameters,
     use --body to pass a JSON body.
+
+    Use --batch to execute many requests from a JSONL file (one JSON object with the endpoint,
+    path, query, and body keys per line) concurrently, --async-engine sends them from
+    an asyncio event loop instead of a thread pool.
+
+    Use --all-pages to fetch all items of a paginated endpoint (one with the offset and limit
+    QUERY parameters), the items are printed as NDJSON as the pages arrive.
+
+    Use --select to print only a part of the response (e.g., 'payload[].{id,name}') and --where
+    to print only the list items satisfying a condition (e.g., 'points>5').
+
+    Use --cache-ttl to reuse the cached responses of GET endpoints (see the 'cache' command).
+
+    Use --timings to print the time spent in each phase of the command, --trace-out writes them
+    to a file that can be loaded by a trace viewer (e.g., chrome://tracing or Perfetto).
     """
 
     # help is handled in call_command.help_callback
     if help:
         return
 
-    state.verbose = verbose
+    if timings_enabled or trace_out is not None:
+        # the summary is printed even if the command fails
+        timings.enable()
+        ctx.call_on_close(
+            lambda: cmd_utils.execute_with_verbosity(lambda: timings.finish(trace_out), verbose)
+        )
+
+    with timings.span("imports"):
+        from .call_command import command as cmd
+        from .call_command import batch as cmd_batch
+        from .utils import transport
+
+    state = CommandState(verbose)
     state.output_minimized = minimized
     state.output_path = out_path
 
@@ -94,6 +254,10 @@ def call(  # noqa: C901
     elif return_raw:
         state.output_format = "raw"
 
+    if select is not None or len(where) > 0:
+        from .call_command.projection import Projection
+        state.projection = cmd_utils.execute_with_verbosity(lambda: Projection(select, where), verbose)
+
     if file is None:
         file_obj = {}
     else:
@@ -103,20 +267,138 @@ def call(  # noqa: C901
     if path is None:
         path = []
 
+    if batch is not None and not async_engine:
+        # each concurrent request needs its own connection
+        transport.reserve_connections(jobs)
+
     client = client_factory.get_client_with_verbosity(state.verbose)
+    if cache_ttl is not None:
+        response_cache = cmd_utils.execute_with_verbosity(client_factory.get_response_cache, verbose)
+        client = client.with_cache(response_cache, cache_ttl)
+
+    if batch is not None:
+        if endpoint != "":
+            raise click.ClickException("The endpoint cannot be specified in batch mode")
+        if return_yaml or return_raw or out_path is not None:
+            raise click.ClickException("The results of the batch requests are always printed to stdout as NDJSON")
 
-    if endpoint == "":
+        def command():
+            if async_engine:
+                cmd_batch.call_batch_async(client, batch, jobs, state)
+            else:
+                cmd_batch.call_batch(client, batch, jobs, state)
+    elif endpoint == "":
         def command():
             cmd.call_interactive(client, state)
+    elif all_pages:
+        if return_yaml or return_raw:
+            raise click.ClickException("The items of all pages are always printed as NDJSON")
+        from .call_command import pagination
+
+        def command():
+            pagination.call_all_pages(client, endpoint, path, query, state, page_size, max_items)
     else:
         def command():
-            if body_path is None:
-                parsed_body = cmd_utils.parse_input_body(body)
-            else:
-                parsed_body = cmd_utils.parse_input_body_file(body_path)
+            started = time.perf_counter()
+            with timings.span("parse_body"):
+                if body_path is None:
+                    parsed_body = cmd_utils.parse_input_body(body, body_format)
+                else:
+                    parsed_body = cmd_utils.parse_input_body_file(body_path, body_format)
+            if verbose:
+                message = f"Request body parsed in {(time.perf_counter() - started) * 1000:.1f} ms."
+                typer.echo(typer.style(message, fg=typer.colors.BRIGHT_BLACK), err=True)
             cmd.call(client, endpoint, path, query, parsed_body, state, files=file_obj)
 
     cmd_utils.execute_with_verbosity(command, state.verbose)
+    if cache_ttl is not None and verbose:
+        message = (f"Response cache: {response_cache.hits} hits, {response_cache.revalidated} revalidated, "
+                   f"{response_cache.misses} misses")
+        typer.echo(typer.style(message, fg=typer.colors.BRIGHT_BLACK), err=True)
+
+
+@app.command()
+def validate(
+    batch_path: Annotated[
+        str, typer.Argument(help="The JSONL file with the requests (the format of 'call --batch'), '-' for stdin")
+    ],
+    verbose: Annotated[
+        bool, typer.Option(help="Execution Verbosity")
+    ] = False,
+):
+    """Validates the requests of a batch file without sending them.
+
+    Every request is checked the same way as when it is sent (the number of PATH parameters,
+    the names and types of QUERY parameters, and the body schema). The errors are printed
+    with the line numbers of the requests, the command fails if any request is not valid.
+    No session is needed.
+    """
+
+    from .call_command import validation
+
+    def command():
+        validation.validate_batch(client_factory.get_endpoint_resolver(), batch_path, verbose)
+    cmd_utils.execute_with_verbosity(command, verbose)
+
+
+@app.command()
+def shell(
+    verbose: Annotated[
+        bool, typer.Option(help="Execution Verbosity")
+    ] = False,
+):
+    """Starts an interactive shell that executes commands in a single process.
+
+    The shell accepts the same commands as the CLI (without the 'recodex' prefix),
+    the client, the session, and the connection pool are kept alive between commands.
+    Use 'exit' or Ctrl+D to quit.
+    """
+
+    from .shell_command import shell as shell_cmd
+    shell_cmd.run_shell(typer.main.get_command(app), verbose)
+
+
+@app.command()
+def watch(
+    ids: Annotated[
+        Optional[list[str]], typer.Argument(help="The IDs of the submissions (read from stdin if omitted or '-')")
+    ] = None,
+    interval: Annotated[
+        float, typer.Option(help="The initial polling interval of every submission in seconds", min=0.1)
+    ] = 2.0,
+    max_interval: Annotated[
+        float, typer.Option(help="The maximal polling interval in seconds (the interval grows while nothing changes)")
+    ] = 30.0,
+    timeout: Annotated[
+        Optional[float], typer.Option(help="Give up after this many seconds (the command fails then)")
+    ] = None,
+    jobs: Annotated[
+        int, typer.Option(help="The maximal number of concurrent requests", min=1)
+    ] = 4,
+    verbose: Annotated[
+        bool, typer.Option(help="Execution Verbosity")
+    ] = False,
+):
+    """Watches the evaluations of multiple submissions until all of them are finished.
+
+    An event is printed as NDJSON whenever the evaluation status of a submission changes.
+    The polling interval of every submission grows while its status does not change,
+    and the submissions of the same solution are polled by a single request.
+    """
+
+    from .watch_command import watch as watch_cmd
+    from .utils import transport
+
+    if not ids or ids == ["-"]:
+        # the IDs may be separated by any whitespace (e.g., one per line)
+        ids = [id for line in sys.stdin for id in line.split()]
+
+    transport.reserve_connections(jobs)
+    client = client_factory.get_client_with_verbosity(verbose)
+
+    def command():
+        watch_cmd.watch(client, ids, interval, max_interval, timeout, jobs, verbose)
+    cmd_utils.execute_with_verbosity(command, verbose)
 
 
 @app.command()
@@ -187,6 +469,8 @@ def status(
         typer.echo(f"User ID: {session.get_user_id()}")
 
         def load_and_print_user():
+            from recodex.generated.swagger_client import DefaultApi
+
             if verbose:
                 typer.echo(typer.style("Loading user details...", fg=typer.colors.BRIGHT_BLACK))
 
@@ -0,0 +1,255 @@
+import io
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import threading
+import contextlib
+import subprocess
+import socketserver
+import click
+import typer
+
+from . import daemon_client
+from ..shell_command import shell
+from ..utils import client_factory, transport
+
+# the output of the daemon process itself (e.g., errors that could not be sent to a client)
+log_path = client_factory.data_dir / "daemon.log"
+
+# the number of seconds `start` waits for the daemon to accept connections
+START_TIMEOUT = 15.0
+
+
+class _FrameWriter(io.RawIOBase):
+    """Binary stream that sends everything written to it as frames of one channel.
+    """
+
+    def __init__(self, connection: socket.socket, channel: int, lock: threading.Lock):
+        self.connection = connection
+        self.channel = channel
+        self.lock = lock
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        with self.lock:
+            daemon_client.write_frame(self.connection, self.channel, bytes(data))
+        return len(data)
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, command: click.Group):
+        self.command = command
+        self.started = time.time()
+        self.requests = 0
+        # the commands share the process-wide stdout, stderr, and working directory, so they are executed one by one
+        self.execution_lock = threading.Lock()
+        self._session_stamp = _get_session_stamp()
+        super().__init__(str(daemon_client.socket_path), _Handler)
+
+    def execute(self, connection: socket.socket, request: dict) -> int:
+        with self.execution_lock:
+            self.requests += 1
+            self._reload_session_if_changed()
+
+            frame_lock = threading.Lock()
+            stdout = _open_channel(connection, daemon_client.STDOUT, frame_lock)
+            stderr = _open_channel(connection, daemon_client.STDERR, frame_lock)
+            cwd = os.getcwd()
+            try:
+                os.chdir(request["cwd"])
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                    with _client_environment(request.get("env", {})):
+                        return self._execute_command(request["argv"])
+            finally:
+                os.chdir(cwd)
+                for stream in [stdout, stderr]:
+                    with contextlib.suppress(OSError, ValueError):
+                        stream.flush()
+
+    def get_status(self) -> dict:
+        return {"pid": os.getpid(), "uptime": round(time.time() - self.started), "requests": self.requests}
+
+    def _reload_session_if_changed(self):
+        # the user might have logged in or out (by a command executed without the daemon)
+        stamp = _get_session_stamp()
+        if stamp != self._session_stamp:
+            self._session_stamp = stamp
+            client_factory._reset_client()
+
+    def _execute_command(self, argv: list[str]) -> int:
+        # the transport has been created by a previous command, so the variables of the client are applied to it
+        try:
+            transport.reset_configuration()
+        except Exception as e:
+            error = click.ClickException(str(e))
+            error.show()
+            return error.exit_code
+        return shell.execute_command(self.command, argv)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: _Server
+
+    def handle(self):
+        try:
+            frame = daemon_client.read_frame(self.request)
+            if frame is None:
+                return
+            request = json.loads(frame[1])
+
+            control = request.get("control")
+            if control is not None:
+                status = json.dumps(self.server.get_status()).encode()
+                daemon_client.write_frame(self.request, daemon_client.REQUEST, status)
+                if control == "stop":
+                    # serve_forever waits for the shutdown, so it is requested from another thread
+                    threading.Thread(target=self.server.shutdown).start()
+            else:
+                exit_code = self.server.execute(self.request, request)
+                daemon_client.write_frame(self.request, daemon_client.EXIT, str(exit_code).encode())
+        except (OSError, ValueError) as e:
+            # the client disconnected (e.g., it was interrupted)
+            print(f"Request failed: {e}", file=sys.stderr, flush=True)
+
+
+def run_daemon(command: click.Group, verbose: bool = False):
+    """Serves the forwarded commands until the daemon is stopped (the function blocks).
+
+    Args:
+        command (click.Group): The root command of the application (the commands are dispatched to it).
+        verbose (bool, optional): Execution verbosity. Defaults to False.
+
+    Raises:
+        Exception: Thrown when the daemon is running already.
+    """
+
+    if daemon_client.send_control("status") is not None:
+        raise Exception("The daemon is running already.")
+
+    shell.warm_up(verbose)
+
+    # the socket of a daemon that was killed
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(daemon_client.socket_path)
+    daemon_client.socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # only the user can connect to the socket (the commands are executed with their session)
+    previous_umask = os.umask(0o077)
+    try:
+        server = _Server(command)
+    finally:
+        os.umask(previous_umask)
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(daemon_client.socket_path)
+
+
+def start_daemon(verbose: bool = False):
+    """Starts the daemon in a background process and waits until it accepts connections.
+
+    Args:
+        verbose (bool, optional): Execution verbosity. Defaults to False.
+
+    Raises:
+        Exception: Thrown when the daemon is running already or it failed to start.
+    """
+
+    status = daemon_client.send_control("status")
+    if status is not None:
+        raise Exception(f"The daemon is running already (PID {status['pid']}).")
+
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, "w") as log:
+        args = [sys.executable, "-m", "recodex_cli", "daemon", "run"] + (["--verbose"] if verbose else [])
+        process = subprocess.Popen(
+            args, stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True
+        )
+
+    deadline = time.monotonic() + START_TIMEOUT
+    while (status := daemon_client.send_control("status")) is None:
+        if process.poll() is not None or time.monotonic() > deadline:
+            raise Exception(f"The daemon failed to start, see {log_path}")
+        time.sleep(0.05)
+    typer.echo(f"Daemon started (PID {status['pid']}).")
+
+
+def stop_daemon():
+    """Stops the running daemon.
+
+    Raises:
+        Exception: Thrown when no daemon is running.
+    """
+
+    status = daemon_client.send_control("stop")
+    if status is None:
+        raise Exception("The daemon is not running.")
+
+    # wait until the socket is removed, so that the next command is not sent to the stopping daemon
+    deadline = time.monotonic() + START_TIMEOUT
+    while daemon_client.socket_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    typer.echo(f"Daemon stopped (PID {status['pid']}, {status['requests']} requests served).")
+
+
+def print_status() -> bool:
+    """Prints whether the daemon is running.
+
+    Returns:
+        bool: Returns whether the daemon is running.
+    """
+
+    status = daemon_client.send_control("status")
+    if status is None:
+        typer.echo("The daemon is not running.")
+        return False
+    typer.echo(f"The daemon is running (PID {status['pid']}).")
+    typer.echo(f"Socket: {daemon_client.socket_path}")
+    typer.echo(f"Uptime: {status['uptime']} s")
+    typer.echo(f"Requests served: {status['requests']}")
+    return True
+
+
+@contextlib.contextmanager
+def _client_environment(env: dict[str, str]):
+    # the RECODEX_* variables of the client replace those of the daemon while its command is executed
+    # (the request policy is configured by every command from the variables)
+    saved = {name: value for name, value in os.environ.items() if name.startswith(daemon_client.ENV_PREFIX)}
+    _replace_environment(env)
+    try:
+        yield
+    finally:
+        _replace_environment(saved)
+        with contextlib.suppress(Exception):
+            transport.reset_configuration()
+
+
+def _replace_environment(env: dict[str, str]):
+    for name in [name for name in os.environ if name.startswith(daemon_client.ENV_PREFIX)]:
+        del os.environ[name]
+    os.environ.update(env)
+
+
+def _open_channel(connection: socket.socket, channel: int, lock: threading.Lock) -> io.TextIOWrapper:
+    # the binary output (e.g., downloaded files) is written to the buffer attribute
+    buffer = io.BufferedWriter(_FrameWriter(connection, channel, lock))
+    return io.TextIOWrapper(buffer, encoding="utf-8", errors="replace", line_buffering=True)
+
+
+def _get_session_stamp() -> tuple[int, int] | None:
+    try:
+        stat = os.stat(client_factory.session_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
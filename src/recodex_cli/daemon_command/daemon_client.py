@@ -0,0 +1,163 @@
+import os
+import re
+import sys
+import json
+import socket
+import struct
+import appdirs
+from pathlib import Path
+
+# the same directory as `client_factory.data_dir` (the factory is not imported, since it loads typer)
+socket_path = Path(appdirs.user_data_dir("recodex")) / "daemon.sock"
+
+# set this environment variable (to any non-empty value) to never forward the commands to the daemon
+NO_DAEMON_ENV = "RECODEX_NO_DAEMON"
+# the environment variables with this prefix (e.g., the retries or the pool size) are forwarded with the command
+ENV_PREFIX = "RECODEX_"
+
+# the channels of the frames (the requests are sent by the client, the rest by the daemon)
+REQUEST = 0
+STDOUT = 1
+STDERR = 2
+EXIT = 3
+
+_HEADER = struct.Struct("!BI")
+_ENDPOINT_PATTERN = re.compile(r"^\w+\.\w+$")
+
+
+def forward_if_running():
+    """Forwards the command line (with the working directory and the RECODEX_* environment variables)
+    to the daemon if it is running, then exits with the exit code of the command.
+    The function returns if the command cannot be forwarded (e.g., no daemon is running), so that the command
+    is executed in the current process.
+
+    This is called by the entry point (see `__main__.py`) before the CLI is imported, so that a forwarded
+    command does not pay for loading the CLI (only the `call` command is forwarded).
+    """
+
+    args = sys.argv[1:]
+    if os.environ.get(NO_DAEMON_ENV) or not _can_forward(args):
+        return
+
+    connection = connect()
+    if connection is None:
+        return
+
+    with connection:
+        try:
+            env = {name: value for name, value in os.environ.items() if name.startswith(ENV_PREFIX)}
+            request = {"argv": args, "cwd": os.getcwd(), "env": env}
+            write_frame(connection, REQUEST, json.dumps(request).encode())
+            exit_code = _print_frames(connection)
+        except (OSError, ValueError):
+            # the command might have been executed already, so it cannot be repeated in this process
+            exit_code = None
+        except KeyboardInterrupt:
+            exit_code = 130
+
+    if exit_code is None:
+        sys.stderr.write("Error: The connection to the daemon was interrupted.\n")
+        exit_code = 1
+    sys.stdout.flush()
+    sys.exit(exit_code)
+
+
+def send_control(command: str) -> dict | None:
+    """Sends a control command (e.g., 'status' or 'stop') to the daemon.
+
+    Args:
+        command (str): The name of the control command.
+
+    Returns:
+        dict | None: Returns the reply of the daemon, or None if the daemon is not running.
+    """
+
+    connection = connect()
+    if connection is None:
+        return None
+    with connection:
+        try:
+            write_frame(connection, REQUEST, json.dumps({"control": command}).encode())
+            frame = read_frame(connection)
+        except (OSError, ValueError):
+            return None
+    return json.loads(frame[1]) if frame is not None else None
+
+
+def connect() -> socket.socket | None:
+    """Connects to the daemon socket.
+
+    Returns:
+        socket.socket | None: Returns the connection, or None if the daemon is not running.
+    """
+
+    if not hasattr(socket, "AF_UNIX") or not socket_path.exists():
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(socket_path))
+    except OSError:
+        # a stale socket of a daemon that was killed
+        connection.close()
+        return None
+    return connection
+
+
+def write_frame(connection: socket.socket, channel: int, data: bytes):
+    """Sends a frame (the channel, the length of the data, and the data).
+    """
+
+    connection.sendall(_HEADER.pack(channel, len(data)) + data)
+
+
+def read_frame(connection: socket.socket) -> tuple[int, bytes] | None:
+    """Reads a frame sent by `write_frame`.
+
+    Returns:
+        tuple[int, bytes] | None: Returns the channel and the data, or None if the connection was closed.
+    """
+
+    header = _read_exactly(connection, _HEADER.size)
+    if len(header) == 0:
+        return None
+    if len(header) < _HEADER.size:
+        raise ValueError("Incomplete frame")
+    channel, length = _HEADER.unpack(header)
+    data = _read_exactly(connection, length)
+    if len(data) < length:
+        raise ValueError("Incomplete frame")
+    return channel, data
+
+
+def _can_forward(args: list[str]) -> bool:
+    # the stdin is not forwarded, so the commands reading it (or prompting the user) are executed locally
+    if len(args) == 0 or args[0] != "call" or "-" in args:
+        return False
+    return any(_ENDPOINT_PATTERN.match(arg) or arg in ["--batch", "--help"] for arg in args[1:])
+
+
+def _print_frames(connection: socket.socket) -> int | None:
+    # returns the exit code, or None if the connection was closed before the command finished
+    while (frame := read_frame(connection)) is not None:
+        channel, data = frame
+        if channel == STDOUT:
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+        elif channel == STDERR:
+            sys.stderr.buffer.write(data)
+            sys.stderr.buffer.flush()
+        elif channel == EXIT:
+            return int(data)
+    return None
+
+
+def _read_exactly(connection: socket.socket, length: int) -> bytes:
+    # returns fewer bytes only if the connection was closed
+    chunks, remaining = [], length
+    while remaining > 0:
+        chunk = connection.recv(min(remaining, 2 ** 16))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
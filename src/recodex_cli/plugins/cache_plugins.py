@@ -0,0 +1,51 @@
+import shutil
+import typer
+from typing_extensions import Annotated
+
+from ..utils import client_factory
+from ..utils import cmd_utils as cmd_utils
+
+app = typer.Typer()
+
+
+@app.command()
+def stats(
+    verbose: Annotated[
+        bool, typer.Option(help="Execution Verbosity")
+    ] = False,
+):
+    """Prints the number and size of the cached responses of the current user.
+    """
+
+    def command():
+        from ..utils.progress import format_size
+
+        for key, value in client_factory.get_response_cache().get_stats().items():
+            if key in ["size", "max_size"]:
+                value = format_size(value)
+            print(f"{key}: {value}")
+
+    cmd_utils.execute_with_verbosity(command, verbose)
+
+
+@app.command()
+def clear(
+    all_users: Annotated[
+        bool, typer.Option("--all", help="Remove the cached responses of all users and servers")
+    ] = False,
+    verbose: Annotated[
+        bool, typer.Option(help="Execution Verbosity")
+    ] = False,
+):
+    """Removes the cached responses of the current user.
+    """
+
+    def command():
+        if all_users:
+            shutil.rmtree(client_factory.cache_dir, ignore_errors=True)
+            print("All cached responses removed")
+            return
+        removed = client_factory.get_response_cache().clear()
+        print(f"{removed} cached responses removed")
+
+    cmd_utils.execute_with_verbosity(command, verbose)
@@ -0,0 +1,60 @@
+import typer
+from typing_extensions import Annotated
+
+from ..utils import cmd_utils as cmd_utils
+
+app = typer.Typer()
+
+
+@app.command()
+def start(
+    verbose: Annotated[
+        bool, typer.Option(help="Execution Verbosity")
+    ] = False,
+):
+    """Starts a background process that executes the 'call' commands.
+
+    The daemon keeps the session, the endpoint definitions, and the open connections loaded,
+    so the 'call' commands are forwarded to it instead of loading the CLI every time.
+    If the daemon is not running, the commands are executed as usual.
+    """
+
+    from ..daemon_command import daemon
+    cmd_utils.execute_with_verbosity(lambda: daemon.start_daemon(verbose), verbose)
+
+
+@app.command()
+def stop(
+    verbose: Annotated[
+        bool, typer.Option(help="Execution Verbosity")
+    ] = False,
+):
+    """Stops the running daemon.
+    """
+
+    from ..daemon_command import daemon
+    cmd_utils.execute_with_verbosity(daemon.stop_daemon, verbose)
+
+
+@app.command()
+def status():
+    """Prints whether the daemon is running (the exit code is 1 if it is not).
+    """
+
+    from ..daemon_command import daemon
+    if not daemon.print_status():
+        raise typer.Exit(1)
+
+
+@app.command(hidden=True)
+def run(
+    verbose: Annotated[
+        bool, typer.Option(help="Execution Verbosity")
+    ] = False,
+):
+    """Runs the daemon in the foreground (used by 'daemon start').
+    """
+
+    from ..console import app as root_app
+    from ..daemon_command import daemon
+    cmd_utils.execute_with_verbosity(lambda: daemon.run_daemon(typer.main.get_command(root_app), verbose), verbose)
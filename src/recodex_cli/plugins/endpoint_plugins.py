@@ -0,0 +1,45 @@
+import time
+import typer
+from typing_extensions import Annotated
+
+from ..utils import client_factory
+from ..utils import cmd_utils as cmd_utils
+
+app = typer.Typer()
+
+
+@app.command()
+def search(
+    terms: Annotated[
+        list[str], typer.Argument(help="The searched words (e.g., 'group members' or 'cfg')")
+    ],
+    limit: Annotated[
+        int, typer.Option(help="The maximal number of printed endpoints", min=1)
+    ] = 10,
+    verbose: Annotated[
+        bool, typer.Option(help="Execution Verbosity")
+    ] = False,
+):
+    """Finds the endpoints by their names, parameters, and descriptions.
+
+    The endpoints matching all words are printed in <presenter.action> format, the best matches first.
+    The words may be abbreviated (prefixes and subsequences of the indexed words match as well).
+    No session is needed.
+    """
+
+    def command():
+        endpoint_search = client_factory.get_endpoint_resolver().get_search()
+        start = time.perf_counter()
+        matches = endpoint_search.search(" ".join(terms), limit)
+        elapsed = time.perf_counter() - start
+
+        if len(matches) == 0:
+            raise Exception("No endpoint matches the search.")
+        width = max(len(match.endpoint) for match in matches)
+        for match in matches:
+            typer.echo(f"{match.endpoint:<{width}}  {match.summary}")
+        if verbose:
+            message = f"Found {len(matches)} endpoints in {elapsed * 1000:.2f} ms."
+            typer.echo(typer.style(message, fg=typer.colors.BRIGHT_BLACK), err=True)
+
+    cmd_utils.execute_with_verbosity(command, verbose)
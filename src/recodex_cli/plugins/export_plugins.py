@@ -0,0 +1,39 @@
+import typer
+from typing_extensions import Annotated
+
+from ..utils import client_factory
+from ..utils import cmd_utils as cmd_utils
+
+app = typer.Typer()
+
+
+@app.command()
+def group(
+    id: Annotated[
+        str, typer.Argument(help="The ID of the group")
+    ],
+    out_dir: Annotated[
+        str, typer.Argument(help="The directory the group is mirrored into")
+    ],
+    jobs: Annotated[
+        int, typer.Option(help="The maximal number of concurrent requests and downloads", min=1)
+    ] = 4,
+    verbose: Annotated[
+        bool, typer.Option(help="Execution Verbosity")
+    ] = False,
+):
+    """Mirrors a group (assignments, solutions, evaluations, and files) into a local directory.
+
+    The manifest in the directory records the IDs of the exported entities, their update timestamps,
+    and the digests of the files. Repeated exports into the same directory fetch only the entities
+    that changed and download only the files whose digest differs. The changes are printed as NDJSON.
+    """
+    from ..utils import export_helper
+    from ..utils import transport
+
+    transport.reserve_connections(jobs)
+    client = client_factory.get_client_with_verbosity(verbose)
+
+    def command():
+        export_helper.export_group(client, id, out_dir, jobs, verbose)
+    cmd_utils.execute_with_verbosity(command, verbose)
@@ -1,12 +1,9 @@
+import sys
 import typer
 from typing_extensions import Annotated
-import recodex.helpers.file_upload_helper as file_upload_helper
-from recodex.generated.swagger_client.api.default_api import DefaultApi
 
 from ..utils import client_factory
 from ..utils import cmd_utils as cmd_utils
-from ..call_command.command import call
-from ..call_command.command_state import CommandState
 
 app = typer.Typer()
 
@@ -16,16 +13,28 @@ def upload(
     filepath: Annotated[
         str, typer.Argument(help="Path to the file to be uploaded")
     ],
+    read_ahead: Annotated[
+        int, typer.Option(
+            help="The maximal number of chunks read and hashed while the previous chunk is being sent "
+                 "(the chunks are always sent one by one, in order)",
+            min=1
+        )
+    ] = 4,
+    resume: Annotated[
+        bool, typer.Option(help="Continue an interrupted upload of the same file")
+    ] = False,
     verbose: Annotated[
         bool, typer.Option(help="Execution Verbosity")
     ] = False,
 ):
     """Uploads the given file to the ReCodEx server in chunks.
     """
+    from ..utils import upload_helper
+
     client = client_factory.get_client_with_verbosity(verbose)
 
     def command():
-        return file_upload_helper.upload(client, filepath, verbose)
+        return upload_helper.upload(client, filepath, client_factory.upload_journal_dir, read_ahead, resume, verbose)
     file_id = cmd_utils.execute_with_verbosity(command, verbose)
 
     print("File sent successfully")
@@ -39,25 +48,66 @@ def download(
     ],
     out_path: Annotated[
         str | None, typer.Option(
-            help="If set, the file will be saved to this path instead of being printed to stdin",
+            help="If set, the file will be saved to this path instead of being printed to stdout",
             allow_dash=True
         )
     ] = None,
+    resume: Annotated[
+        bool, typer.Option(help="Continue an interrupted download into the output file (from its .part file)")
+    ] = False,
+    verify: Annotated[
+        bool, typer.Option(help="Compare the digest of the downloaded file with the server")
+    ] = True,
     verbose: Annotated[
         bool, typer.Option(help="Execution Verbosity")
     ] = False,
 ):
     """Downloads the specified file from the ReCodEx server.
+    The file is streamed in chunks, so it is never held in memory as a whole.
     """
+    from ..utils import download_helper
+
     client = client_factory.get_client_with_verbosity(verbose)
 
-    state = CommandState(verbose)
-    state.output_path = out_path
-    state.output_format = "raw"
+    def command():
+        download_helper.download(client, id, out_path, resume, verify, verbose)
+    cmd_utils.execute_with_verbosity(command, verbose)
+
+
+@app.command()
+def download_many(
+    ids: Annotated[
+        list[str] | None, typer.Argument(help="The IDs of the files (read from stdin if omitted or '-')")
+    ] = None,
+    out_dir: Annotated[
+        str, typer.Option(help="The directory where the files will be saved")
+    ] = ".",
+    name_template: Annotated[
+        str, typer.Option(help="The template of the file names, may contain the {id} and {name} fields")
+    ] = "{id}",
+    jobs: Annotated[
+        int, typer.Option(help="The maximal number of concurrent downloads", min=1)
+    ] = 4,
+    verify: Annotated[
+        bool, typer.Option(help="Compare the digests of the downloaded files with the server")
+    ] = True,
+    verbose: Annotated[
+        bool, typer.Option(help="Execution Verbosity")
+    ] = False,
+):
+    """Downloads multiple files concurrently into a directory.
+    Existing files with the same digest as on the server are skipped. The results are printed as NDJSON.
+    """
+    from ..utils import download_helper
+    from ..utils import transport
 
-    # preserve the file content and do not add any extra newline
-    state.output_extra_newline = False
+    if not ids or ids == ["-"]:
+        # the IDs may be separated by any whitespace (e.g., one per line)
+        ids = [id for line in sys.stdin for id in line.split()]
+
+    transport.reserve_connections(jobs)
+    client = client_factory.get_client_with_verbosity(verbose)
 
     def command():
-        call(client, DefaultApi.uploaded_files_presenter_action_download, path_values=[id], state=state)
+        download_helper.download_many(client, ids, out_dir, name_template, jobs, verify)
     cmd_utils.execute_with_verbosity(command, verbose)
@@ -8,11 +8,21 @@ app = typer.Typer()
 
 @app.command()
 def swagger(
+    index_stats: Annotated[
+        bool, typer.Option(help="Print the state of the precompiled endpoint index instead of the document")
+    ] = False,
     verbose: Annotated[
         bool, typer.Option(help="Execution Verbosity")
     ] = False,
 ):
     """Prints the swagger document currently used by the application.
     """
+    if index_stats:
+        from ..utils import endpoint_index
+
+        for key, value in endpoint_index.get_index_stats(client_factory.index_path).items():
+            print(f"{key}: {value}")
+        return
+
     client = client_factory.get_client_with_verbosity(verbose)
     print(client.endpoint_resolver.get_swagger())
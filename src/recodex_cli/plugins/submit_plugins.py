@@ -0,0 +1,51 @@
+import typer
+from typing_extensions import Annotated
+
+from ..utils import client_factory
+from ..utils import cmd_utils as cmd_utils
+
+app = typer.Typer()
+
+
+@app.command()
+def batch(
+    manifest_path: Annotated[
+        str, typer.Argument(help="The JSONL manifest of the solutions, '-' for stdin")
+    ],
+    jobs: Annotated[
+        int, typer.Option(help="The maximal number of concurrent uploads", min=1)
+    ] = 4,
+    runtime: Annotated[
+        str | None, typer.Option(help="The runtime environment of the solutions that do not specify it")
+    ] = None,
+    note: Annotated[
+        str, typer.Option(help="The note of the solutions that do not specify it")
+    ] = "",
+    dry_run: Annotated[
+        bool, typer.Option(help="Only check the manifest and the files, nothing is uploaded or submitted")
+    ] = False,
+    verbose: Annotated[
+        bool, typer.Option(help="Execution Verbosity")
+    ] = False,
+):
+    """Uploads and submits multiple solutions listed in a manifest.
+
+    Each line of the manifest describes one solution, e.g.,
+    {"assignment": "<id>", "files": ["main.c", "utils.h"], "runtime": "c-gcc-linux", "note": "..."}
+    (the paths are relative to the directory of the manifest). The files are uploaded concurrently
+    and every solution is submitted as soon as its files are uploaded. The results are printed as NDJSON.
+    """
+    from ..utils import submit_helper
+    from ..utils import transport
+
+    client = None
+    if not dry_run:
+        # the uploads run concurrently with the submits of the solutions whose files are uploaded already
+        transport.reserve_connections(jobs * 2)
+        client = client_factory.get_client_with_verbosity(verbose)
+
+    def command():
+        submit_helper.submit_many(
+            client, manifest_path, client_factory.upload_journal_dir, jobs, runtime, note, dry_run, verbose
+        )
+    cmd_utils.execute_with_verbosity(command, verbose)
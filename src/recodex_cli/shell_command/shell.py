@@ -0,0 +1,235 @@
+import shlex
+import traceback
+import typer
+import click
+
+from ..utils import client_factory
+
+try:
+    import readline
+except ImportError:  # pragma: no cover
+    # readline is not available on all platforms, the shell works without history and completion
+    readline = None
+
+PROMPT = "recodex> "
+EXIT_COMMANDS = ["exit", "quit"]
+HISTORY_LENGTH = 1000
+history_path = client_factory.data_dir / "shell_history"
+
+
+def run_shell(command: click.Group, verbose: bool = False):
+    """Reads commands from the user and executes them in the current process until the user exits.
+
+    Args:
+        command (click.Group): The root command of the application (the commands are dispatched to it).
+        verbose (bool, optional): Execution verbosity. Defaults to False.
+    """
+
+    warm_up(verbose)
+    _init_readline(ShellCompleter(command))
+    typer.echo("ReCodEx shell, type 'exit' or press Ctrl+D to quit, use '--help' to list the commands.")
+
+    try:
+        while True:
+            args = _read_args()
+            if args is None or (len(args) > 0 and args[0] in EXIT_COMMANDS):
+                break
+            if len(args) == 0:
+                continue
+            if args[0] == "shell":
+                typer.echo("The shell is already running.", err=True)
+                continue
+
+            execute_command(command, args)
+    finally:
+        _save_history()
+
+
+def _read_args() -> list[str] | None:
+    # returns None at the end of the input, an empty list if there is nothing to execute
+    try:
+        line = input(PROMPT)
+    except EOFError:
+        typer.echo()
+        return None
+    except KeyboardInterrupt:
+        typer.echo()
+        return []
+
+    try:
+        return shlex.split(line)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        return []
+
+
+def execute_command(command: click.Group, args: list[str]) -> int:
+    """Executes a single command in the current process.
+
+    Args:
+        command (click.Group): The root command of the application.
+        args (list[str]): The command line arguments (without the program name).
+
+    Returns:
+        int: Returns the exit code of the command.
+    """
+
+    try:
+        # the standalone mode prints errors the same way the CLI does, but reports the exit code via SystemExit
+        command.main(args=args, prog_name="recodex", standalone_mode=True)
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        return e.code if isinstance(e.code, int) else 1
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except KeyboardInterrupt:
+        typer.echo("Interrupted.", err=True)
+        return 130
+    except Exception:
+        # only verbose commands propagate the original exceptions
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+class ShellCompleter:
+    """Tab completion of command names, options, endpoints, and QUERY parameter names.
+    """
+
+    def __init__(self, command: click.Group):
+        self.command = command
+        self.matches: list[str] = []
+        self._endpoints: list[str] | None = None
+
+    def complete(self, text: str, state: int) -> str | None:
+        """The completion function used by readline.
+
+        Args:
+            text (str): The word being completed.
+            state (int): The index of the requested match.
+
+        Returns:
+            str | None: Returns the match with the given index, or None if there are no more matches.
+        """
+
+        if state == 0:
+            line = readline.get_line_buffer()[:readline.get_begidx()] if readline else ""
+            try:
+                self.matches = self.get_matches(line, text)
+            except Exception:
+                # never break the prompt because of the completion
+                self.matches = []
+        return self.matches[state] if state < len(self.matches) else None
+
+    def get_matches(self, line: str, text: str) -> list[str]:
+        """Returns all completions of a word.
+
+        Args:
+            line (str): The part of the line preceding the completed word.
+            text (str): The word being completed.
+
+        Returns:
+            list[str]: Returns a sorted list of completions.
+        """
+
+        try:
+            words = shlex.split(line)
+        except ValueError:
+            words = line.split()
+
+        candidates = self._get_candidates(words, text)
+        return sorted(candidate for candidate in candidates if candidate.startswith(text))
+
+    def _get_candidates(self, words: list[str], text: str) -> list[str]:
+        if len(words) == 0:
+            return list(self.command.commands.keys()) + EXIT_COMMANDS
+
+        # descend into plugin groups (e.g., 'file upload')
+        subcommand: click.Command | None = self.command
+        position = 0
+        while _is_group(subcommand) and position < len(words):
+            subcommand = subcommand.commands.get(words[position])  # type: ignore
+            position += 1
+        if subcommand is None:
+            return []
+        if _is_group(subcommand):
+            return list(subcommand.commands.keys())  # type: ignore
+
+        if text.startswith("-"):
+            return [opt for param in subcommand.params for opt in param.opts if opt.startswith("--")]
+
+        if words[0] == "call":
+            return self._get_call_candidates(words[1:])
+        return []
+
+    def _get_call_candidates(self, args: list[str]) -> list[str]:
+        positional = [arg for arg in args if not arg.startswith("-")]
+        if len(args) > 0 and args[-1] == "--query" and len(positional) > 0:
+            presenter, action = positional[0].split(".", 1)
+            query_params = client_factory.get_endpoint_resolver().get_query_params(presenter, action)
+            return [f"{param['name']}=" for param in query_params]
+
+        if len(positional) == 0 and (len(args) == 0 or not args[-1].startswith("-")):
+            return self._get_endpoints()
+        return []
+
+    def _get_endpoints(self) -> list[str]:
+        if self._endpoints is None:
+            endpoint_resolver = client_factory.get_endpoint_resolver()
+            self._endpoints = [
+                f"{presenter}.{action}"
+                for presenter in endpoint_resolver.get_presenters()
+                for action in endpoint_resolver.get_actions(presenter)
+            ]
+        return self._endpoints
+
+
+def _is_group(command: click.Command | None) -> bool:
+    # typer may use its own (vendored) click classes, so the group is recognized by its interface
+    return hasattr(command, "commands")
+
+
+def warm_up(verbose: bool):
+    """Loads the endpoint definitions and the session before the first command is executed.
+    """
+
+    if verbose:
+        typer.echo(typer.style("Loading the endpoint definitions and the session...", fg=typer.colors.BRIGHT_BLACK))
+    client_factory.get_endpoint_resolver()
+    try:
+        client_factory.get_client_with_verbosity(False)
+    except click.ClickException as e:
+        # the user may still log in from the shell
+        typer.echo(f"No client could be created: {e.message}", err=True)
+
+
+def _init_readline(completer: ShellCompleter):
+    if readline is None:
+        return
+
+    readline.set_completer(completer.complete)
+    # the endpoints and options contain characters that are word delimiters by default
+    readline.set_completer_delims(" \t\n")
+    if readline.__doc__ and "libedit" in readline.__doc__:
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+
+    readline.set_history_length(HISTORY_LENGTH)
+    try:
+        readline.read_history_file(history_path)
+    except OSError:
+        pass
+
+
+def _save_history():
+    if readline is None:
+        return
+
+    try:
+        history_path.parent.mkdir(parents=True, exist_ok=True)
+        readline.write_history_file(history_path)
+    except OSError:
+        pass
@@ -0,0 +1,321 @@
+import ssl
+import zlib
+import asyncio
+import certifi
+from typing import TypeVar
+from collections.abc import Awaitable, Callable
+from urllib.parse import urljoin, urlsplit
+from urllib3 import HTTPHeaderDict
+from recodex.client_components.client_response import ClientResponse
+from recodex.generated.swagger_client.rest import ApiException
+
+from . import request_policy, timings, transport
+from .shared_client import SharedClient, PreparedRequest
+
+T = TypeVar("T")
+
+# the default maximal number of requests in flight (each one uses its own connection)
+DEFAULT_CONCURRENCY = 64
+
+# the statuses of responses without a body
+_BODILESS_STATUSES = (204, 304)
+# the statuses of redirects (the same as followed by urllib3)
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+# the headers that are not sent to another host when a request is redirected (the same as urllib3 removes)
+_CREDENTIAL_HEADERS = ("authorization", "proxy-authorization", "cookie")
+# the headers describing the body, which are dropped when a redirect changes the method to GET
+_BODY_HEADERS = ("content-type", "content-length", "content-encoding", "transfer-encoding")
+
+
+class _ConnectError(ConnectionError):
+    """Thrown when a connection could not be opened (so the request has not reached the server).
+    """
+
+
+class AsyncResponse:
+    """Response received by the asynchronous engine, which provides the same attributes as the generated REST
+    response, so that it can be wrapped by a ClientResponse (or passed to an ApiException).
+    """
+
+    def __init__(self, status: int, reason: str, headers: HTTPHeaderDict, data: bytes):
+        self.urllib3_response = None
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.data = data
+
+    def getheaders(self) -> HTTPHeaderDict:
+        return self.headers
+
+
+class AsyncEngine:
+    """Sends requests from an asyncio event loop, so that thousands of small requests can be in flight
+    without a thread per request.
+
+    The requests are prepared by the shared client (the same endpoint resolution, validation, and parameter
+    conversion as the synchronous requests), then they are sent over keep-alive HTTP/1.1 connections
+    with the same timeouts, redirects, and request policy (the rate limit, the retries, and the circuit breaker)
+    as the synchronous transport. The number of concurrent requests is bounded by a semaphore. The engine needs
+    to be used as an asynchronous context manager (or closed by `close`) inside a running event loop.
+    """
+
+    def __init__(self, client: SharedClient, concurrency: int = DEFAULT_CONCURRENCY):
+        """
+        Args:
+            client (SharedClient): The client used to prepare the requests (it holds the token and the API URL).
+            concurrency (int, optional): The maximal number of requests in flight. Defaults to DEFAULT_CONCURRENCY.
+        """
+
+        self.client = client
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._idle: dict[tuple[str, int, bool], list[tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self._ssl_context: ssl.SSLContext | None = None
+
+    async def __aenter__(self) -> "AsyncEngine":
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
+
+    async def send_request(
+        self,
+        presenter: str,
+        action: str,
+        body={},
+        path_params={},
+        query_params={},
+    ) -> ClientResponse:
+        """Sends a request to a single ReCodEx endpoint (the asynchronous counterpart of `Client.send_request`).
+
+        Args:
+            presenter (str): The name of the endpoint presenter.
+            action (str): The name of the endpoint action.
+            body (dict, optional): The body of the request. Defaults to {}.
+            path_params (dict, optional): A dictionary of path parameter name-value pairs. Defaults to {}.
+            query_params (dict, optional): A dictionary of query parameter name-value pairs. Defaults to {}.
+
+        Raises:
+            ApiException: Thrown when the server responded with an error status.
+
+        Returns:
+            ClientResponse: Returns an object detailing the response.
+        """
+
+        with timings.span("prepare_request", endpoint=f"{presenter}.{action}"):
+            request = self.client.prepare_request(presenter, action, body, path_params, query_params)
+        async with self._semaphore:
+            # the requests of the event loop overlap, so they are not nested in the trace
+            with timings.span("http", concurrent=True, method=request.method, url=request.url):
+                response = await self._send_with_policy(request)
+
+        if not 200 <= response.status <= 299:
+            raise ApiException(http_resp=response)
+        return ClientResponse(response)  # type: ignore
+
+    async def close(self):
+        """Closes all idle connections.
+        """
+
+        connections = [connection for pool in self._idle.values() for connection in pool]
+        self._idle.clear()
+        for _, writer in connections:
+            writer.close()
+        await asyncio.gather(*(writer.wait_closed() for _, writer in connections), return_exceptions=True)
+
+    async def _send_with_policy(self, request: PreparedRequest) -> AsyncResponse:
+        # the same rate limit, retries, and circuit breaker as the synchronous requests (see transport.py)
+        policy = request_policy.get_policy()
+        attempt = 0
+        while True:
+            await asyncio.sleep(policy.reserve())
+            try:
+                response = await self._send_with_redirects(request)
+            except (OSError, asyncio.IncompleteReadError) as e:
+                # the requests that failed to connect have not reached the server
+                sent = not isinstance(e, _ConnectError)
+                delay = policy.get_retry_delay(request.method, attempt, sent=sent)
+                if delay is None:
+                    raise
+            except BaseException:
+                # a trial request of an open circuit that failed unexpectedly (or was cancelled) has no result
+                policy.breaker.release()
+                raise
+            else:
+                if response.status not in request_policy.RETRY_STATUSES:
+                    policy.record_success()
+                    return response
+                retry_after = response.headers.get("Retry-After")
+                delay = policy.get_retry_delay(request.method, attempt, response.status, retry_after)
+                if delay is None:
+                    return response
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send_with_redirects(self, request: PreparedRequest) -> AsyncResponse:
+        method, url, headers, body = request.method, request.url, request.headers, request.body
+        for _ in range(transport.MAX_REDIRECTS):
+            response = await self._send(method, url, headers, body)
+            location = response.headers.get("Location")
+            if response.status not in _REDIRECT_STATUSES or location is None:
+                return response
+
+            redirect_url = urljoin(url, location)
+            if response.status == 303 and method != "HEAD":
+                # the redirect to the result of a request is fetched without the body
+                method, body = "GET", b""
+                headers = {name: value for name, value in headers.items() if name.lower() not in _BODY_HEADERS}
+            if _get_origin(redirect_url) != _get_origin(url):
+                headers = {name: value for name, value in headers.items() if name.lower() not in _CREDENTIAL_HEADERS}
+            url = redirect_url
+
+        response = await self._send(method, url, headers, body)
+        if response.status in _REDIRECT_STATUSES and "Location" in response.headers:
+            raise Exception(f"The request was redirected more than {transport.MAX_REDIRECTS} times.")
+        return response
+
+    async def _send(self, method: str, url: str, headers: dict[str, str], body: bytes) -> AsyncResponse:
+        origin = _get_origin(url)
+        parts = urlsplit(url)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        head = [f"{method} {target} HTTP/1.1", f"Host: {parts.netloc}", f"Content-Length: {len(body)}"]
+        head += [f"{name}: {value}" for name, value in headers.items() if name.lower() != "content-length"]
+        message = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+        while True:
+            reader, writer, reused = await self._get_connection(origin)
+            try:
+                writer.write(message)
+                await asyncio.wait_for(writer.drain(), transport.READ_TIMEOUT)
+                response, keep_alive = await _read_response(reader, method)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                # an idle connection might have been closed by the server, only the requests without side effects
+                # are sent again on a new one (the others might have been processed already)
+                if reused and method in request_policy.IDEMPOTENT_METHODS:
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+
+            if keep_alive:
+                self._idle.setdefault(origin, []).append((reader, writer))
+            else:
+                writer.close()
+            return response
+
+    async def _get_connection(
+        self,
+        origin: tuple[str, int, bool]
+    ) -> tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        # returns an idle connection if there is one, a new connection otherwise
+        pool = self._idle.get(origin, [])
+        while pool:
+            reader, writer = pool.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+
+        host, port, secure = origin
+        if secure and self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context(cafile=certifi.where())
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=self._ssl_context if secure else None),
+                transport.CONNECT_TIMEOUT,
+            )
+        except OSError as e:
+            raise _ConnectError(f"Could not connect to {host}:{port}: {e}") from e
+        return reader, writer, False
+
+
+def run(
+    client: SharedClient,
+    main: Callable[[AsyncEngine], Awaitable[T]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> T:
+    """Runs a coroutine that uses the asynchronous engine in a new event loop (the engine is closed afterwards).
+    This is the entry point for synchronous code (e.g., plugin commands).
+
+    Args:
+        client (SharedClient): The client used to prepare the requests.
+        main (Callable[[AsyncEngine], Awaitable[T]]): The function creating the coroutine from the engine.
+        concurrency (int, optional): The maximal number of requests in flight. Defaults to DEFAULT_CONCURRENCY.
+
+    Returns:
+        T: Returns the result of the coroutine.
+    """
+
+    async def run_with_engine() -> T:
+        async with AsyncEngine(client, concurrency) as engine:
+            return await main(engine)
+
+    return asyncio.run(run_with_engine())
+
+
+def _get_origin(url: str) -> tuple[str, int, bool]:
+    parts = urlsplit(url)
+    secure = parts.scheme == "https"
+    return parts.hostname or "", parts.port or (443 if secure else 80), secure
+
+
+async def _read(operation: Awaitable[bytes]) -> bytes:
+    # the server needs to send something within the read timeout (the same as in the synchronous transport)
+    return await asyncio.wait_for(operation, transport.READ_TIMEOUT)
+
+
+async def _read_response(reader: asyncio.StreamReader, method: str) -> tuple[AsyncResponse, bool]:
+    # returns the response and whether the connection can be reused
+    status_line = (await _read(reader.readuntil(b"\r\n"))).decode("latin-1").rstrip()
+    version, _, rest = status_line.partition(" ")
+    status_text, _, reason = rest.partition(" ")
+
+    # the repeated headers are kept (their values are joined when read)
+    headers = HTTPHeaderDict()
+    while (line := await _read(reader.readuntil(b"\r\n"))) != b"\r\n":
+        name, _, value = line.decode("latin-1").partition(":")
+        headers.add(name.strip(), value.strip())
+
+    status = int(status_text)
+    keep_alive = version == "HTTP/1.1" and "close" not in headers.get("Connection", "").lower()
+    if method == "HEAD" or status in _BODILESS_STATUSES or 100 <= status < 200:
+        data = b""
+    elif "chunked" in headers.get("Transfer-Encoding", "").lower():
+        data = await _read_chunked(reader)
+    elif "Content-Length" in headers:
+        data = await _read(reader.readexactly(int(headers["Content-Length"].split(",")[0])))
+    else:
+        # the body ends when the server closes the connection
+        data, keep_alive = await _read(reader.read()), False
+
+    return AsyncResponse(status, reason, headers, _decode_content(data, headers.get("Content-Encoding"))), keep_alive
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks = []
+    while True:
+        size = int((await _read(reader.readuntil(b"\r\n"))).split(b";")[0], 16)
+        if size == 0:
+            # skip the trailer headers
+            while await _read(reader.readuntil(b"\r\n")) != b"\r\n":
+                pass
+            return b"".join(chunks)
+        chunks.append(await _read(reader.readexactly(size)))
+        await _read(reader.readexactly(2))
+
+
+def _decode_content(data: bytes, encoding: str | None) -> bytes:
+    # the encodings decoded by urllib3 without optional packages, the others are kept as they are
+    encoding = (encoding or "").strip().lower()
+    if data and encoding in ("gzip", "x-gzip"):
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+    if data and encoding == "deflate":
+        try:
+            return zlib.decompress(data)
+        except zlib.error:
+            # some servers send the raw deflate stream without the zlib header
+            return zlib.decompress(data, -zlib.MAX_WBITS)
+    return data
@@ -1,12 +1,42 @@
+import os
 import typer
-from recodex import client_factory
-from recodex.client import Client
+import atexit
+import appdirs
+from pathlib import Path
+from typing import TYPE_CHECKING
 
+from . import timings
 from .cmd_utils import execute_with_verbosity
 from .login_info import LoginInfo
 
+# the heavy modules (the generated client, the swagger parser) are imported only when a client is needed
+if TYPE_CHECKING:
+    from recodex.client import Client
+    from recodex.helpers.user_session import UserSession
+    from .endpoint_index import IndexedEndpointResolver
+    from .response_cache import ResponseCache
 
-def login(login_info: LoginInfo, verbose=False):
+# the same locations as in the pylib client factory (recodex.client_factory),
+# which is not imported here since it loads the whole generated client
+data_dir = Path(appdirs.user_data_dir("recodex"))
+session_path = data_dir / "context.yaml"
+# the precompiled endpoint index (see endpoint_index.py) is stored next to the session
+index_path = data_dir / "endpoint_index.json"
+# the endpoint names and their QUERY parameters read by the shell completion (see endpoint_completion.py)
+completion_path = data_dir / "endpoint_completion.json"
+# the journals of interrupted uploads (see upload_helper.py)
+upload_journal_dir = data_dir / "uploads"
+# the cached responses of GET endpoints (see response_cache.py), one subdirectory per API URL and user
+cache_dir = data_dir / "cache"
+
+# the client, its session and the endpoint resolver are shared by all commands executed in the same process
+_client: "Client | None" = None
+_client_session: "UserSession | None" = None
+_endpoint_resolver: "IndexedEndpointResolver | None" = None
+_stats_reported = False
+
+
+def login(login_info: LoginInfo, verbose=False):  # noqa: C901
     """Determines and executes the best login approach based on the provided information.
 
     Args:
@@ -17,9 +47,11 @@ def login(login_info: LoginInfo, verbose=False):
         Exception: Thrown when important input values were missing, or the login process failed
     """
 
+    _reset_client()
+
     # if the api_url was not provided, load it from the session file as a secondary source
     # the api_url may still be None afterwards if it was missing from the session file for some reason
-    user_context = client_factory.load_session()
+    user_context = load_session()
     if user_context is not None and login_info.api_url is None:
         print("Reusing API URL from session file.")
         login_info.api_url = user_context.api_url
@@ -30,7 +62,7 @@ def login(login_info: LoginInfo, verbose=False):
             login_info.api_url = typer.prompt("API URL")
         if login_info.api_token is None:
             login_info.api_token = typer.prompt("API Token")
-        client_factory.create_session_from_token(login_info.api_url, login_info.api_token, verbose)
+        _create_session_from_token(login_info.api_url, login_info.api_token, verbose)
         return
 
     # prompt the API URL, username, and password and overwrite any existing session file
@@ -41,7 +73,7 @@ def login(login_info: LoginInfo, verbose=False):
             login_info.username = typer.prompt("Username")
         if login_info.password is None:
             login_info.password = typer.prompt("Password", hide_input=True)
-        client_factory.create_session_from_credentials(
+        _create_session_from_credentials(
             login_info.api_url,
             login_info.username,
             login_info.password,
@@ -55,7 +87,7 @@ def login(login_info: LoginInfo, verbose=False):
 
     # login with provided token
     if login_info.api_token is not None:
-        client_factory.create_session_from_token(login_info.api_url, login_info.api_token, verbose)
+        _create_session_from_token(login_info.api_url, login_info.api_token, verbose)
         return
 
     # either a token or username and password needs to be provided
@@ -63,7 +95,7 @@ def login(login_info: LoginInfo, verbose=False):
         raise Exception("Please provide an API token or a username and password.")
 
     # login with credentials
-    client_factory.create_session_from_credentials(
+    _create_session_from_credentials(
         login_info.api_url,
         login_info.username,
         login_info.password,
@@ -78,11 +110,14 @@ def logout(verbose=False):
         verbose (bool, optional): Execution verbosity. Defaults to False.
     """
 
-    client_factory.remove_session()
+    _reset_client()
+    if session_path.exists():
+        os.remove(session_path)
 
 
-def get_client_with_verbosity(verbose: bool) -> Client:
+def get_client_with_verbosity(verbose: bool) -> "Client":
     """Creates a client object from the local user context file.
+    The client is created only once and it is shared by all commands executed in the same process.
 
     Args:
         verbose (bool): Whether to truncate error messages.
@@ -91,7 +126,68 @@ def get_client_with_verbosity(verbose: bool) -> Client:
         Client: Returns a client object.
     """
 
-    return execute_with_verbosity(client_factory.get_client_from_session, verbose)
+    global _client, _client_session
+    if verbose:
+        _report_pool_stats_at_exit()
+
+    # the token of a long-running process (e.g., the shell) might need to be refreshed
+    if _client_session is not None and _client_session.is_token_almost_expired():
+        _reset_client()
+
+    if _client is None:
+        _client, _client_session = execute_with_verbosity(_load_session_and_create_client, verbose)
+    return _client
+
+
+def get_endpoint_resolver() -> "IndexedEndpointResolver":
+    """Returns the endpoint resolver shared by all clients and commands executed in the same process.
+    The resolver is created on the first call from the precompiled endpoint index (the swagger document
+    is parsed only if the index is missing or outdated).
+
+    Returns:
+        IndexedEndpointResolver: Returns the shared endpoint resolver.
+    """
+
+    global _endpoint_resolver
+    if _endpoint_resolver is None:
+        with timings.span("endpoint_index"):
+            from . import endpoint_index
+            _endpoint_resolver = endpoint_index.load_resolver(index_path, completion_path)
+    return _endpoint_resolver
+
+
+def get_response_cache() -> "ResponseCache":
+    """Returns the response cache of the user of the current session.
+    The entries of different users (or servers) are stored in separate directories.
+
+    Raises:
+        Exception: Thrown when there is no session.
+
+    Returns:
+        ResponseCache: Returns the cache.
+    """
+
+    from . import response_cache
+
+    session = _client_session if _client_session is not None else load_session()
+    if session is None:
+        raise Exception("No session file was found.")
+    scope = response_cache.get_scope(session.get_api_url(), session.get_user_id())
+    return response_cache.ResponseCache(cache_dir / scope)
+
+
+def load_session() -> "UserSession | None":
+    """Creates a UserSession object from the session file if it exists.
+
+    Returns:
+        UserSession | None: Returns the loaded UserSession, or None if there is no file.
+    """
+
+    if not session_path.exists():
+        return None
+
+    from recodex.helpers.user_session import UserSession
+    return UserSession.load(session_path)
 
 
 def load_session_with_verbosity(verbose: bool):
@@ -104,11 +200,11 @@ def load_session_with_verbosity(verbose: bool):
         UserSession | None: Returns a user session object or None if no session file exists.
     """
 
-    session = client_factory.load_session()
+    session = load_session()
     if session is None:
         typer.echo("No session found.")
         if verbose:
-            typer.echo(f"Session file path: {client_factory.session_path}")
+            typer.echo(f"Session file path: {session_path}")
         return None
 
     if session.is_token_expired():
@@ -125,4 +221,140 @@ def load_session_with_verbosity(verbose: bool):
 
 def refresh_session():
     """Refresh the session token even if it is not close to expiration."""
-    client_factory.refresh_session()
+    _reset_client()
+    _load_session_and_create_client(force_refresh=True)
+
+
+def _reset_client():
+    # the session is about to be changed, so the client needs to be recreated
+    global _client, _client_session
+    _client, _client_session = None, None
+
+
+# release the client before the interpreter starts tearing down modules (its thread pool needs them)
+atexit.register(_reset_client)
+
+
+def _create_client(token: str, api_url: str) -> "Client":
+    with timings.span("imports"):
+        from . import transport
+        from .shared_client import SharedClient
+    resolver = get_endpoint_resolver()
+    with timings.span("create_client"):
+        return SharedClient(token, api_url, resolver, transport.get_transport())
+
+
+def _create_session_from_token(api_url: str, api_token: str, verbose=False) -> "UserSession":
+    """Creates a session file from the provided API token (mirrors the pylib client factory).
+
+    Args:
+        api_url (str): The URL of the API.
+        api_token (str): Authentication token for ReCodEx.
+        verbose (bool, optional): Whether status messages should be printed to stdin. Defaults to False.
+
+    Returns:
+        UserSession: Returns the stored session object.
+    """
+
+    from recodex.helpers.user_session import UserSession
+
+    session = UserSession(api_url.strip(), api_token.strip())
+    if session.is_token_expired():
+        raise Exception("The provided API token had expired.")
+
+    session.store(session_path)
+    if verbose:
+        print(f"Login token stored at: {session_path}")
+
+    return session
+
+
+def _create_session_from_credentials(api_url: str, username: str, password: str, verbose=False) -> "UserSession":
+    """Retrieves an API token and creates a session file from the provided credentials (mirrors the pylib
+    client factory, but the login request is sent by a client using the shared endpoint resolver).
+
+    Args:
+        api_url (str): The URL of the API.
+        username (str): ReCodEx username.
+        password (str): ReCodEx password.
+        verbose (bool, optional): Whether status messages should be printed to stdin. Defaults to False.
+
+    Returns:
+        UserSession: Returns the stored session object.
+    """
+
+    from recodex.helpers.user_session import UserSession
+
+    api_url = api_url.strip()
+    client = _create_client("", api_url)
+
+    if verbose:
+        print("Connecting...")
+    token = client.get_login_token(username.strip(), password.strip())
+    session = UserSession(api_url, token)
+
+    session.store(session_path)
+    if verbose:
+        print(f"Login token stored at: {session_path}")
+
+    return session
+
+
+def _load_session_and_create_client(force_refresh: bool = False) -> "tuple[Client, UserSession]":
+    """Loads the session from the session file and creates a client object (mirrors the pylib client factory).
+    The token is refreshed if it is close to expiration.
+
+    Args:
+        force_refresh (bool, optional): Whether the token should be refreshed even if it is not
+            close to expiration. Defaults to False.
+
+    Raises:
+        Exception: Thrown when the session file is missing, expired, or incomplete.
+
+    Returns:
+        tuple[Client, UserSession]: Returns the client object and the session it was created from.
+    """
+
+    with timings.span("load_session"):
+        session = load_session()
+    if session is None:
+        raise Exception("No session file was found.")
+    if session.is_token_expired():
+        raise Exception("The session token expired.")
+    if session.get_api_token() is None:
+        raise Exception("No session token was not found in the session.")
+    if session.get_api_url() is None:
+        raise Exception("No API URL was found in the session.")
+
+    client = _create_client(session.get_api_token(), session.get_api_url())  # type: ignore
+
+    # refresh token if necessary
+    if session.is_token_almost_expired() or force_refresh:
+        with timings.span("refresh_token"):
+            session = session.replace_token(client.get_refresh_token())
+            session.store(session_path)
+        # recreate client
+        client = _create_client(session.get_api_token(), session.get_api_url())  # type: ignore
+    return client, session
+
+
+def _report_pool_stats_at_exit():
+    global _stats_reported
+    if _stats_reported:
+        return
+    _stats_reported = True
+
+    def report():
+        from . import transport, request_policy
+
+        stats = transport.get_stats()
+        if stats is None or stats["requests"] == 0:
+            return
+        message = (f"Connection pool: {stats['requests']} requests, {stats['hits']} hits, "
+                   f"{stats['misses']} misses, {stats['expirations']} keep-alive expirations")
+        retried = request_policy.get_policy().retried
+        if retried > 0:
+            message += f", {retried} retried requests"
+        typer.echo(typer.style(message, fg=typer.colors.BRIGHT_BLACK), err=True)
+
+    atexit.register(report)
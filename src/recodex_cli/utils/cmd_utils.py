@@ -1,10 +1,20 @@
+import os
+import sys
+import mmap
 import json
-import yaml
 import click
 import typing
+import contextlib
 from collections.abc import Callable
 from recodex.helpers.utils import parse_endpoint_function
 
+# the formats of the request body files with these extensions are not detected from the content
+BODY_FORMAT_EXTENSIONS = {".json": "json", ".yaml": "yaml", ".yml": "yaml"}
+# the body files larger than this are memory-mapped instead of being read into memory
+BODY_MMAP_THRESHOLD = 2 ** 20  # 1 MiB
+# the number of characters searched for the first significant one when the format is detected
+BODY_SNIFF_SIZE = 4096
+
 
 def parse_endpoint_or_throw(endpoint: str | Callable) -> tuple[str, str]:
     """Parses an endpoint representation into a presenter and action.
@@ -36,52 +46,90 @@ def parse_json(json_string) -> dict:
         raise Exception("The JSON string is corrupted.")
 
 
-def parse_input_body_file(path: str) -> dict:
+def parse_input_body_file(path: str, body_format: str | None = None) -> typing.Any:
     """Parses a file as JSON or YAML.
+    The format is detected from the file extension (or the first significant character) unless it is given.
+    Large files are memory-mapped, so that they are not copied into a string before they are parsed.
 
     Args:
-        path (str): The path to the file.
+        path (str): The path to the file, or '-' for stdin.
+        body_format (str | None, optional): The format of the file ('json' or 'yaml'). Defaults to None (detected).
 
     Raises:
         Exception: Thrown when the file could not be found or parsed.
 
     Returns:
-        dict: Returns a dictionary with the parsed file.
+        Any: Returns the parsed file.
     """
 
+    if body_format is None:
+        body_format = BODY_FORMAT_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
     try:
-        with open(path, "r") as handle:
-            json_or_yaml_string = handle.read()
-    except:
+        handle = sys.stdin.buffer if path == "-" else open(path, "rb")
+    except OSError:
         raise Exception("Could not open request body file.")
 
-    return parse_input_body(json_or_yaml_string)
+    with contextlib.ExitStack() as stack:
+        if path != "-":
+            stack.enter_context(handle)
+        data: typing.Any
+        if path != "-" and os.fstat(handle.fileno()).st_size >= BODY_MMAP_THRESHOLD:
+            data = stack.enter_context(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            data = handle.read()
+        return parse_input_body(data, body_format)
 
 
-def parse_input_body(json_or_yaml_string: str) -> dict:
+def parse_input_body(json_or_yaml_string: str | bytes | mmap.mmap, body_format: str | None = None) -> typing.Any:
     """Parses a string as JSON or YAML.
+    Unless the format is given, the string is parsed as JSON only if it starts like a JSON document
+    (YAML is a superset of JSON, so the YAML parser is used if JSON fails).
 
     Args:
-        json_or_yaml_string (str): A string in JSON or YAML format.
+        json_or_yaml_string (str | bytes | mmap.mmap): A string in JSON or YAML format (or a file mapped to memory).
+        body_format (str | None, optional): The format of the string ('json' or 'yaml'). Defaults to None (detected).
 
     Raises:
         Exception: Thrown when the string could not be parsed.
 
     Returns:
-        dict: Returns a dictionary with the parsed string.
+        Any: Returns the parsed string.
     """
 
+    if body_format is None or body_format == "json":
+        if body_format == "json" or _looks_like_json(json_or_yaml_string):
+            try:
+                # json.loads does not accept memory maps, their content is copied to bytes (not decoded to a string)
+                return json.loads(json_or_yaml_string[:] if isinstance(json_or_yaml_string, mmap.mmap)
+                                  else json_or_yaml_string)
+            except ValueError:
+                if body_format == "json":
+                    raise Exception("The request body is not a valid JSON.")
+
+    # yaml is loaded only when needed (it is not required by most of the commands)
+    import yaml
+
+    # the C parser (if libyaml is available) is an order of magnitude faster for large documents,
+    # the memory maps are read in chunks as streams
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     try:
-        return json.loads(json_or_yaml_string)
-    except:
-        pass
-
-    try:
-        return yaml.safe_load(json_or_yaml_string)
-    except:
+        return yaml.load(json_or_yaml_string, Loader=loader)
+    except (yaml.YAMLError, ValueError):
+        if body_format == "yaml":
+            raise Exception("The request body is not a valid YAML.")
         raise Exception("The request body in neither a valid JSON or YAML.")
 
 
+def _looks_like_json(json_or_yaml_string: str | bytes | mmap.mmap) -> bool:
+    # checks the first significant character (only the JSON documents used as bodies are recognized)
+    prefix = json_or_yaml_string[:BODY_SNIFF_SIZE]
+    if isinstance(prefix, bytes):
+        prefix = prefix.decode("utf-8", errors="ignore")
+    prefix = prefix.lstrip("\ufeff \t\r\n")
+    return prefix == "" or prefix[0] in "{[\""
+
+
 def execute_with_verbosity(command: Callable[[], typing.Any], verbose: bool):
     """Executes a callback with a specified error verbosity.
 
@@ -106,6 +154,23 @@ def execute_with_verbosity(command: Callable[[], typing.Any], verbose: bool):
             raise click.ClickException(str(e))
 
 
+def get_api_error_message(error: Exception) -> str:
+    """Extracts the message of an API error response (e.g., a missed deadline), which is more useful
+    than the whole HTTP response.
+
+    Args:
+        error (Exception): The exception thrown by the client.
+
+    Returns:
+        str: Returns the message of the error response, or the description of the exception.
+    """
+
+    try:
+        return json.loads(error.body)["error"]["message"]  # type: ignore
+    except Exception:
+        return str(error)
+
+
 def get_param_info_text_tokens(param: dict) -> dict:
     """Parses a request parameter schema.
 
@@ -0,0 +1,307 @@
+import os
+import sys
+import json
+import hashlib
+import collections
+from typing import BinaryIO
+from collections.abc import Iterable
+from recodex.generated.swagger_client.rest import ApiException
+
+from .shared_client import SharedClient
+from .progress import TransferProgress
+from .upload_helper import get_server_digest
+from .worker_pool import run_bounded
+
+# the size of the chunks written to the output (the memory used does not depend on the file size)
+CHUNK_SIZE = 2 ** 17  # 128 KiB
+
+# the suffix of the incomplete files (renamed to the output path once the download is finished and verified)
+PART_SUFFIX = ".part"
+
+DIGEST_MISMATCH_MESSAGE = "The digest of the downloaded file does not match the server (the file is corrupted)."
+
+
+def download(
+    client: SharedClient,
+    file_id: str,
+    out_path: str | None = None,
+    resume: bool = False,
+    verify: bool = True,
+    verbose: bool = False,
+    live_progress: bool = True,
+    expected_digest: str | None = None,
+) -> int:
+    """Downloads a file in chunks and writes them to a file or the stdout as they arrive.
+
+    A file is first written to a `.part` file, which is renamed to the output path once the download
+    is finished and the digest is verified. If the download is interrupted, the `.part` file is kept,
+    so that the download can be resumed (the server is asked only for the rest of the file).
+
+    Args:
+        client (SharedClient): The client used for the download.
+        file_id (str): The ID of the file.
+        out_path (str | None, optional): The path of the output file, the binary stdout is used if None or '-'.
+            Defaults to None.
+        resume (bool, optional): Whether to continue from an existing `.part` file. Defaults to False.
+        verify (bool, optional): Whether the digest of the file is compared with the server. Defaults to True.
+        verbose (bool, optional): Whether the transfer summary should be printed. Defaults to False.
+        live_progress (bool, optional): Whether the progress line is drawn. Defaults to True.
+        expected_digest (str | None, optional): The digest of the file on the server if the caller knows it already.
+            Defaults to None (the digest is fetched from the server).
+
+    Raises:
+        Exception: Thrown when the request failed, the output file could not be written,
+            or the digests do not match.
+
+    Returns:
+        int: Returns the number of downloaded bytes (excluding the resumed part).
+    """
+
+    if out_path is None or out_path == "-":
+        if resume:
+            raise Exception("Only downloads into a file (see --out-path) can be resumed.")
+        return _download_to_stdout(client, file_id, verify, verbose, live_progress, expected_digest)
+
+    part_path = out_path + PART_SUFFIX
+    transferred, hash = _download_to_part_file(client, file_id, part_path, resume, verbose, live_progress)
+
+    if verify and not _digest_matches(client, file_id, hash, expected_digest):
+        # never leave a corrupted file behind (it cannot be resumed either)
+        os.remove(part_path)
+        raise Exception(DIGEST_MISMATCH_MESSAGE)
+
+    os.replace(part_path, out_path)
+    return transferred
+
+
+def download_many(
+    client: SharedClient,
+    file_ids: Iterable[str],
+    out_dir: str,
+    name_template: str = "{id}",
+    jobs: int = 4,
+    verify: bool = True,
+):
+    """Downloads multiple files concurrently into a directory and prints the results as NDJSON.
+    Files that exist already and have the same digest as on the server are skipped.
+    If the template gives the same name to more files, their IDs are appended to their names.
+
+    Args:
+        client (SharedClient): The client shared by all workers.
+        file_ids (Iterable[str]): The IDs of the files (duplicates are downloaded only once).
+        out_dir (str): The output directory (created if it does not exist).
+        name_template (str, optional): The template of the file names, which may contain the {id} and {name}
+            (the original name of the file) fields. Defaults to "{id}".
+        jobs (int, optional): The maximal number of concurrent downloads. Defaults to 4.
+        verify (bool, optional): Whether the digests of the downloaded files are compared with the server.
+            Defaults to True.
+
+    Raises:
+        Exception: Thrown when the output directory could not be created or if any of the downloads failed.
+    """
+
+    try:
+        os.makedirs(out_dir, exist_ok=True)
+    except OSError as e:
+        raise Exception(f"Could not create the output directory: {e}")
+
+    def worker(item: tuple[str, str]) -> dict:
+        file_id, path = item
+        # the digest fetched for an existing file is reused to verify its download
+        server_digest = None
+        if os.path.exists(path):
+            local_hash = hashlib.sha1()
+            _hash_file(path, local_hash)
+            server_digest = get_server_digest(client, file_id)
+            if server_digest == local_hash.hexdigest():
+                return {"path": path, "status": "skipped"}
+
+        # the concurrent downloads would overwrite each other's progress line
+        transferred = download(
+            client, file_id, path, verify=verify, live_progress=False, expected_digest=server_digest
+        )
+        progress.update(transferred)
+        return {"path": path, "status": "downloaded", "bytes": transferred}
+
+    # all names are resolved before any download starts, so that the files with the same name
+    # are never downloaded into the same path
+    names, errors = _get_file_names(client, file_ids, name_template, jobs)
+    for file_id, error in errors.items():
+        print(json.dumps({"id": file_id, "error": str(error)}, ensure_ascii=False), flush=True)
+    total, skipped, failed = len(errors), 0, len(errors)
+
+    progress = TransferProgress("Downloaded", verbose=True)
+    paths = [(file_id, os.path.join(out_dir, name)) for file_id, name in disambiguate_names(names).items()]
+    for (file_id, _), result, error in run_bounded(worker, paths, jobs):
+        total += 1
+        if error is None:
+            record = {"id": file_id, **(result or {})}
+            skipped += record["status"] == "skipped"
+        else:
+            failed += 1
+            record = {"id": file_id, "error": str(error)}
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+
+    progress.label = f"{total - skipped - failed} files downloaded ({skipped} skipped, {failed} failed),"
+    progress.finish()
+    if failed > 0:
+        raise Exception(f"{failed} of {total} downloads failed.")
+
+
+def disambiguate_names(names: dict[str, str]) -> dict[str, str]:
+    """Makes the file names unique, the ID is appended to the names shared by more files
+    (e.g., 'main.c' of two solutions becomes 'main-<id>.c').
+
+    Args:
+        names (dict[str, str]): The file names by the IDs of the files.
+
+    Returns:
+        dict[str, str]: Returns the unique names by the IDs of the files.
+    """
+
+    counts = collections.Counter(names.values())
+    unique = {}
+    for file_id, name in names.items():
+        if counts[name] > 1:
+            stem, extension = os.path.splitext(name)
+            name = f"{stem}-{file_id}{extension}"
+        unique[file_id] = name
+    return unique
+
+
+def _get_file_names(
+    client: SharedClient, file_ids: Iterable[str], name_template: str, jobs: int
+) -> tuple[dict[str, str], dict[str, Exception]]:
+    # returns the names of the files by their IDs and the errors of the files whose names could not be resolved
+    def worker(file_id: str) -> str:
+        return _get_file_name(client, file_id, name_template)
+
+    names, errors = {}, {}
+    for file_id, name, error in run_bounded(worker, dict.fromkeys(file_ids), jobs):
+        if error is None:
+            names[file_id] = name
+        else:
+            errors[file_id] = error
+    return names, errors
+
+
+def _get_file_name(client: SharedClient, file_id: str, name_template: str) -> str:
+    fields = {"id": file_id}
+    if "{name}" in name_template:
+        res = client.send_request("uploaded_files", "detail", path_params={"id": file_id}).get_parsed_data()
+        if res is None:
+            raise Exception("Could not parse response data")
+        # the name must not point outside of the output directory
+        fields["name"] = os.path.basename(res["payload"]["name"])
+
+    try:
+        return name_template.format(**fields)
+    except (KeyError, IndexError, ValueError):
+        raise Exception("The file name template may contain only the {id} and {name} fields.")
+
+
+def _download_to_part_file(
+    client: SharedClient,
+    file_id: str,
+    part_path: str,
+    resume: bool,
+    verbose: bool,
+    live_progress: bool,
+):
+    # returns the number of downloaded bytes and the hash of the whole file
+    hash = hashlib.sha1()
+    offset = _hash_file(part_path, hash) if resume else 0
+    if offset > 0 and verbose:
+        print(f"Resuming the download from {offset} bytes", file=sys.stderr)
+
+    try:
+        response = client.send_raw_request(
+            "uploaded_files",
+            "download",
+            path_params={"id": file_id},
+            headers={"Range": f"bytes={offset}-"} if offset > 0 else {},
+            stream=True,
+        )
+    except ApiException as e:
+        # the part file is complete already (the range starts at the end of the file)
+        if offset > 0 and e.status == 416:
+            return 0, hash
+        raise
+
+    if offset > 0 and response.status != 206:
+        # the server does not support range requests, so the whole file is being sent
+        offset, hash = 0, hashlib.sha1()
+        if verbose:
+            print("The server does not support resuming, downloading the whole file", file=sys.stderr)
+
+    try:
+        handle = open(part_path, "ab" if offset > 0 else "wb")
+    except OSError as e:
+        response.release_conn()
+        raise Exception(f"Could not open the output file: {e}")
+    with handle:
+        return _write_response(response, handle, hash, offset, verbose, live_progress), hash
+
+
+def _download_to_stdout(
+    client: SharedClient, file_id: str, verify: bool, verbose: bool, live_progress: bool, expected_digest: str | None
+) -> int:
+    response = client.send_raw_request("uploaded_files", "download", path_params={"id": file_id}, stream=True)
+    hash = hashlib.sha1()
+
+    # the text layer may hold some buffered output which needs to precede the file content
+    sys.stdout.flush()
+    transferred = _write_response(response, sys.stdout.buffer, hash, 0, verbose, live_progress)
+    sys.stdout.buffer.flush()
+
+    # the content has been written already, but the command still fails
+    if verify and not _digest_matches(client, file_id, hash, expected_digest):
+        raise Exception(DIGEST_MISMATCH_MESSAGE)
+    return transferred
+
+
+def _write_response(response, handle: BinaryIO, hash, offset: int, verbose: bool, live_progress: bool) -> int:
+    length = _get_content_length(response)
+    total = offset + length if length is not None else None
+    progress = TransferProgress("Downloaded", total, offset, verbose, live_progress)
+    try:
+        for chunk in response.stream(CHUNK_SIZE):
+            handle.write(chunk)
+            hash.update(chunk)
+            progress.update(len(chunk))
+    finally:
+        response.release_conn()
+
+    progress.finish()
+    return progress.transferred
+
+
+def _digest_matches(client: SharedClient, file_id: str, hash, expected_digest: str | None = None) -> bool:
+    if expected_digest is None:
+        expected_digest = get_server_digest(client, file_id)
+    return expected_digest == hash.hexdigest()
+
+
+def _hash_file(path: str, hash) -> int:
+    # returns the size of the file (0 if it does not exist)
+    try:
+        handle = open(path, "rb")
+    except FileNotFoundError:
+        return 0
+    except OSError as e:
+        raise Exception(f"Could not read the partially downloaded file: {e}")
+
+    size = 0
+    with handle:
+        while chunk := handle.read(CHUNK_SIZE):
+            hash.update(chunk)
+            size += len(chunk)
+    return size
+
+
+def _get_content_length(response) -> int | None:
+    length = response.headers.get("Content-Length")
+    try:
+        return int(length) if length is not None else None
+    except ValueError:
+        return None
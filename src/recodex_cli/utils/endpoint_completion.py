@@ -0,0 +1,83 @@
+import json
+import typer
+from typing import Any
+
+from . import client_factory
+
+# the completion data loaded by this process (the shell and the daemon complete many times)
+_completion: dict[str, list] | None = None
+
+
+def complete_endpoint(incomplete: str) -> list[tuple[str, str]]:
+    """Completes the endpoint argument of the call command (the callback of the shell completion).
+
+    The endpoints are read from the compact completion file written next to the endpoint index
+    (see `endpoint_index.load_resolver`), so that neither the generated client nor the swagger document
+    is loaded on every Tab press.
+
+    Args:
+        incomplete (str): The typed part of the endpoint.
+
+    Returns:
+        list[tuple[str, str]]: Returns the matching endpoints in <presenter.action> format with their summaries.
+    """
+
+    return [
+        (endpoint, summary) for endpoint, (summary, _) in _load_completion().items() if endpoint.startswith(incomplete)
+    ]
+
+
+def complete_query(ctx: typer.Context, incomplete: str) -> list[str]:
+    """Completes the names of the QUERY parameters of the endpoint given on the command line
+    (the callback of the shell completion of the --query option).
+
+    Args:
+        ctx (typer.Context): The context of the call command (holding the parsed endpoint).
+        incomplete (str): The typed part of the option value.
+
+    Returns:
+        list[str]: Returns the matching parameters in the <name=> form (the values are not completed).
+    """
+
+    # the values of the parameters are not known
+    if "=" in incomplete:
+        return []
+    # the arguments are not assigned to the parameters while completing (they are left in the extra arguments)
+    endpoint = ctx.params.get("endpoint") or next(iter(ctx.args), "")
+    endpoint_data = _load_completion().get(endpoint)
+    if endpoint_data is None:
+        return []
+
+    # the parameters used already are not offered again
+    used = {value.partition("=")[0] for value in ctx.params.get("query") or []}
+    return [f"{name}=" for name in endpoint_data[1] if name.startswith(incomplete) and name not in used]
+
+
+def build_completion(endpoints: list[tuple[str, str, list[str]]]) -> dict[str, Any]:
+    """Creates the content of the completion file.
+
+    Args:
+        endpoints (list[tuple[str, str, list[str]]]): The names of the endpoints (in <presenter.action>
+            format), their summaries, and the names of their QUERY parameters.
+
+    Returns:
+        dict[str, Any]: Returns the completion data (a JSON-serializable dictionary).
+    """
+
+    return {"endpoints": {endpoint: [summary, query_params] for endpoint, summary, query_params in endpoints}}
+
+
+def _load_completion() -> dict[str, list]:
+    # the completion never fails, a missing or corrupted file just offers nothing
+    # (a missing file is written again by the next command that loads the endpoint index)
+    global _completion
+    if _completion is None:
+        try:
+            with open(client_factory.completion_path, "r") as handle:
+                completion = json.load(handle)["endpoints"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+        if not isinstance(completion, dict):
+            return {}
+        _completion = completion
+    return _completion
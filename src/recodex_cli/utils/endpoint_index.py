@@ -0,0 +1,234 @@
+import os
+import json
+import time
+import hashlib
+import recodex
+from pathlib import Path
+from typing import Any
+from recodex.helpers.utils import camel_case_to_snake_case
+from recodex.client_components.alias_container import AliasContainer
+from recodex.client_components.endpoint_resolver import EndpointResolver
+
+from . import endpoint_completion
+from .endpoint_search import EndpointSearch, build_search_index
+
+# increment whenever the structure of the index changes (older index files are rebuilt)
+INDEX_VERSION = 3
+
+# the swagger document and the aliases are bundled with the pylib library
+_pylib_dir = Path(recodex.__file__).parent
+spec_path = _pylib_dir / "generated" / "swagger.yaml"
+aliases_path = _pylib_dir / "aliases.yaml"
+
+# the swagger keys used by the resolver, the validator and the help (the responses are not needed)
+_DEFINITION_KEYS = ["operationId", "method", "summary", "description", "parameters", "requestBody"]
+
+
+class IndexedEndpointResolver(EndpointResolver):
+    """Endpoint resolver created from a precompiled index instead of parsing the swagger document.
+    """
+
+    def __init__(self, index: dict[str, Any]):
+        """
+        Args:
+            index (dict[str, Any]): The index created by the `build_index` function.
+        """
+
+        # the base constructor is not called, since it parses the swagger document
+        self.user_aliases: dict[str, dict] = index["user_aliases"]
+        self.definitions: dict[str, dict] = index["definitions"]
+        self.paths: dict[str, str] = index["paths"]
+        self.swagger_hash: str = index["swagger_hash"]
+        self.search_index: dict[str, Any] = index["search"]
+        self._search: EndpointSearch | None = None
+
+        # the same as in the base constructor
+        self.alias_container = AliasContainer(self.definitions)
+        for presenter, presenter_alias_obj in self.user_aliases.items():
+            if 'alias' in presenter_alias_obj:
+                self.alias_container.add_presenter_alias(presenter, presenter_alias_obj['alias'])
+
+            for action, action_alias in presenter_alias_obj.get('actions', {}).items():
+                self.alias_container.add_action_alias(presenter, action, action_alias)
+
+    def get_endpoint_path(self, presenter: str, action: str) -> str:
+        """Returns the URL path of the endpoint (relative to the API URL).
+
+        Args:
+            presenter (str): ReCodEx presenter or alias.
+            action (str): ReCodEx action or alias.
+
+        Returns:
+            str: Returns the path with PATH parameter placeholders (e.g., '/v1/groups/{id}').
+        """
+
+        operation_id = self.alias_container.get_operation_id(presenter, action)
+        return self.paths[operation_id]
+
+    def get_search(self) -> EndpointSearch:
+        """Returns the full-text search of the endpoints (created from the index on the first call).
+        """
+
+        if self._search is None:
+            self._search = EndpointSearch(self.search_index)
+        return self._search
+
+
+# statistics of the index loaded by this process (printed by 'info swagger --index-stats')
+_load_stats: dict[str, Any] = {}
+
+
+def load_resolver(index_path: Path, completion_path: Path | None = None) -> IndexedEndpointResolver:
+    """Loads the endpoint index from the disk, the index is rebuilt (and stored) only if the swagger
+    document or the aliases changed.
+
+    Args:
+        index_path (Path): The path of the index file.
+        completion_path (Path | None, optional): The path of the compact file read by the shell completion,
+            which is written whenever the index is rebuilt (or if it is missing). Defaults to None.
+
+    Returns:
+        IndexedEndpointResolver: Returns an endpoint resolver created from the index.
+    """
+
+    start = time.perf_counter()
+    index, source = _load_index(index_path), "cache"
+    if index is None:
+        index, source = build_index(), "rebuilt"
+        _store_json(index, index_path)
+    if completion_path is not None and (source == "rebuilt" or not completion_path.exists()):
+        _store_json(index["completion"], completion_path)
+
+    resolver = IndexedEndpointResolver(index)
+    _load_stats.update(source=source, load_time=time.perf_counter() - start)
+    return resolver
+
+
+def build_index() -> dict[str, Any]:
+    """Parses the swagger document and creates the endpoint index.
+
+    Returns:
+        dict[str, Any]: Returns the index (a JSON-serializable dictionary).
+    """
+
+    resolver = EndpointResolver()
+    definitions, paths = {}, {}
+    for path, path_body in resolver.spec["paths"].items():
+        for method_body in path_body.values():
+            operation_id = camel_case_to_snake_case(method_body["operationId"])
+            definitions[operation_id] = {key: method_body[key] for key in _DEFINITION_KEYS if key in method_body}
+            paths[operation_id] = path
+
+    search_index = build_search_index(resolver)
+    completion = endpoint_completion.build_completion([
+        (endpoint, summary, [param["name"] for param in resolver.get_query_params(*endpoint.split("."))])
+        for endpoint, summary in search_index["endpoints"]
+    ])
+
+    return {
+        "version": INDEX_VERSION,
+        "swagger_hash": get_swagger_hash(),
+        "source_stamp": _get_source_stamp(),
+        "created_at": time.time(),
+        "user_aliases": resolver.user_aliases,
+        "definitions": definitions,
+        "paths": paths,
+        "search": search_index,
+        "completion": completion,
+    }
+
+
+def get_swagger_hash() -> str:
+    """Returns the SHA-256 hash of the swagger document and the aliases used by the resolver.
+    """
+
+    hash = hashlib.sha256()
+    for path in [spec_path, aliases_path]:
+        with open(path, "rb") as handle:
+            hash.update(handle.read())
+    return hash.hexdigest()
+
+
+def get_index_stats(index_path: Path) -> dict[str, Any]:
+    """Returns the state of the index file and of the index loaded by this process.
+
+    Args:
+        index_path (Path): The path of the index file.
+
+    Returns:
+        dict[str, Any]: Returns a dictionary describing the index cache.
+    """
+
+    stats: dict[str, Any] = {
+        "path": str(index_path),
+        "exists": index_path.exists(),
+        "swagger_hash": get_swagger_hash(),
+    }
+    index = _read_index_file(index_path)
+    if index is not None:
+        stats.update(
+            size=index_path.stat().st_size,
+            index_hash=index.get("swagger_hash"),
+            up_to_date=index.get("version") == INDEX_VERSION and index.get("swagger_hash") == stats["swagger_hash"],
+            created_at=time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(index.get("created_at", 0))),
+            endpoints=len(index.get("definitions", {})),
+            search_terms=len(index.get("search", {}).get("terms", {})),
+        )
+    if _load_stats:
+        stats.update(
+            loaded_from=_load_stats["source"],
+            load_time_ms=round(_load_stats["load_time"] * 1000, 1),
+        )
+    return stats
+
+
+def _get_source_stamp() -> list[int]:
+    # sizes and modification times of the source files (cheaper to check than the hash)
+    stamp = []
+    for path in [spec_path, aliases_path]:
+        stat = path.stat()
+        stamp += [stat.st_size, stat.st_mtime_ns]
+    return stamp
+
+
+def _read_index_file(index_path: Path) -> dict[str, Any] | None:
+    try:
+        with open(index_path, "r") as handle:
+            index = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    return index if isinstance(index, dict) else None
+
+
+def _load_index(index_path: Path) -> dict[str, Any] | None:
+    # returns None if the index is missing, corrupted, or outdated
+    index = _read_index_file(index_path)
+    if index is None or index.get("version") != INDEX_VERSION:
+        return None
+
+    # the source files were not modified, so they do not need to be hashed
+    if index.get("source_stamp") == _get_source_stamp():
+        return index
+
+    # the files were touched (e.g., the library was reinstalled), but the index is still valid if the content is same
+    if index.get("swagger_hash") != get_swagger_hash():
+        return None
+    index["source_stamp"] = _get_source_stamp()
+    _store_json(index, index_path)
+    return index
+
+
+def _store_json(data: dict[str, Any], path: Path):
+    # the index is only a cache, the command does not fail if it cannot be stored
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, "w") as handle:
+            json.dump(data, handle, separators=(",", ":"))
+        # the replacement is atomic, so concurrent processes never read a partially written file
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
@@ -0,0 +1,186 @@
+import re
+import bisect
+from typing import Any
+from recodex.client_components.endpoint_resolver import EndpointResolver
+
+# the weights of the terms by the part of the endpoint they come from
+NAME_WEIGHT = 8.0
+PARAM_WEIGHT = 3.0
+DESCRIPTION_WEIGHT = 1.0
+
+# a term found only as a prefix of an indexed term (or as its subsequence) is worth less than an exact match
+PREFIX_FACTOR = 0.5
+FUZZY_FACTOR = 0.25
+
+# the length of the summaries stored in the index (printed next to the endpoint names)
+SUMMARY_LENGTH = 100
+
+_STOP_WORDS = {
+    "a", "an", "and", "are", "as", "be", "by", "for", "from", "if", "in", "is", "it", "of", "on", "or", "the",
+    "this", "to", "with",
+}
+
+_word_pattern = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+
+class SearchMatch:
+    """An endpoint found by the search.
+    """
+
+    def __init__(self, endpoint: str, summary: str, score: float):
+        self.endpoint = endpoint
+        self.summary = summary
+        self.score = score
+
+
+class EndpointSearch:
+    """Ranked full-text search of the endpoints backed by the inverted index created by `build_search_index`.
+    """
+
+    def __init__(self, index: dict[str, Any]):
+        """
+        Args:
+            index (dict[str, Any]): The index created by the `build_search_index` function.
+        """
+
+        self.endpoints: list[list[str]] = index["endpoints"]
+        self.postings: dict[str, list[list]] = index["terms"]
+        # the sorted vocabulary allows finding all terms with a given prefix by a binary search
+        self.terms = sorted(self.postings)
+
+    def search(self, query: str, limit: int | None = None) -> list[SearchMatch]:
+        """Finds the endpoints matching all terms of the query.
+
+        The terms are matched against the presenter and action names, the parameter names, and the descriptions
+        of the endpoints. A term matches an indexed term exactly, as its prefix, or (if nothing else matches)
+        as its subsequence (e.g., 'cfg' matches 'config').
+
+        Args:
+            query (str): The searched text.
+            limit (int | None, optional): The maximal number of returned endpoints. Defaults to None (no limit).
+
+        Returns:
+            list[SearchMatch]: Returns the matching endpoints, the best matches first.
+        """
+
+        query_terms = tokenize(query)
+        if len(query_terms) == 0:
+            return []
+
+        unique_terms = list(dict.fromkeys(query_terms))
+        scores = self._score_term(unique_terms[0])
+        for query_term in unique_terms[1:]:
+            # all terms of the query need to match
+            term_scores = self._score_term(query_term)
+            scores = {endpoint: score + term_scores[endpoint]
+                      for endpoint, score in scores.items() if endpoint in term_scores}
+
+        # the endpoints whose names start with the query (e.g., 'groups.def') are preferred, the ties are broken
+        # in favor of the shorter (more general) names
+        name_prefix = query.strip().lower()
+        for endpoint in scores:
+            if self.endpoints[endpoint][0].startswith(name_prefix):
+                scores[endpoint] += NAME_WEIGHT * len(unique_terms)
+
+        ranked = sorted(scores.items(), key=lambda item: (
+            -item[1], len(self.endpoints[item[0]][0]), self.endpoints[item[0]][0]
+        ))
+        return [
+            SearchMatch(self.endpoints[endpoint][0], self.endpoints[endpoint][1], score)
+            for endpoint, score in ranked[:limit]
+        ]
+
+    def _score_term(self, query_term: str) -> dict[int, float]:
+        # the best weight of the term for every endpoint it matches
+        scores: dict[int, float] = {}
+        matched = False
+        for term, factor in self._get_prefix_matches(query_term):
+            matched = True
+            self._add_postings(scores, term, factor)
+        if not matched:
+            for term in self._get_fuzzy_matches(query_term):
+                self._add_postings(scores, term, FUZZY_FACTOR)
+        return scores
+
+    def _get_prefix_matches(self, query_term: str):
+        position = bisect.bisect_left(self.terms, query_term)
+        while position < len(self.terms) and self.terms[position].startswith(query_term):
+            term = self.terms[position]
+            yield term, 1.0 if term == query_term else PREFIX_FACTOR
+            position += 1
+
+    def _get_fuzzy_matches(self, query_term: str):
+        pattern = re.compile(".*?".join(re.escape(char) for char in query_term))
+        return [term for term in self.terms if term[0] == query_term[0] and pattern.match(term)]
+
+    def _add_postings(self, scores: dict[int, float], term: str, factor: float):
+        for endpoint, weight in self.postings[term]:
+            scores[endpoint] = max(scores.get(endpoint, 0.0), weight * factor)
+
+
+def build_search_index(resolver: EndpointResolver) -> dict[str, Any]:
+    """Creates the inverted index of the endpoints (stored in the endpoint index next to the definitions).
+
+    Args:
+        resolver (EndpointResolver): The resolver holding the endpoint definitions.
+
+    Returns:
+        dict[str, Any]: Returns the index (a JSON-serializable dictionary).
+    """
+
+    endpoints: list[list[str]] = []
+    terms: dict[str, dict[int, float]] = {}
+
+    def add_terms(text: str, endpoint: int, weight: float):
+        for term in tokenize(text):
+            postings = terms.setdefault(term, {})
+            postings[endpoint] = max(postings.get(endpoint, 0.0), weight)
+
+    for presenter in resolver.get_presenters():
+        for action in resolver.get_actions(presenter):
+            endpoint = len(endpoints)
+            description = resolver.get_endpoint_description(presenter, action) or ""
+            endpoints.append([f"{presenter}.{action}", _get_summary(description)])
+
+            add_terms(f"{presenter} {action}", endpoint, NAME_WEIGHT)
+            for param in resolver.get_endpoint_definition(presenter, action).get("parameters", []):
+                add_terms(param["name"], endpoint, PARAM_WEIGHT)
+            add_terms(description, endpoint, DESCRIPTION_WEIGHT)
+
+    return {
+        "endpoints": endpoints,
+        "terms": {term: [[endpoint, weight] for endpoint, weight in postings.items()]
+                  for term, postings in terms.items()},
+    }
+
+
+def tokenize(text: str) -> list[str]:
+    """Splits a text into the normalized search terms.
+    The words are split on non-alphanumeric characters and in camel case, lowercased, stripped of the plural 's'
+    (so that 'group' matches 'groups'), and the most common English words are skipped.
+
+    Args:
+        text (str): The text (a name, a description, or a query).
+
+    Returns:
+        list[str]: Returns the terms in order of occurrence.
+    """
+
+    terms = []
+    for word in _word_pattern.findall(text):
+        term = word.lower()
+        if term in _STOP_WORDS:
+            continue
+        if len(term) > 3 and term.endswith("s") and not term.endswith("ss"):
+            term = term[:-1]
+        terms.append(term)
+    return terms
+
+
+def _get_summary(description: str) -> str:
+    # the first sentence of the description
+    summary = " ".join(description.split())
+    summary = summary.partition(". ")[0].rstrip(".")
+    if len(summary) > SUMMARY_LENGTH:
+        summary = summary[:SUMMARY_LENGTH - 3].rstrip() + "..."
+    return summary
@@ -0,0 +1,261 @@
+import os
+import json
+import time
+import typer
+import hashlib
+from typing import Any
+from collections.abc import Iterator
+
+from . import cmd_utils
+from .shared_client import SharedClient
+from .download_helper import download, disambiguate_names
+from .upload_helper import get_server_digest
+from .worker_pool import run_bounded
+
+# the file in the root of the exported directory describing what was exported
+MANIFEST_NAME = "manifest.json"
+# the manifests of other versions are ignored (everything is exported again)
+MANIFEST_VERSION = 1
+
+
+class GroupExport:
+    """Mirrors a group (its assignments, solutions, evaluations, and files) into a local directory.
+
+    The manifest in the directory records the exported entities with the digests of their content
+    (and their update timestamps) and the files with their digests. A repeated export fetches the details
+    only of the entities that changed since the last export and downloads only the files whose digest differs.
+    The entities that were removed from the server are dropped from the manifest, their local copies are kept.
+    """
+
+    def __init__(self, client: SharedClient, out_dir: str, jobs: int = 4):
+        self.client = client
+        self.out_dir = out_dir
+        self.jobs = jobs
+        self.old = _load_manifest(os.path.join(out_dir, MANIFEST_NAME))
+        self.entities: dict[str, dict] = {}
+        self.files: dict[str, dict] = {}
+        self.counts = {"exported": 0, "unchanged": 0, "downloaded": 0, "skipped": 0, "failed": 0}
+
+    def run(self, group_id: str):
+        """Exports the group and writes the manifest.
+
+        Args:
+            group_id (str): The ID of the group.
+
+        Raises:
+            Exception: Thrown when the group could not be fetched or the manifest could not be written.
+        """
+
+        group = self._fetch("groups", "detail", group_id)
+        self._store_entity("group", group_id, None, group, "group.json")
+        assignments = self._fetch("groups", "assignments", group_id) or []
+
+        # the workers only fetch the data, the manifest is updated by this thread
+        solutions = []
+        for assignment, (assignment_solutions, attachments) in self._run_all(self._fetch_assignment, assignments):
+            id = assignment["id"]
+            self._store_entity("assignment", id, group_id, assignment, self._get_path(assignment))
+            self._add_files(id, attachments, os.path.join("assignments", id, "attachments"))
+            solutions += [(solution, id) for solution in assignment_solutions]
+
+        for (solution, assignment_id), files in self._run_all(self._fetch_solution, solutions):
+            path = self._get_path(solution, assignment_id)
+            self._add_files(solution["id"], files, os.path.join(os.path.dirname(path), "files"))
+            self._store_entity("solution", solution["id"], assignment_id, solution, path)
+
+        for (id, record), result in self._run_all(self._sync_file, list(self.files.items())):
+            status, transferred = result
+            self.counts[status] += 1
+            if status == "downloaded":
+                self._print({"type": "file", "id": id, "path": record["path"], "status": status, "bytes": transferred})
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "group": group_id,
+            "exportedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "entities": self.entities,
+            "files": self.files,
+        }
+        _write_json(os.path.join(self.out_dir, MANIFEST_NAME), manifest)
+
+    def _run_all(self, worker, items: list) -> Iterator[tuple[Any, Any]]:
+        # the items are processed concurrently, a failed item does not stop the others
+        for item, result, error in run_bounded(worker, items, self.jobs):
+            if error is None:
+                yield item, result
+                continue
+
+            self.counts["failed"] += 1
+            if isinstance(item, dict):
+                kind, id = "assignment", item["id"]
+            elif isinstance(item[0], dict):
+                kind, id = "solution", item[0]["id"]
+            else:
+                kind, id = "file", item[0]
+            self._keep_failed(id)
+            self._print({"type": kind, "id": id, "error": cmd_utils.get_api_error_message(error)})
+
+    def _fetch_assignment(self, assignment: dict) -> tuple[list, list | None]:
+        # returns the solutions and the attachments (None if the assignment did not change),
+        # the solutions are always listed, as they change independently of the assignment
+        solutions = self._fetch("assignments", "solutions", assignment["id"]) or []
+        attachments = None
+        if self._is_changed(assignment, self._get_path(assignment)) and assignment.get("exerciseId"):
+            attachments = self._fetch("exercise_files", "get_attachment_files", assignment["exerciseId"]) or []
+        return solutions, attachments
+
+    def _fetch_solution(self, item: tuple[dict, str]) -> list | None:
+        # returns the files of the solution (None if the solution did not change)
+        solution, assignment_id = item
+        path = self._get_path(solution, assignment_id)
+        if not self._is_changed(solution, path):
+            return None
+
+        submissions = self._fetch("assignment_solutions", "submissions", solution["id"])
+        files = self._fetch("assignment_solutions", "files", solution["id"]) or []
+        _write_json(os.path.join(self.out_dir, os.path.dirname(path), "submissions.json"), submissions)
+        return files
+
+    def _sync_file(self, item: tuple[str, dict]) -> tuple[str, int]:
+        # returns the status of the file and the number of downloaded bytes
+        id, record = item
+        old = self.old["files"].get(id, {})
+        path = os.path.join(self.out_dir, record["path"])
+        intact = old.get("path") == record["path"] and os.path.isfile(path) and os.path.getsize(path) == old.get("size")
+
+        # the files of unchanged entities are not checked as long as their local copies are intact
+        if "digest" in record and intact:
+            return "skipped", 0
+        record["digest"] = get_server_digest(self.client, id)
+        if record["digest"] == old.get("digest") and intact:
+            record["size"] = old["size"]
+            return "skipped", 0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        transferred = download(self.client, id, path, live_progress=False, expected_digest=record["digest"])
+        record["size"] = os.path.getsize(path)
+        return "downloaded", transferred
+
+    def _add_files(self, owner: str, files: list | None, directory: str):
+        # the files of changed entities are compared with the server, the others are kept from the last export
+        if files is None:
+            self._keep_files(owner)
+            return
+        # the name must not point outside of the directory of the entity (and the files need distinct names)
+        names = {file["id"]: os.path.basename(file.get("name") or "") or file["id"] for file in files}
+        for id, name in disambiguate_names(names).items():
+            self.files[id] = {"owner": owner, "path": os.path.join(directory, name)}
+
+    def _keep_files(self, owner: str):
+        for id, record in self.old["files"].items():
+            if record.get("owner") == owner:
+                self.files[id] = dict(record)
+
+    def _keep_failed(self, id: str):
+        # the last export of a failed entity (or file) is kept, but the entity is fetched again by the next export
+        if id in self.old["files"]:
+            self.files[id] = dict(self.old["files"][id])
+            return
+        for entity_id, record in self.old["entities"].items():
+            if entity_id == id or record.get("parent") == id:
+                self.entities[entity_id] = {**record, "digest": None}
+                self._keep_files(entity_id)
+
+    def _is_changed(self, entity: dict, path: str) -> bool:
+        old = self.old["entities"].get(entity["id"])
+        if old is None or old.get("digest") != _get_digest(entity):
+            return True
+        # a local copy deleted since the last export is exported again
+        return not os.path.isfile(os.path.join(self.out_dir, path))
+
+    def _store_entity(self, kind: str, id: str, parent: str | None, entity: dict, path: str):
+        if self._is_changed(entity, path):
+            _write_json(os.path.join(self.out_dir, path), entity)
+            self.counts["exported"] += 1
+            self._print({"type": kind, "id": id, "path": path, "status": "exported"})
+        else:
+            self.counts["unchanged"] += 1
+        self.entities[id] = {
+            "type": kind,
+            "parent": parent,
+            "path": path,
+            "updatedAt": entity.get("updatedAt"),
+            "digest": _get_digest(entity),
+        }
+
+    def _get_path(self, entity: dict, assignment_id: str | None = None) -> str:
+        # the path of the JSON file of an assignment, or of a solution (if the assignment is given)
+        if assignment_id is None:
+            return os.path.join("assignments", entity["id"], "assignment.json")
+        return os.path.join("assignments", assignment_id, "solutions", entity["id"], "solution.json")
+
+    def _fetch(self, presenter: str, action: str, id: str) -> Any:
+        response = self.client.send_request(presenter, action, path_params={"id": id})
+        response.check_success()
+        return response.get_payload()
+
+    def _print(self, record: dict):
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+
+
+def export_group(client: SharedClient, group_id: str, out_dir: str, jobs: int = 4, verbose: bool = False):
+    """Mirrors a group into a local directory (see `GroupExport`), the changes are printed as NDJSON.
+
+    Args:
+        client (SharedClient): The client shared by all workers.
+        group_id (str): The ID of the group.
+        out_dir (str): The output directory (created if it does not exist).
+        jobs (int, optional): The maximal number of concurrent requests. Defaults to 4.
+        verbose (bool, optional): Whether the summary is printed to stderr. Defaults to False.
+
+    Raises:
+        Exception: Thrown when the group could not be exported or if any of the entities or files failed.
+    """
+
+    try:
+        os.makedirs(out_dir, exist_ok=True)
+    except OSError as e:
+        raise Exception(f"Could not create the output directory: {e}")
+
+    export = GroupExport(client, out_dir, jobs)
+    export.run(group_id)
+
+    counts = export.counts
+    if verbose:
+        typer.echo(
+            f"{counts['exported']} entities exported ({counts['unchanged']} unchanged), "
+            f"{counts['downloaded']} files downloaded ({counts['skipped']} unchanged), {counts['failed']} failed.",
+            err=True,
+        )
+    if counts["failed"] > 0:
+        raise Exception(f"{counts['failed']} entities or files could not be exported.")
+
+
+def _load_manifest(path: str) -> dict:
+    # a missing, corrupted, or outdated manifest just makes everything to be exported again
+    empty = {"entities": {}, "files": {}}
+    try:
+        with open(path, "r") as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError):
+        return empty
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return empty
+    return manifest
+
+
+def _get_digest(entity: Any) -> str:
+    # the digest of the content (the timestamps do not reflect all changes, e.g., new evaluations)
+    return hashlib.sha1(json.dumps(entity, sort_keys=True).encode()).hexdigest()
+
+
+def _write_json(path: str, data: Any):
+    # the file is replaced at once, so that an interrupted export never leaves a truncated file
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "w") as handle:
+            json.dump(data, handle, indent=2, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except OSError as e:
+        raise Exception(f"Could not write the file {path}: {e}")
@@ -0,0 +1,98 @@
+import sys
+import time
+import threading
+
+# the minimal time between two redraws of the progress line (in seconds)
+REFRESH_INTERVAL = 0.1
+
+
+class TransferProgress:
+    """Progress and throughput of a file transfer printed to stderr.
+
+    The progress line is redrawn only if stderr is a terminal, the final summary is printed in verbose mode.
+    The object can be updated by multiple threads at once.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        total: int | None = None,
+        initial: int = 0,
+        verbose: bool = False,
+        live: bool = True,
+    ):
+        """
+        Args:
+            label (str): The name of the transfer (e.g., 'Downloaded').
+            total (int | None, optional): The total number of bytes, if known. Defaults to None.
+            initial (int, optional): The number of bytes transferred before (e.g., by an interrupted transfer).
+                These are not included in the throughput. Defaults to 0.
+            verbose (bool, optional): Whether the summary is printed when the transfer is finished.
+                Defaults to False.
+            live (bool, optional): Whether the progress line is drawn (if stderr is a terminal). Defaults to True.
+        """
+
+        self.label = label
+        self.total = total
+        self.initial = initial
+        self.transferred = 0
+        self.verbose = verbose
+        self.started = time.monotonic()
+
+        self._live = live and sys.stderr.isatty()
+        self._lock = threading.Lock()
+        self._last_drawn = 0.0
+
+    def update(self, count: int):
+        """Adds the given number of transferred bytes.
+        """
+
+        with self._lock:
+            self.transferred += count
+            now = time.monotonic()
+            if self._live and now - self._last_drawn >= REFRESH_INTERVAL:
+                self._last_drawn = now
+                self._draw(f"\r{self.format_status()}\033[K")
+
+    def finish(self):
+        """Clears the progress line and prints the summary (in verbose mode).
+        """
+
+        with self._lock:
+            if self._live:
+                self._draw("\r\033[K")
+            if self.verbose:
+                self._draw(f"{self.format_status()}\n")
+
+    def get_elapsed(self) -> float:
+        """Returns the number of seconds since the transfer started.
+        """
+
+        return max(time.monotonic() - self.started, 1e-6)
+
+    def format_status(self) -> str:
+        """Returns the transferred size and the throughput as a human readable text.
+        """
+
+        done = self.initial + self.transferred
+        status = f"{self.label} {format_size(done)}"
+        if self.total is not None:
+            percent = done * 100 / self.total if self.total > 0 else 100
+            status += f" of {format_size(self.total)} ({percent:.0f} %)"
+        elapsed = self.get_elapsed()
+        return status + f" in {elapsed:.2f} s ({format_size(self.transferred / elapsed)}/s)"
+
+    def _draw(self, text: str):
+        sys.stderr.write(text)
+        sys.stderr.flush()
+
+
+def format_size(size: float) -> str:
+    """Formats a number of bytes as a human readable text (e.g., '1.5 MiB').
+    """
+
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if size < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
@@ -0,0 +1,275 @@
+import os
+import re
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+
+# the number of times a failed idempotent request is repeated
+DEFAULT_RETRIES = 3
+# the delay before the first retry (in seconds), it doubles with every attempt (the actual delay is jittered)
+BACKOFF_BASE = 0.5
+# the maximal delay between two attempts (in seconds), longer Retry-After values are shortened
+BACKOFF_MAX = 30.0
+
+# the number of consecutive failures after which no requests are sent for a while
+CIRCUIT_THRESHOLD = 5
+# the number of seconds for which the requests fail immediately once the circuit is open
+CIRCUIT_COOLDOWN = 30.0
+
+# the defaults can be overridden by environment variables (or the options of the root command)
+RETRIES_ENV = "RECODEX_RETRIES"
+RATE_ENV = "RECODEX_RATE"
+
+# only the requests without side effects are repeated when the server fails
+IDEMPOTENT_METHODS = ["GET", "HEAD", "OPTIONS"]
+# the statuses of transient failures (the 5xx statuses also count as failures of the server)
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+_RATE_PATTERN = re.compile(r"^\s*(?P<count>\d+(\.\d+)?)\s*/\s*(?P<unit>s|sec|m|min)\s*$")
+
+
+class CircuitOpenError(Exception):
+    """Thrown instead of sending a request while the server is considered unavailable.
+    """
+
+
+class TokenBucket:
+    """Rate limiter which allows short bursts, but not more than `rate` requests per second on average.
+    The waiting requests are served in order of arrival (each one reserves the next free slot).
+    """
+
+    def __init__(self, rate: float, burst: float | None = None):
+        """
+        Args:
+            rate (float): The number of requests per second.
+            burst (float | None, optional): The maximal number of requests sent at once after a pause.
+                Defaults to None (one second worth of requests, at least one).
+        """
+
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token and returns how long the caller needs to wait before it sends the request (in seconds).
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(-self._tokens / self.rate, 0.0)
+
+
+class CircuitBreaker:
+    """Stops sending requests once the server failed too many times in a row.
+
+    After the cooldown, a single trial request is let through, the circuit is closed again if it succeeds.
+    """
+
+    def __init__(self, threshold: int = CIRCUIT_THRESHOLD, cooldown: float = CIRCUIT_COOLDOWN):
+        """
+        Args:
+            threshold (int, optional): The number of consecutive failures that open the circuit.
+                Defaults to CIRCUIT_THRESHOLD.
+            cooldown (float, optional): The number of seconds the circuit stays open. Defaults to CIRCUIT_COOLDOWN.
+        """
+
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened: float | None = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def check(self):
+        """Checks whether a request can be sent.
+
+        Raises:
+            CircuitOpenError: Thrown when the circuit is open.
+        """
+
+        with self._lock:
+            if self._opened is None:
+                return
+            remaining = self._opened + self.cooldown - time.monotonic()
+            if remaining <= 0 and not self._trial_running:
+                self._trial_running = True
+                return
+            raise CircuitOpenError(
+                f"The server failed {self._failures} times in a row, no requests are sent "
+                f"for the next {max(remaining, 0):.0f} s."
+            )
+
+    def release(self):
+        """Ends the trial request without a result (e.g., the server only asked to slow down),
+        so that the next request after the cooldown is let through as another trial.
+        """
+
+        with self._lock:
+            self._trial_running = False
+
+    def record(self, success: bool):
+        """Records the result of a request.
+        """
+
+        with self._lock:
+            self._trial_running = False
+            if success:
+                self._failures, self._opened = 0, None
+                return
+            self._failures += 1
+            if self._failures >= self.threshold:
+                self._opened = time.monotonic()
+
+
+class RequestPolicy:
+    """The rules shared by all requests of the process: the rate limit, the retries of idempotent requests
+    with a jittered exponential backoff, and the circuit breaker.
+    """
+
+    def __init__(self, retries: int = DEFAULT_RETRIES, rate: float | None = None):
+        """
+        Args:
+            retries (int, optional): The number of times a failed idempotent request is repeated.
+                Defaults to DEFAULT_RETRIES.
+            rate (float | None, optional): The maximal number of requests per second. Defaults to None (no limit).
+        """
+
+        self.retries = retries
+        self.limiter = TokenBucket(rate) if rate is not None else None
+        self.breaker = CircuitBreaker()
+        self.retried = 0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Checks that a request can be sent and returns how long the caller needs to wait (in seconds).
+
+        Raises:
+            CircuitOpenError: Thrown when the server is considered unavailable.
+        """
+
+        self.breaker.check()
+        return self.limiter.reserve() if self.limiter is not None else 0.0
+
+    def get_retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        status: int | None = None,
+        retry_after: str | None = None,
+        sent: bool = True,
+    ) -> float | None:
+        """Records the failure of a request and decides whether it should be repeated.
+
+        Args:
+            method (str): The HTTP method of the request.
+            attempt (int): The number of previous attempts (0 for the first one).
+            status (int | None, optional): The HTTP status, or None if the request failed without a response.
+                Defaults to None.
+            retry_after (str | None, optional): The Retry-After header of the response. Defaults to None.
+            sent (bool, optional): Whether the request might have reached the server (the requests that failed
+                to connect are repeated regardless of the method). Defaults to True.
+
+        Returns:
+            float | None: Returns the delay before the next attempt (in seconds), or None if the request
+            should not be repeated.
+        """
+
+        if status is None or status >= 500:
+            self.breaker.record(False)
+        else:
+            self.breaker.release()
+        if attempt >= self.retries or (sent and method.upper() not in IDEMPOTENT_METHODS):
+            return None
+
+        with self._lock:
+            self.retried += 1
+        delay = _parse_retry_after(retry_after)
+        if delay is None:
+            # full jitter, so that the clients failed at the same time do not retry at the same time
+            delay = random.uniform(0, BACKOFF_BASE * 2 ** attempt)
+        return min(delay, BACKOFF_MAX)
+
+    def record_success(self):
+        """Records that the server responded (even with a client error status).
+        """
+
+        self.breaker.record(True)
+
+
+_policy: RequestPolicy | None = None
+_policy_lock = threading.Lock()
+
+
+def configure(retries: int | None = None, rate: str | None = None):
+    """Replaces the policy shared by all requests of the process.
+    The values that are not set are taken from the environment variables (or the defaults).
+
+    Args:
+        retries (int | None, optional): The number of times a failed idempotent request is repeated.
+        rate (str | None, optional): The maximal request rate in the N/s or N/min format.
+
+    Raises:
+        Exception: Thrown when a value is not valid.
+    """
+
+    global _policy
+    policy = RequestPolicy(
+        retries if retries is not None else _get_env_retries(),
+        parse_rate(rate if rate is not None else os.environ.get(RATE_ENV)),
+    )
+    with _policy_lock:
+        _policy = policy
+
+
+def get_policy() -> RequestPolicy:
+    """Returns the policy shared by all requests of the process.
+    """
+
+    global _policy
+    with _policy_lock:
+        if _policy is None:
+            _policy = RequestPolicy(_get_env_retries(), parse_rate(os.environ.get(RATE_ENV)))
+        return _policy
+
+
+def parse_rate(rate: str | None) -> float | None:
+    """Parses a request rate (e.g., '10/s' or '100/min').
+
+    Returns:
+        float | None: Returns the number of requests per second, or None if no rate was given.
+    """
+
+    if rate is None or rate.strip() == "":
+        return None
+    match = _RATE_PATTERN.match(rate)
+    if match is None or float(match.group("count")) <= 0:
+        raise Exception(f"The rate '{rate}' needs to be a positive number of requests in the N/s or N/min format.")
+    count = float(match.group("count"))
+    return count if match.group("unit") in ["s", "sec"] else count / 60
+
+
+def _get_env_retries() -> int:
+    try:
+        return max(int(os.environ.get(RETRIES_ENV, DEFAULT_RETRIES)), 0)
+    except ValueError:
+        raise Exception(f"The {RETRIES_ENV} environment variable needs to be an integer.")
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    # the header holds either a number of seconds or a date
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
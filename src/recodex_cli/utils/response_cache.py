@@ -0,0 +1,213 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any
+
+# the maximal total size of the cached responses of one user (the least recently used entries are evicted)
+DEFAULT_MAX_SIZE = 64 * 2 ** 20  # 64 MiB
+
+# the suffix of the entry files (the first line holds the metadata, the rest is the response body)
+ENTRY_SUFFIX = ".entry"
+
+
+class CachedResponse:
+    """Stored response, which provides the same attributes as the generated REST response,
+    so that it can be wrapped by a ClientResponse.
+    """
+
+    def __init__(self, metadata: dict[str, Any], data: bytes):
+        """
+        Args:
+            metadata (dict[str, Any]): The metadata of the cache entry (status, reason, headers, etag, stored).
+            data (bytes): The response body.
+        """
+
+        self.urllib3_response = None
+        self.status: int = metadata["status"]
+        self.reason: str = metadata["reason"]
+        self.headers: dict[str, str] = metadata["headers"]
+        self.etag: str | None = metadata.get("etag")
+        self.stored: float = metadata["stored"]
+        self.data = data
+
+    def getheaders(self) -> dict[str, str]:
+        return self.headers
+
+    def get_age(self) -> float:
+        """Returns the number of seconds since the response was received (or revalidated).
+        """
+
+        return time.time() - self.stored
+
+
+class ResponseCache:
+    """On-disk cache of the responses of GET endpoints.
+
+    Every entry is stored in a separate file, which is replaced atomically, so the cache can be shared
+    by concurrent threads and processes. The modification time of the files is updated whenever an entry
+    is used, the least recently used entries are evicted once the total size exceeds the limit.
+    """
+
+    def __init__(self, directory: Path, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Args:
+            directory (Path): The directory of the entries (it should be specific for the API URL and the user,
+                see `get_scope`).
+            max_size (int, optional): The maximal total size of the entries in bytes. Defaults to DEFAULT_MAX_SIZE.
+        """
+
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(presenter: str, action: str, path_params: dict, query_params: dict) -> str:
+        """Returns the key of the entry of a request.
+        """
+
+        request = [presenter, action, path_params, query_params]
+        return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Returns the stored response (regardless of its age) and marks it as recently used.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            CachedResponse | None: Returns the response, or None if it is not cached (or the entry is corrupted).
+        """
+
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as handle:
+                metadata = json.loads(handle.readline())
+                data = handle.read()
+            os.utime(path)
+            return CachedResponse(metadata, data)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, key: str, status: int, reason: str, headers: dict[str, str], data: bytes):
+        """Stores a response and evicts the least recently used entries if the cache is too large.
+        The cache is not required for the command to succeed, so failed writes are ignored.
+
+        Args:
+            key (str): The key of the entry.
+            status (int): The HTTP status of the response.
+            reason (str): The HTTP reason phrase of the response.
+            headers (dict[str, str]): The response headers (the ETag header is used for revalidation).
+            data (bytes): The response body.
+        """
+
+        headers = {name: str(value) for name, value in headers.items()}
+        etag = next((value for name, value in headers.items() if name.lower() == "etag"), None)
+        metadata = {"status": status, "reason": reason, "headers": headers, "etag": etag, "stored": time.time()}
+        if len(data) > self.max_size:
+            return
+
+        path = self._get_path(key)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "wb") as handle:
+                handle.write(json.dumps(metadata).encode() + b"\n")
+                handle.write(data)
+            # the replacement is atomic, so concurrent readers never see a partially written entry
+            os.replace(temp_path, path)
+        except OSError:
+            return
+        self._evict()
+
+    def record(self, outcome: str):
+        """Counts the outcome of a lookup ('hits', 'revalidated', or 'misses') for the verbose summary.
+        """
+
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def refresh(self, key: str, response: CachedResponse):
+        """Marks a stored response as fresh again (the server confirmed it did not change).
+        """
+
+        self.put(key, response.status, response.reason, response.headers, response.data)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Returns the number of entries and their total size.
+        """
+
+        entries = self._list_entries()
+        modified = [entry[1] for entry in entries]
+        return {
+            "directory": self.directory,
+            "entries": len(entries),
+            "size": sum(entry[2] for entry in entries),
+            "max_size": self.max_size,
+            "least_recently_used": time.ctime(min(modified)) if modified else None,
+            "most_recently_used": time.ctime(max(modified)) if modified else None,
+        }
+
+    def clear(self) -> int:
+        """Removes all entries.
+
+        Returns:
+            int: Returns the number of removed entries.
+        """
+
+        removed = 0
+        for path, _, _ in self._list_entries():
+            removed += _remove(path)
+        return removed
+
+    def _get_path(self, key: str) -> Path:
+        return self.directory / f"{key}{ENTRY_SUFFIX}"
+
+    def _list_entries(self) -> list[tuple[Path, float, int]]:
+        # returns the paths, modification times and sizes of all entries
+        entries = []
+        try:
+            with os.scandir(self.directory) as iterator:
+                for item in iterator:
+                    if not item.name.endswith(ENTRY_SUFFIX):
+                        continue
+                    try:
+                        stat = item.stat()
+                    except OSError:
+                        # removed by a concurrent process
+                        continue
+                    entries.append((Path(item.path), stat.st_mtime, stat.st_size))
+        except OSError:
+            pass
+        return entries
+
+    def _evict(self):
+        with self._lock:
+            entries = self._list_entries()
+            size = sum(entry[2] for entry in entries)
+            for path, _, entry_size in sorted(entries, key=lambda entry: entry[1]):
+                if size <= self.max_size:
+                    break
+                _remove(path)
+                size -= entry_size
+
+
+def get_scope(api_url: str, user_id: str) -> str:
+    """Returns the name of the cache directory of a user, so that the sessions of different users
+    (or servers) never share the cached responses.
+    """
+
+    return hashlib.sha256(f"{api_url.rstrip('/')}\n{user_id}".encode()).hexdigest()[:16]
+
+
+def _remove(path: Path) -> int:
+    try:
+        os.remove(path)
+        return 1
+    except OSError:
+        return 0
@@ -0,0 +1,291 @@
+import re
+import copy
+import json
+import threading
+import urllib3
+from urllib.parse import quote, urlencode
+from recodex.client import Client
+from recodex.generated.swagger_client import ApiClient, DefaultApi
+from recodex.generated.swagger_client.configuration import Configuration
+from recodex.generated.swagger_client.rest import ApiException
+from recodex.client_components.swagger_validator import SwaggerValidator
+from recodex.client_components.client_response import ClientResponse
+
+from . import timings
+from .endpoint_index import IndexedEndpointResolver
+from .response_cache import ResponseCache
+
+
+class PreparedRequest(Exception):
+    """Request prepared by the generated client, which is not sent (see `SharedClient.prepare_request`).
+    It is an exception, so that it can interrupt the generated code before the request is sent.
+    """
+
+    def __init__(self, method: str, url: str, headers: dict[str, str], body: bytes):
+        """
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL including the QUERY parameters.
+            headers (dict[str, str]): The request headers.
+            body (bytes): The encoded body.
+        """
+
+        super().__init__(f"{method} {url}")
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.body = body
+
+
+class ThreadSafeApiClient(ApiClient):
+    """Generated API client that remembers the last response of each thread separately.
+
+    The Client reads the response of a request from the `last_response` attribute of the generated client,
+    which would be overwritten by other threads if the client was shared by multiple workers.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._thread_local = threading.local()
+        super().__init__(*args, **kwargs)
+
+    @property
+    def last_response(self):
+        return self._thread_local.last_response
+
+    @last_response.setter
+    def last_response(self, value):
+        self._thread_local.last_response = value
+
+    @property
+    def extra_headers(self) -> dict:
+        """Headers added to the requests sent by the current thread (e.g., for a conditional request).
+        """
+
+        return getattr(self._thread_local, "extra_headers", {})
+
+    @extra_headers.setter
+    def extra_headers(self, value: dict):
+        self._thread_local.extra_headers = value
+
+    @property
+    def prepare_only(self) -> bool:
+        """Whether the requests of the current thread are only prepared (they raise a PreparedRequest).
+        """
+
+        return getattr(self._thread_local, "prepare_only", False)
+
+    @prepare_only.setter
+    def prepare_only(self, value: bool):
+        self._thread_local.prepare_only = value
+
+    def request(self, method, url, query_params=None, headers=None, post_params=None, body=None, *args, **kwargs):
+        headers = {**(headers or {}), **self.extra_headers}
+        if self.prepare_only:
+            raise _encode_request(method, url, query_params, headers, post_params, body)
+        with timings.span("http", method=method, url=url):
+            return super().request(method, url, query_params, headers, post_params, body, *args, **kwargs)
+
+
+class SharedClient(Client):
+    """Client that uses an existing endpoint resolver and connection pool (both are shared by the whole process).
+    It can also be used by multiple threads at once.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        api_url: str,
+        endpoint_resolver: IndexedEndpointResolver,
+        pool_manager: urllib3.PoolManager
+    ):
+        """
+        Args:
+            token (str): The JWT token used for authentication.
+            api_url (str): The URL of the ReCodEx server.
+            endpoint_resolver (IndexedEndpointResolver): The endpoint resolver used for validation and endpoint lookup.
+            pool_manager (urllib3.PoolManager): The connection pool used to send the requests.
+        """
+
+        # the base constructor is not called, since it parses the whole swagger document again
+        config = Configuration()
+        config.host = api_url
+        self._generated_client = ThreadSafeApiClient(config, "Authorization", f"Bearer {token}")
+        self._generated_client.rest_client.pool_manager = pool_manager
+        self._generated_api = DefaultApi(self._generated_client)
+
+        self.endpoint_resolver = endpoint_resolver
+        self._validator = SwaggerValidator()
+
+        # the responses of GET endpoints are cached only if requested (see `with_cache`)
+        self.response_cache: ResponseCache | None = None
+        self.cache_ttl = 0.0
+
+    def with_cache(self, response_cache: ResponseCache, ttl: float) -> "SharedClient":
+        """Returns a client that uses the cache for the requests of GET endpoints.
+        The new client shares the connections and the endpoint resolver with this one.
+
+        Args:
+            response_cache (ResponseCache): The cache of the current user.
+            ttl (float): The number of seconds for which a cached response is used without asking the server.
+                Older responses are revalidated (if the server provided an ETag) or fetched again.
+
+        Returns:
+            SharedClient: Returns the new client.
+        """
+
+        client = copy.copy(self)
+        client.response_cache = response_cache
+        client.cache_ttl = ttl
+        return client
+
+    def send_request(
+        self,
+        presenter: str,
+        action: str,
+        body={},
+        path_params={},
+        query_params={},
+        files={},
+        raw_body=False
+    ) -> ClientResponse:
+        """Sends a request to a single ReCodEx endpoint (see Client.send_request).
+        The responses of GET endpoints are cached if the client has a cache.
+        """
+
+        with timings.span("request", endpoint=f"{presenter}.{action}"):
+            return self._send_request(presenter, action, body, path_params, query_params, files, raw_body)
+
+    def _send_request(self, presenter, action, body, path_params, query_params, files, raw_body) -> ClientResponse:
+        cache = self.response_cache
+        with timings.span("resolve_endpoint"):
+            method = self.endpoint_resolver.get_endpoint_definition(presenter, action)["method"].upper()
+        if cache is None or method != "GET" or body or files:
+            return super().send_request(presenter, action, body, path_params, query_params, files, raw_body)
+
+        key = cache.get_key(presenter, action, path_params, query_params)
+        cached = cache.get(key)
+        if cached is not None and cached.get_age() < self.cache_ttl:
+            cache.record("hits")
+            return ClientResponse(cached)  # type: ignore
+
+        # an outdated response can still be used if the server confirms that it did not change
+        if cached is not None and cached.etag is not None:
+            self._generated_client.extra_headers = {"If-None-Match": cached.etag}
+        try:
+            response = super().send_request(presenter, action, body, path_params, query_params, files, raw_body)
+        except ApiException as e:
+            if cached is None or e.status != 304:
+                raise
+            cache.record("revalidated")
+            cache.refresh(key, cached)
+            return ClientResponse(cached)  # type: ignore
+        finally:
+            self._generated_client.extra_headers = {}
+
+        cache.record("misses")
+        if response.status == 200:
+            cache.put(key, response.status, response.reason, dict(response.headers), response.get_data_binary())
+        return response
+
+    def prepare_request(
+        self,
+        presenter: str,
+        action: str,
+        body={},
+        path_params={},
+        query_params={},
+    ) -> PreparedRequest:
+        """Validates and encodes a request the same way as `send_request`, but does not send it
+        (it is sent by another transport, e.g., the asynchronous engine).
+
+        Args:
+            presenter (str): The name of the endpoint presenter.
+            action (str): The name of the endpoint action.
+            body (dict, optional): The body of the request. Defaults to {}.
+            path_params (dict, optional): A dictionary of path parameter name-value pairs. Defaults to {}.
+            query_params (dict, optional): A dictionary of query parameter name-value pairs. Defaults to {}.
+
+        Raises:
+            Exception: Thrown when the request is not valid.
+
+        Returns:
+            PreparedRequest: Returns the encoded request.
+        """
+
+        self._generated_client.prepare_only = True
+        try:
+            # the cache is bypassed, since the request is not sent here
+            Client.send_request(self, presenter, action, body, path_params, query_params)
+        except PreparedRequest as request:
+            return request
+        finally:
+            self._generated_client.prepare_only = False
+        raise Exception("The request could not be prepared.")
+
+    def send_raw_request(
+        self,
+        presenter: str,
+        action: str,
+        path_params: dict = {},
+        query_params: dict = {},
+        body: bytes | None = None,
+        headers: dict = {},
+        stream: bool = False,
+    ) -> urllib3.BaseHTTPResponse:
+        """Sends a request without the generated code, which cannot send binary bodies or stream responses.
+        The parameters are neither converted nor validated (they need to use the names from the swagger document).
+
+        Args:
+            presenter (str): The name of the endpoint presenter.
+            action (str): The name of the endpoint action.
+            path_params (dict, optional): A dictionary of path parameter name-value pairs. Defaults to {}.
+            query_params (dict, optional): A dictionary of query parameter name-value pairs. Defaults to {}.
+            body (bytes | None, optional): The raw body of the request. Defaults to None.
+            headers (dict, optional): Extra request headers. Defaults to {}.
+            stream (bool, optional): Whether the response content is read lazily (by `stream` or `read`),
+                otherwise it is read before the function returns. Defaults to False.
+
+        Raises:
+            ApiException: Thrown when the server responded with an error status.
+
+        Returns:
+            urllib3.BaseHTTPResponse: Returns the response.
+        """
+
+        method = self.endpoint_resolver.get_endpoint_definition(presenter, action)["method"].upper()
+        path = self.endpoint_resolver.get_endpoint_path(presenter, action)
+        for name, value in path_params.items():
+            path = path.replace(f"{{{name}}}", quote(str(value), safe=""))
+
+        url = self._generated_client.configuration.host + path
+        if query_params:
+            url += "?" + urlencode(query_params)
+
+        with timings.span("http", method=method, url=url):
+            response = self._generated_client.rest_client.pool_manager.request(
+                method,
+                url,
+                body=body,
+                headers={**self._generated_client.default_headers, **headers},
+                preload_content=not stream,
+            )
+        if not 200 <= response.status <= 299:
+            raise ApiException(http_resp=response)
+        return response
+
+
+def _encode_request(method: str, url: str, query_params, headers: dict, post_params, body) -> PreparedRequest:
+    # encodes the request the same way as the generated REST client (only JSON bodies are supported)
+    if post_params:
+        raise Exception("Requests with files or form data can only be sent synchronously.")
+    if query_params:
+        url += "?" + urlencode(query_params)
+
+    headers = {"Content-Type": "application/json", **headers}
+    data = b""
+    if method.upper() not in ["GET", "HEAD"]:
+        if isinstance(body, str) and not re.search("json", headers["Content-Type"], re.IGNORECASE):
+            data = body.encode()
+        else:
+            data = json.dumps(body if body is not None else {}).encode()
+    return PreparedRequest(method.upper(), url, headers, data)
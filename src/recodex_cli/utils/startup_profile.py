@@ -0,0 +1,116 @@
+import os
+import sys
+import time
+import atexit
+import importlib.abc
+
+# set this environment variable (to any non-empty value) to print the import-time breakdown
+PROFILE_ENV = "RECODEX_STARTUP_PROFILE"
+PROFILE_OPTION = "--startup-profile"
+
+# the number of the most expensive modules printed in the report
+REPORT_SIZE = 25
+
+
+class _ImportRecord:
+    def __init__(self, name: str, depth: int):
+        self.name = name
+        self.depth = depth
+        self.cumulative = 0.0
+        self.children = 0.0
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """Meta path finder that measures how long the execution of every imported module takes.
+
+    It does not locate any modules itself, it only wraps the loaders found by the other finders.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.records: list[_ImportRecord] = []
+        self._stack: list[_ImportRecord] = []
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    self._wrap_loader(spec.loader)
+                return spec
+        return None
+
+    def _wrap_loader(self, loader):
+        # built-in and frozen modules are loaded by classes shared by all modules, these are not modified
+        if isinstance(loader, type):
+            return
+        exec_module = loader.exec_module
+        if getattr(exec_module, "_profiled", False):
+            return
+
+        def profiled_exec_module(module):
+            record = _ImportRecord(module.__name__, len(self._stack))
+            self._stack.append(record)
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                record.cumulative = time.perf_counter() - start
+                self._stack.pop()
+                if self._stack:
+                    self._stack[-1].children += record.cumulative
+                self.records.append(record)
+
+        profiled_exec_module._profiled = True  # type: ignore
+        try:
+            loader.exec_module = profiled_exec_module
+        except AttributeError:
+            # some loaders (e.g., of built-in modules) cannot be modified
+            pass
+
+    def format_report(self) -> str:
+        """Returns the import-time breakdown (the most expensive modules and the total time) as text.
+        """
+
+        top_level = sum(record.cumulative for record in self.records if record.depth == 0)
+        lines = [
+            f"Startup profile: {len(self.records)} modules imported in {top_level * 1000:.1f} ms "
+            f"({(time.perf_counter() - self.started) * 1000:.1f} ms since the profiler was installed)",
+            f"{'self [ms]':>10} {'cumulative [ms]':>16}  module",
+        ]
+        records = sorted(self.records, key=lambda record: record.cumulative, reverse=True)
+        for record in records[:REPORT_SIZE]:
+            self_time = record.cumulative - record.children
+            lines.append(f"{self_time * 1000:10.1f} {record.cumulative * 1000:16.1f}  {record.name}")
+        return "\n".join(lines)
+
+
+_profiler: ImportProfiler | None = None
+
+
+def is_requested() -> bool:
+    """Returns whether the startup profile was requested by the environment variable or the command line option.
+    """
+
+    return bool(os.environ.get(PROFILE_ENV)) or PROFILE_OPTION in sys.argv[1:]
+
+
+def install_if_requested():
+    """Starts measuring the imports if requested, the report is printed to stderr when the process exits.
+    Needs to be called before the heavy modules are imported.
+    """
+
+    global _profiler
+    if _profiler is not None or not is_requested():
+        return
+
+    _profiler = ImportProfiler()
+    sys.meta_path.insert(0, _profiler)
+    atexit.register(_print_report)
+
+
+def _print_report():
+    if _profiler is not None:
+        print(_profiler.format_report(), file=sys.stderr)
@@ -0,0 +1,189 @@
+import os
+import json
+import typer
+from pathlib import Path
+from typing import Any
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+from . import upload_helper
+from . import timings
+from . import cmd_utils
+from .shared_client import SharedClient
+from .worker_pool import run_bounded
+from ..call_command import batch
+
+
+class Submission:
+    """A solution described by a line of the manifest.
+    """
+
+    def __init__(self, assignment: str, files: list[str], runtime: str, note: str):
+        self.assignment = assignment
+        self.files = files
+        self.runtime = runtime
+        self.note = note
+
+
+def submit_many(
+    client: SharedClient | None,
+    manifest_path: str,
+    journal_dir: Path,
+    jobs: int = 4,
+    runtime: str | None = None,
+    note: str = "",
+    dry_run: bool = False,
+    verbose: bool = False,
+):
+    """Uploads the files of the solutions listed in a manifest and submits them, the results are printed as NDJSON.
+
+    The manifest is a JSONL file (or stdin when '-' is used), each line describes one solution:
+    {"assignment": "<id>", "files": ["main.c", "utils.h"], "runtime": "c-gcc-linux", "note": "..."}
+    The relative paths of the files are relative to the directory of the manifest. The files of all solutions
+    share one pool of uploads and every solution is submitted as soon as its own files are uploaded.
+
+    Args:
+        client (SharedClient | None): The client shared by all workers (not needed for a dry run).
+        manifest_path (str): The path to the manifest, or '-' for stdin.
+        journal_dir (Path): The directory where the upload journals are stored.
+        jobs (int, optional): The maximal number of concurrent uploads (and of solutions in progress).
+            Defaults to 4.
+        runtime (str | None, optional): The runtime environment of the solutions that do not specify it.
+            Defaults to None.
+        note (str, optional): The note of the solutions that do not specify it. Defaults to "".
+        dry_run (bool, optional): Only check the manifest and the files, nothing is uploaded or submitted.
+            Defaults to False.
+        verbose (bool, optional): Whether the summary is printed to stderr. Defaults to False.
+
+    Raises:
+        Exception: Thrown when the manifest could not be opened or if any of the solutions failed.
+    """
+
+    base_dir = "." if manifest_path == "-" else os.path.dirname(manifest_path)
+    upload_pool = ThreadPoolExecutor(max_workers=jobs)
+
+    def worker(item: tuple[int, Submission | Exception]) -> dict:
+        _, submission = item
+        if isinstance(submission, Exception):
+            raise submission
+        if dry_run:
+            return _check_files(submission)
+
+        # all files of the solution are queued to the pool shared by all solutions at once,
+        # the solution is submitted as soon as its own files are uploaded
+        uploads = [
+            upload_pool.submit(upload_helper.upload, client, path, journal_dir, live_progress=False)  # type: ignore
+            for path in submission.files
+        ]
+        file_ids = [upload.result() for upload in uploads]
+        with timings.span("submit", assignment=submission.assignment):
+            submission_id = _submit(client, submission, file_ids)  # type: ignore
+        return {"status": "submitted", "files": file_ids, "submission": submission_id}
+
+    total, failed = 0, 0
+    with batch.open_batch_file(manifest_path) as handle, upload_pool:
+        entries = read_manifest(handle, base_dir, runtime, note)
+        for (line_number, submission), result, error in run_bounded(worker, entries, jobs):
+            total += 1
+            record: dict[str, Any] = {"line": line_number}
+            if isinstance(submission, Submission):
+                record["assignment"] = submission.assignment
+            if error is None:
+                record.update(result or {})
+            else:
+                failed += 1
+                record["error"] = str(error)
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+
+    if verbose:
+        action = "checked" if dry_run else "submitted"
+        typer.echo(f"{total - failed} solutions {action} ({failed} failed).", err=True)
+    if failed > 0:
+        raise Exception(f"{failed} of {total} solutions failed.")
+
+
+def read_manifest(
+    handle, base_dir: str, runtime: str | None = None, note: str = ""
+) -> Iterator[tuple[int, Submission | Exception]]:
+    """Parses the lines of an opened manifest.
+
+    Args:
+        handle (TextIO): The opened manifest.
+        base_dir (str): The directory the relative paths of the files are relative to.
+        runtime (str | None, optional): The default runtime environment. Defaults to None.
+        note (str, optional): The default note. Defaults to "".
+
+    Returns:
+        Iterator[tuple[int, Submission | Exception]]: Yields the line number and the solution (or the error
+        describing why the line is not valid) of every non-empty line.
+    """
+
+    for line_number, line in batch.read_batch_lines(handle):
+        try:
+            yield line_number, parse_manifest_line(line, base_dir, runtime, note)
+        except Exception as e:
+            yield line_number, e
+
+
+def parse_manifest_line(line: str, base_dir: str, runtime: str | None = None, note: str = "") -> Submission:
+    """Parses a single line of the manifest (see `submit_many` for the format).
+
+    Raises:
+        Exception: Thrown when the line is not a valid description of a solution.
+    """
+
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        raise Exception("The line is not a valid JSON.")
+    if not isinstance(entry, dict):
+        raise Exception("The line needs to be a JSON object.")
+
+    assignment = entry.get("assignment")
+    if not isinstance(assignment, str):
+        raise Exception("The 'assignment' key is missing or it is not a string.")
+
+    files = entry.get("files")
+    if not isinstance(files, list) or len(files) == 0 or not all(isinstance(file, str) for file in files):
+        raise Exception("The 'files' key needs to be a non-empty list of paths.")
+
+    entry_runtime = entry.get("runtime", runtime)
+    if not isinstance(entry_runtime, str):
+        raise Exception("The 'runtime' key is missing (and no --runtime was given) or it is not a string.")
+
+    entry_note = entry.get("note", note)
+    if not isinstance(entry_note, str):
+        raise Exception("The 'note' key needs to be a string.")
+
+    return Submission(assignment, [os.path.join(base_dir, file) for file in files], entry_runtime, entry_note)
+
+
+def _check_files(submission: Submission) -> dict:
+    size = 0
+    for path in submission.files:
+        try:
+            size += os.stat(path).st_size
+        except OSError as e:
+            raise Exception(f"Could not read the file: {e}")
+    return {"status": "checked", "files": submission.files, "bytes": size}
+
+
+def _submit(client: SharedClient, submission: Submission, file_ids: list[str]) -> str | None:
+    # the swagger document declares the files as a string, but the API expects the list of the uploaded file IDs,
+    # so the body is sent without the validation of the generated client
+    body = {"note": submission.note, "files": file_ids, "runtimeEnvironmentId": submission.runtime}
+    try:
+        response = client.send_raw_request(
+            "submit",
+            "submit",
+            path_params={"id": submission.assignment},
+            body=json.dumps(body).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        payload = json.loads(response.data)["payload"]
+    except Exception as e:
+        raise Exception(f"Could not submit the solution: {cmd_utils.get_api_error_message(e)}")
+
+    # the ID of the created submission (the solution is evaluated asynchronously)
+    submission_data = payload.get("submission") if isinstance(payload, dict) else None
+    return submission_data.get("id") if isinstance(submission_data, dict) else None
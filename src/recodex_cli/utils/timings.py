@@ -0,0 +1,199 @@
+import os
+import sys
+import time
+import threading
+import contextlib
+from typing import Any
+
+# the time the CLI started loading (this module is imported by the console before the other modules)
+_origin = time.perf_counter()
+# the time the first command started (after the imports and the parsing of the command line)
+_command_started: float | None = None
+_commands = 0
+
+
+class Span:
+    """A measured phase of the command (e.g., loading the session or a single HTTP request).
+    """
+
+    def __init__(self, name: str, start: float, end: float, thread: int, args: dict[str, Any], concurrent: bool):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.thread = thread
+        self.args = args
+        self.concurrent = concurrent
+
+    def get_duration(self) -> float:
+        return self.end - self.start
+
+
+class Tracer:
+    """Records the spans of all threads of the process.
+    """
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self.thread_names: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, start: float, end: float, args: dict[str, Any], concurrent: bool = False):
+        """Stores a finished span of the current thread.
+
+        Args:
+            name (str): The name of the phase.
+            start (float): The start time (in seconds, the `time.perf_counter` clock).
+            end (float): The end time.
+            args (dict[str, Any]): Details shown by the trace viewer (e.g., the endpoint).
+            concurrent (bool, optional): Whether the span may overlap other spans of the same thread
+                (e.g., the requests of the asynchronous engine). Defaults to False.
+        """
+
+        thread = threading.current_thread()
+        with self._lock:
+            self.thread_names.setdefault(thread.ident or 0, thread.name)
+            self.spans.append(Span(name, start, end, thread.ident or 0, args, concurrent))
+
+    def format_summary(self) -> str:
+        """Returns the number, the total and the maximal duration of the spans of every phase as text.
+        """
+
+        phases: dict[str, list[Span]] = {}
+        for span in sorted(self.spans, key=lambda span: span.start):
+            phases.setdefault(span.name, []).append(span)
+
+        wall_time = max((span.end for span in self.spans), default=_origin) - min(
+            (span.start for span in self.spans), default=_origin
+        )
+        lines = [
+            f"Timings: {len(self.spans)} spans in {wall_time * 1000:.1f} ms",
+            f"{'phase':<20} {'count':>6} {'total [ms]':>11} {'mean [ms]':>10} {'max [ms]':>10}",
+        ]
+        for name, spans in phases.items():
+            durations = [span.get_duration() * 1000 for span in spans]
+            lines.append(
+                f"{name:<20} {len(spans):>6} {sum(durations):>11.1f} "
+                f"{sum(durations) / len(durations):>10.1f} {max(durations):>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def get_trace_events(self) -> dict[str, Any]:
+        """Returns the spans in the Chrome trace event format (it can be loaded by chrome://tracing or Perfetto).
+        """
+
+        pid = os.getpid()
+        # the thread identifiers are replaced by small numbers, the viewers show them as the names of the rows
+        thread_ids = {thread: index for index, thread in enumerate(self.thread_names, start=1)}
+        events: list[dict[str, Any]] = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_ids[thread], "args": {"name": name}}
+            for thread, name in self.thread_names.items()
+        ]
+
+        async_id = 0
+        for span in self.spans:
+            event = {"name": span.name, "cat": "recodex", "pid": pid, "tid": thread_ids[span.thread]}
+            start, duration = _to_microseconds(span.start), _to_microseconds(span.end) - _to_microseconds(span.start)
+            if span.concurrent:
+                # overlapping spans of one thread are async events (paired by their ID), the viewers
+                # would not nest them correctly otherwise
+                async_id += 1
+                event["id"] = async_id
+                events.append({**event, "ph": "b", "ts": start, "args": span.args})
+                events.append({**event, "ph": "e", "ts": start + duration})
+            else:
+                events.append({**event, "ph": "X", "ts": start, "dur": duration, "args": span.args})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+_tracer: Tracer | None = None
+
+
+class _RecordedSpan:
+    def __init__(self, tracer: Tracer, name: str, args: dict[str, Any], concurrent: bool):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.concurrent = concurrent
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        self.tracer.record(self.name, self.start, time.perf_counter(), self.args, self.concurrent)
+
+
+def command_started():
+    """Marks the end of the startup (called by the root command before every command is executed).
+    """
+
+    global _command_started, _commands
+    _commands += 1
+    if _command_started is None:
+        _command_started = time.perf_counter()
+
+
+def enable():
+    """Starts recording the spans of the current command.
+    The startup (the imports and the parsing of the command line) is recorded as well, unless the command
+    is executed by a long-running process (e.g., the shell or the daemon), which started before the command.
+    """
+
+    global _tracer
+    _tracer = Tracer()
+    if _commands == 1 and _command_started is not None:
+        _tracer.record("imports", _origin, _command_started, {})
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, concurrent: bool = False, **args) -> contextlib.AbstractContextManager:
+    """Returns a context manager that records the duration of the wrapped block.
+    Nothing is recorded (and the overhead is negligible) if the timings were not enabled.
+
+    Args:
+        name (str): The name of the phase (the spans with the same name are summarized together).
+        concurrent (bool, optional): Whether the span may overlap other spans of the same thread
+            (e.g., the requests of the asynchronous engine). Defaults to False.
+        args: Details shown by the trace viewer (e.g., the endpoint).
+
+    Returns:
+        contextlib.AbstractContextManager: Returns the context manager.
+    """
+
+    tracer = _tracer
+    if tracer is None:
+        return contextlib.nullcontext()
+    return _RecordedSpan(tracer, name, args, concurrent)
+
+
+def finish(trace_path: str | None = None):
+    """Stops recording, prints the summary to stderr, and writes the trace file if requested.
+
+    Args:
+        trace_path (str | None, optional): The path of the Chrome trace file. Defaults to None.
+
+    Raises:
+        Exception: Thrown when the trace file could not be written.
+    """
+
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is None:
+        return
+
+    print(tracer.format_summary(), file=sys.stderr)
+    if trace_path is not None:
+        import json
+        try:
+            with open(trace_path, "w") as handle:
+                json.dump(tracer.get_trace_events(), handle)
+        except OSError as e:
+            raise Exception(f"The trace file could not be written: {e}")
+
+
+def _to_microseconds(value: float) -> int:
+    # the trace starts when the CLI started loading
+    return round((value - _origin) * 1_000_000)
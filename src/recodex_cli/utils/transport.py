@@ -0,0 +1,248 @@
+import os
+import time
+import threading
+import certifi
+import urllib3
+from urllib3._collections import RecentlyUsedContainer
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ConnectTimeoutError
+
+from . import request_policy
+
+# the maximal number of connections kept alive for a single host
+DEFAULT_POOL_SIZE = 10
+# idle connections older than this (in seconds) are not reused
+DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+
+# the number of seconds to wait for a new connection and for every read from a connection
+# (the same limits are used by the asynchronous engine)
+CONNECT_TIMEOUT = 10.0
+READ_TIMEOUT = 300.0
+# the maximal number of redirects followed by a single request
+MAX_REDIRECTS = 3
+
+# the defaults can be overridden by environment variables
+POOL_SIZE_ENV = "RECODEX_POOL_SIZE"
+KEEPALIVE_TIMEOUT_ENV = "RECODEX_KEEPALIVE_TIMEOUT"
+
+# the failures are repeated by the request policy (urllib3 would repeat them immediately), redirects are followed
+_NO_RETRIES = urllib3.Retry(total=None, connect=0, read=0, other=0, status=0, redirect=MAX_REDIRECTS)
+_TIMEOUT = urllib3.Timeout(connect=CONNECT_TIMEOUT, read=READ_TIMEOUT)
+
+
+class PooledTransport(urllib3.PoolManager):
+    """Connection pool manager shared by all clients created in one process.
+
+    Keeps connections alive between requests (so that the TCP and TLS handshakes are performed only once),
+    drops connections which were idle for too long, and counts how many requests reused a connection.
+    All requests follow the shared request policy (the rate limit, the retries, and the circuit breaker).
+    """
+
+    def __init__(self, pool_size: int, keepalive_timeout: float):
+        """
+        Args:
+            pool_size (int): The maximal number of connections kept alive for a single host.
+            keepalive_timeout (float): Idle connections older than this (in seconds) are not reused.
+        """
+
+        super().__init__(
+            num_pools=4,
+            maxsize=pool_size,
+            cert_reqs="CERT_REQUIRED",
+            ca_certs=certifi.where(),
+        )
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+
+        # the pools are disposed on eviction or when cleared, so their counters need to be preserved
+        self.pools = RecentlyUsedContainer(4, dispose_func=self._dispose_pool)
+
+        self._lock = threading.Lock()
+        self._last_used: float | None = None
+        self._disposed_requests = 0
+        self._disposed_connections = 0
+        self._expirations = 0
+
+    def _dispose_pool(self, pool: HTTPConnectionPool):
+        with self._lock:
+            self._disposed_requests += pool.num_requests
+            self._disposed_connections += pool.num_connections
+        pool.close()
+
+    def _drop_idle_connections(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = self._last_used is not None and now - self._last_used > self.keepalive_timeout
+            self._last_used = now
+            if expired:
+                self._expirations += 1
+
+        # the server has most likely closed the connections already
+        if expired:
+            self.clear()
+
+    def urlopen(self, method, url, redirect=True, **kw):
+        policy = request_policy.get_policy()
+        kw.setdefault("retries", _NO_RETRIES)
+        # the generated client passes None if no timeout was requested
+        if kw.get("timeout") is None:
+            kw["timeout"] = _TIMEOUT
+
+        attempt = 0
+        while True:
+            time.sleep(policy.reserve())
+            self._drop_idle_connections()
+            try:
+                response = super().urlopen(method, url, redirect=redirect, **kw)
+            except MaxRetryError as e:
+                # the requests that failed to connect have not reached the server
+                sent = not isinstance(e.reason, (NewConnectionError, ConnectTimeoutError))
+                delay = policy.get_retry_delay(method, attempt, sent=sent)
+                if delay is None:
+                    raise
+            except BaseException:
+                # a trial request of an open circuit that failed unexpectedly (or was interrupted) has no result
+                policy.breaker.release()
+                raise
+            else:
+                if response.status not in request_policy.RETRY_STATUSES:
+                    policy.record_success()
+                    return response
+                delay = policy.get_retry_delay(method, attempt, response.status, response.headers.get("Retry-After"))
+                if delay is None:
+                    return response
+                response.drain_conn()
+                response.release_conn()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def resize(self, pool_size: int, keepalive_timeout: float):
+        """Changes the parameters of the pool (the idle connections are closed if the size changes).
+
+        Args:
+            pool_size (int): The maximal number of connections kept alive for a single host.
+            keepalive_timeout (float): Idle connections older than this (in seconds) are not reused.
+        """
+
+        self.keepalive_timeout = keepalive_timeout
+        if pool_size != self.pool_size:
+            self.pool_size = pool_size
+            self.connection_pool_kw["maxsize"] = pool_size
+            self.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        """Returns the usage statistics of the pool.
+
+        Returns:
+            dict[str, int]: Returns a dictionary with the number of requests, pool hits (requests that reused
+            an open connection), pool misses (newly opened connections), and keep-alive expirations.
+        """
+
+        with self._lock:
+            requests = self._disposed_requests
+            connections = self._disposed_connections
+            expirations = self._expirations
+
+        for key in self.pools.keys():
+            pool = self.pools.get(key)
+            if pool is not None:
+                requests += pool.num_requests
+                connections += pool.num_connections
+
+        return {
+            "requests": requests,
+            "hits": max(requests - connections, 0),
+            "misses": connections,
+            "expirations": expirations,
+        }
+
+
+_transport: PooledTransport | None = None
+_transport_lock = threading.Lock()
+_pool_size: int | None = None
+_keepalive_timeout: float | None = None
+
+
+def configure(pool_size: int | None = None, keepalive_timeout: float | None = None):
+    """Overrides the parameters of the shared transport (they are applied also if it has been created already).
+
+    Args:
+        pool_size (int | None, optional): The maximal number of connections kept alive for a single host.
+        keepalive_timeout (float | None, optional): Idle connections older than this (in seconds) are not reused.
+    """
+
+    global _pool_size, _keepalive_timeout
+    if pool_size is not None:
+        _pool_size = pool_size
+    if keepalive_timeout is not None:
+        _keepalive_timeout = keepalive_timeout
+    _apply_configuration()
+
+
+def reset_configuration():
+    """Drops the overrides, so that the parameters are taken from the environment variables again
+    (e.g., when the daemon executes a command with the variables of its client).
+    """
+
+    global _pool_size, _keepalive_timeout
+    _pool_size = None
+    _keepalive_timeout = None
+    _apply_configuration()
+
+
+def reserve_connections(count: int):
+    """Makes sure the pool will be large enough for the given number of concurrent requests.
+
+    Args:
+        count (int): The number of requests expected to run concurrently.
+    """
+
+    configure(pool_size=max(_get_pool_size(), count))
+
+
+def get_transport() -> PooledTransport:
+    """Returns the transport shared by all clients of the process (creates it on the first call).
+
+    Returns:
+        PooledTransport: Returns the shared pool manager.
+    """
+
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = PooledTransport(_get_pool_size(), _get_keepalive_timeout())
+        return _transport
+
+
+def get_stats() -> dict[str, int] | None:
+    """Returns the usage statistics of the shared transport, or None if it has not been used.
+    """
+
+    if _transport is None:
+        return None
+    return _transport.get_stats()
+
+
+def _apply_configuration():
+    with _transport_lock:
+        if _transport is not None:
+            _transport.resize(_get_pool_size(), _get_keepalive_timeout())
+
+
+def _get_pool_size() -> int:
+    if _pool_size is not None:
+        return _pool_size
+    try:
+        return int(os.environ.get(POOL_SIZE_ENV, DEFAULT_POOL_SIZE))
+    except ValueError:
+        raise Exception(f"The {POOL_SIZE_ENV} environment variable needs to be an integer.")
+
+
+def _get_keepalive_timeout() -> float:
+    if _keepalive_timeout is not None:
+        return _keepalive_timeout
+    try:
+        return float(os.environ.get(KEEPALIVE_TIMEOUT_ENV, DEFAULT_KEEPALIVE_TIMEOUT))
+    except ValueError:
+        raise Exception(f"The {KEEPALIVE_TIMEOUT_ENV} environment variable needs to be a number.")
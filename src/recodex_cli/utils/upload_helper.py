@@ -0,0 +1,325 @@
+import os
+import json
+import hashlib
+import queue
+import typing
+import threading
+from pathlib import Path
+from collections.abc import Iterator
+
+from .shared_client import SharedClient
+from .progress import TransferProgress
+
+CHUNK_SIZE = 2 ** 17  # 128 KiB (the same as in the pylib upload helper)
+
+T = typing.TypeVar("T")
+
+# marks the end of the items read ahead
+_END = object()
+
+
+class UploadJournal:
+    """Append-only record of the chunks of a partial upload that were accepted by the server.
+
+    The first line holds the upload metadata (JSON), every other line holds the offset of one sent chunk.
+    The journal of an interrupted upload is used to resume it, it is removed once the upload is completed.
+    """
+
+    def __init__(self, path: Path, metadata: dict, completed: set[int] | None = None):
+        """
+        Args:
+            path (Path): The path of the journal file.
+            metadata (dict): The partial file ID and the parameters of the uploaded file.
+            completed (set[int] | None, optional): The offsets of the chunks sent already. Defaults to None.
+        """
+
+        self.path = path
+        self.metadata = metadata
+        self.completed = completed if completed is not None else set()
+
+    @staticmethod
+    def load(path: Path) -> "UploadJournal | None":
+        """Loads the journal from a file.
+
+        Args:
+            path (Path): The path of the journal file.
+
+        Returns:
+            UploadJournal | None: Returns the journal, or None if the file is missing or corrupted.
+        """
+
+        try:
+            with open(path, "r") as handle:
+                metadata = json.loads(handle.readline())
+                # the last line may be incomplete if the process was killed while writing it
+                completed = {int(line) for line in handle if line.strip().isdigit()}
+        except (OSError, ValueError):
+            return None
+        return UploadJournal(path, metadata, completed) if isinstance(metadata, dict) else None
+
+    def create(self):
+        """Writes the metadata to a new journal file (an existing journal is overwritten).
+        """
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w") as handle:
+            handle.write(json.dumps(self.metadata) + "\n")
+
+    def add(self, offset: int):
+        """Records that the chunk at the given offset was sent.
+        """
+
+        self.completed.add(offset)
+        with open(self.path, "a") as handle:
+            handle.write(f"{offset}\n")
+
+    def remove(self):
+        """Removes the journal file.
+        """
+
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def upload(
+    client: SharedClient,
+    filepath: str,
+    journal_dir: Path,
+    read_ahead: int = 1,
+    resume: bool = False,
+    verbose: bool = False,
+    live_progress: bool = True,
+) -> str:
+    """Uploads a file in chunks, the next chunks are read while the current one is being sent.
+    The chunks are sent one by one in order (the server appends them to the partial file).
+    The progress is recorded in a journal, so that an interrupted upload can be resumed.
+
+    Args:
+        client (SharedClient): The client used for the upload.
+        filepath (str): The path to the file.
+        journal_dir (Path): The directory where the upload journals are stored.
+        read_ahead (int, optional): The maximal number of chunks read (and hashed) ahead of the sent one.
+            Defaults to 1.
+        resume (bool, optional): Whether an interrupted upload of the same file should be continued.
+            Defaults to False.
+        verbose (bool, optional): Whether to print out debug information. Defaults to False.
+        live_progress (bool, optional): Whether the progress line is drawn (disabled by concurrent uploads).
+            Defaults to True.
+
+    Raises:
+        Exception: Raises an exception if any request failed or if the final file digest does not match the server.
+
+    Returns:
+        str: Returns the File ID of the uploaded file.
+    """
+
+    try:
+        stat = os.stat(filepath)
+    except OSError as e:
+        raise Exception(f"Could not read the file: {e}")
+    byte_count = stat.st_size
+
+    journal_path = journal_dir / f"{hashlib.sha1(os.path.abspath(filepath).encode()).hexdigest()}.journal"
+    metadata = {"size": byte_count, "mtime_ns": stat.st_mtime_ns, "chunk_size": CHUNK_SIZE}
+
+    journal = UploadJournal.load(journal_path) if resume else None
+    if journal is not None and {key: journal.metadata.get(key) for key in metadata} == metadata:
+        partial_file_id = journal.metadata["partial_file_id"]
+        _print_if_verbose(f"Resuming partial upload, Partial File ID: {partial_file_id}", verbose)
+    else:
+        if resume:
+            _print_if_verbose("No interrupted upload of the file was found, starting a new one", verbose)
+        partial_file_id = _start_partial(client, os.path.basename(filepath), byte_count)
+        journal = UploadJournal(journal_path, {**metadata, "partial_file_id": partial_file_id})
+        journal.create()
+        _print_if_verbose(f"Initiated partial upload, Partial File ID: {partial_file_id}", verbose)
+
+    # the digest is computed while the chunks are read, so the file is read only once
+    hash = hashlib.sha1()
+    _send_chunks(client, filepath, byte_count, journal, hash, read_ahead, verbose, live_progress)
+    _print_if_verbose("All chunks sent", verbose)
+
+    file_id = _complete_partial(client, partial_file_id)
+    journal.remove()
+    _print_if_verbose("Partial upload completed", verbose)
+
+    # compare the server and client digest
+    if get_server_digest(client, file_id) != hash.hexdigest():
+        raise Exception("The server and client digests do not match")
+    _print_if_verbose("Server and client file digests match", verbose)
+
+    return file_id
+
+
+def _print_if_verbose(message: str, verbose: bool):
+    if verbose:
+        print(message)
+
+
+def _read_chunks(filepath: str, hash) -> Iterator[tuple[int, bytes]]:
+    with open(filepath, "rb") as file:
+        offset = 0
+        while True:
+            chunk = file.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            hash.update(chunk)
+            yield offset, chunk
+            offset += len(chunk)
+
+
+def _send_chunks(
+    client: SharedClient,
+    filepath: str,
+    byte_count: int,
+    journal: UploadJournal,
+    hash,
+    read_ahead: int,
+    verbose: bool,
+    live_progress: bool,
+):
+    # the server accepts the chunks only in order (a partial upload is a sequence of PUT requests),
+    # so only the chunks sent before without a gap are skipped
+    resume_offset = 0
+    while resume_offset < byte_count and resume_offset in journal.completed:
+        resume_offset += CHUNK_SIZE
+    resume_offset = min(resume_offset, byte_count)
+    if resume_offset > 0:
+        _print_if_verbose(f"Skipping {resume_offset // CHUNK_SIZE} chunks sent before", verbose)
+    progress = TransferProgress("Uploaded", byte_count, resume_offset, verbose, live_progress)
+
+    # the next chunks are read and hashed by a background thread while the current one is being sent
+    # (the chunks sent before are read as well, they are needed for the digest)
+    for offset, chunk in _read_ahead(_read_chunks(filepath, hash), read_ahead):
+        if offset < resume_offset:
+            continue
+        _append_partial(client, journal.metadata["partial_file_id"], chunk, offset)
+        journal.add(offset)
+        progress.update(len(chunk))
+    progress.finish()
+
+
+def _read_ahead(items: Iterator[T], depth: int) -> Iterator[T]:
+    # yields the items of the iterator, which is consumed by a background thread up to `depth` items ahead
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+    producer = threading.Thread(target=_produce, args=(items, buffer, stopped), daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if error is not None:
+                raise error
+            if item is _END:
+                return
+            yield item
+    finally:
+        stopped.set()
+        producer.join()
+
+
+def _produce(items: Iterator, buffer: queue.Queue, stopped: threading.Event):
+    try:
+        for item in items:
+            if not _put(buffer, (item, None), stopped):
+                return
+        _put(buffer, (_END, None), stopped)
+    except Exception as e:
+        _put(buffer, (_END, e), stopped)
+
+
+def _put(buffer: queue.Queue, entry: tuple, stopped: threading.Event) -> bool:
+    # the consumer may stop early (e.g., a chunk was rejected), then the producer must not block forever
+    while not stopped.is_set():
+        try:
+            buffer.put(entry, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get_payload(response) -> dict:
+    try:
+        return json.loads(response.data)["payload"]
+    except Exception:
+        raise Exception("Could not parse response data")
+
+
+def _start_partial(client: SharedClient, filename: str, byte_count: int) -> str:
+    try:
+        res = client.send_request(
+            "uploaded_files",
+            "start_partial",
+            {
+                "name": filename,
+                "size": byte_count,
+            }
+        ).get_parsed_data()
+
+        if res is None:
+            raise Exception("Could not parse response data")
+        return res["payload"]["id"]
+    except Exception as e:
+        raise Exception(f"Could not start partial upload: {e}")
+
+
+def _append_partial(client: SharedClient, partial_file_id: str, chunk: bytes, offset: int):
+    # the chunks are sent as raw bytes (the generated client can only send text bodies)
+    try:
+        response = client.send_raw_request(
+            "uploaded_files",
+            "append_partial",
+            path_params={"id": partial_file_id},
+            query_params={"offset": offset},
+            body=chunk,
+            headers={"Content-Type": "application/octet-stream"},
+        )
+        _get_payload(response)
+    except Exception as e:
+        raise Exception(f"Could not send chunk: {e}")
+
+
+def _complete_partial(client: SharedClient, partial_file_id: str) -> str:
+    try:
+        res = client.send_request(
+            "uploaded_files",
+            "complete_partial",
+            path_params={"id": partial_file_id},
+        ).get_parsed_data()
+
+        if res is None:
+            raise Exception("Could not parse response data")
+        return res["payload"]["id"]
+    except Exception as e:
+        raise Exception(f"Could not complete file upload: {e}")
+
+
+def get_server_digest(client: SharedClient, file_id: str) -> str:
+    """Returns the SHA-1 digest of an uploaded file computed by the server.
+
+    Args:
+        client (SharedClient): The client used for the request.
+        file_id (str): The ID of the file.
+
+    Raises:
+        Exception: Thrown when the request failed.
+
+    Returns:
+        str: Returns the hexadecimal digest.
+    """
+
+    try:
+        res = client.send_request(
+            "uploaded_files",
+            "digest",
+            path_params={"id": file_id},
+        ).get_parsed_data()
+
+        if res is None:
+            raise Exception("Could not parse response data")
+        return res["payload"]["digest"]
+    except Exception as e:
+        raise Exception(f"Could not fetch uploaded file digest: {e}")
@@ -0,0 +1,61 @@
+import typing
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+
+T = typing.TypeVar("T")
+R = typing.TypeVar("R")
+
+
+def run_bounded(
+    worker: Callable[[T], R],
+    items: Iterable[T],
+    jobs: int,
+) -> Iterator[tuple[T, R | None, Exception | None]]:
+    """Executes a worker for every item on a bounded pool of threads.
+
+    The items are consumed lazily, so that at most a small multiple of `jobs` items are in flight at any time.
+    This keeps the memory footprint constant even for very long inputs (e.g., large JSONL files).
+
+    Args:
+        worker (Callable[[T], R]): The function executed for every item.
+        items (Iterable[T]): The items to be processed.
+        jobs (int): The maximal number of concurrently running workers.
+
+    Yields:
+        tuple[T, R | None, Exception | None]: Returns (item, result, exception) triples in order of completion.
+            Exactly one of the result and exception is set (unless the worker returned None).
+    """
+
+    if jobs < 1:
+        raise Exception("The number of jobs must be a positive integer.")
+
+    window = jobs * 2
+    pending: dict[Future, T] = {}
+    iterator = iter(items)
+    exhausted = False
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while True:
+            # keep the window full
+            while not exhausted and len(pending) < window:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[executor.submit(worker, item)] = item
+
+            if not pending:
+                return
+
+            done, _ = wait(pending.keys(), return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                exception = future.exception()
+                if exception is None:
+                    yield item, future.result(), None
+                elif isinstance(exception, Exception):
+                    yield item, None, exception
+                else:
+                    # propagate KeyboardInterrupt and other non-standard exceptions
+                    raise exception
@@ -0,0 +1,225 @@
+import json
+import time
+import random
+import typer
+from collections.abc import Iterable, Iterator
+
+from ..utils import cmd_utils
+from ..utils import timings
+from ..utils.shared_client import SharedClient
+from ..utils.worker_pool import run_bounded
+
+# the evaluation status of the submissions that are not evaluated yet
+PENDING_STATUS = "work-in-progress"
+# the polling interval of a submission whose status did not change is multiplied by this factor
+BACKOFF_FACTOR = 1.5
+# the intervals are randomized by this fraction, so that the polls of many submissions do not stay in lockstep
+JITTER = 0.1
+# the number of consecutive failed polls after which a submission is given up
+MAX_ERRORS = 3
+
+
+class WatchedSubmission:
+    """The polling state of a single watched submission.
+    """
+
+    def __init__(self, id: str, interval: float):
+        self.id = id
+        # the solution is learned from the first response
+        self.solution: str | None = None
+        self.status: str | None = None
+        self.interval = interval
+        self.next_poll = 0.0
+        self.errors = 0
+
+
+class Watcher:
+    """Polls the evaluation statuses of many submissions from a single scheduler.
+
+    Every submission has its own polling interval, which grows while its status does not change
+    and is reset when it changes. The submissions of the same solution are polled together by a single request
+    that lists all submissions of the solution (the API has no endpoint listing arbitrary submissions).
+    """
+
+    def __init__(
+        self,
+        client: SharedClient,
+        submission_ids: Iterable[str],
+        interval: float = 2.0,
+        max_interval: float = 30.0,
+        jobs: int = 4,
+    ):
+        self.client = client
+        self.interval = interval
+        self.max_interval = max_interval
+        self.jobs = jobs
+        # duplicates are watched only once
+        self.pending = {id: WatchedSubmission(id, interval) for id in submission_ids}
+        self.requests = 0
+        self.start = time.monotonic()
+
+    def run(self, timeout: float | None = None) -> Iterator[dict]:
+        """Polls the submissions until all evaluations are finished or the timeout passes.
+        The submissions that are still pending when the timeout passes are left in `pending`.
+
+        Args:
+            timeout (float | None, optional): The maximal number of seconds to watch. Defaults to None (no limit).
+
+        Yields:
+            dict: Returns an event whenever the status of a submission changes (including the first status
+                and the final one) or when a submission could not be polled.
+        """
+
+        self.start = time.monotonic()
+        deadline = None if timeout is None else self.start + timeout
+        while self.pending:
+            next_poll = min(submission.next_poll for submission in self.pending.values())
+            if deadline is not None and next_poll > deadline:
+                time.sleep(max(deadline - time.monotonic(), 0))
+                return
+            time.sleep(max(next_poll - time.monotonic(), 0))
+
+            now = time.monotonic()
+            due = [submission for submission in self.pending.values() if submission.next_poll <= now]
+            yield from self._poll(due)
+
+    def _poll(self, due: list[WatchedSubmission]) -> Iterator[dict]:
+        for (kind, _, covered), payloads, error in run_bounded(self._fetch, self._plan_requests(due), self.jobs):
+            self.requests += 1
+            now = time.monotonic()
+            if error is not None:
+                yield from self._fail(kind, covered, error, now)
+                continue
+
+            by_id = {data.get("id"): data for data in payloads or [] if isinstance(data, dict)}
+            for submission in covered:
+                data = by_id.get(submission.id)
+                if data is None:
+                    # the submission is not listed with its solution anymore, it is polled on its own
+                    submission.solution = None
+                    self._schedule(submission, now, changed=False)
+                    continue
+                event = self._update(submission, data, now)
+                if event is not None:
+                    yield event
+
+    def _plan_requests(self, due: list[WatchedSubmission]) -> list[tuple[str, str, list[WatchedSubmission]]]:
+        # a solution with more pending submissions is listed once (refreshing also its submissions that are not due)
+        by_solution: dict[str, list[WatchedSubmission]] = {}
+        for submission in self.pending.values():
+            if submission.solution is not None:
+                by_solution.setdefault(submission.solution, []).append(submission)
+
+        requests = []
+        listed = set()
+        for submission in due:
+            siblings = by_solution.get(submission.solution, []) if submission.solution is not None else []
+            if len(siblings) < 2:
+                requests.append(("submission", submission.id, [submission]))
+            elif submission.solution not in listed:
+                listed.add(submission.solution)
+                requests.append(("solution", submission.solution, siblings))
+        return requests  # type: ignore
+
+    def _fetch(self, request: tuple[str, str, list[WatchedSubmission]]) -> list:
+        kind, id, _ = request
+        with timings.span("poll", kind=kind):
+            if kind == "solution":
+                response = self.client.send_request("assignment_solutions", "submissions", path_params={"id": id})
+            else:
+                response = self.client.send_request(
+                    "assignment_solutions", "submission", path_params={"submissionId": id}
+                )
+        response.check_success()
+        payload = response.get_payload()
+        return payload if isinstance(payload, list) else [payload]
+
+    def _update(self, submission: WatchedSubmission, data: dict, now: float) -> dict | None:
+        status = data.get("evaluationStatus") or PENDING_STATUS
+        changed = status != submission.status
+        submission.status = status
+        submission.solution = data.get("assignmentSolutionId") or submission.solution
+        submission.errors = 0
+
+        if status == PENDING_STATUS:
+            self._schedule(submission, now, changed)
+        else:
+            del self.pending[submission.id]
+        return self._make_event(submission, data, now) if changed else None
+
+    def _fail(self, kind: str, covered: list[WatchedSubmission], error: Exception, now: float) -> Iterator[dict]:
+        # a submission that does not exist (or cannot be accessed) is given up at once,
+        # a failed listing of a solution just makes its submissions to be polled one by one
+        http_status = getattr(error, "status", None)
+        client_error = isinstance(http_status, int) and 400 <= http_status < 500 and http_status != 429
+        permanent = kind == "submission" and client_error
+        message = cmd_utils.get_api_error_message(error)
+        for submission in covered:
+            submission.errors += 1
+            submission.solution = None
+            if permanent or submission.errors >= MAX_ERRORS:
+                del self.pending[submission.id]
+                yield {"id": submission.id, "error": message}
+            else:
+                self._schedule(submission, now, changed=False)
+
+    def _schedule(self, submission: WatchedSubmission, now: float, changed: bool):
+        if changed:
+            submission.interval = self.interval
+        else:
+            submission.interval = min(submission.interval * BACKOFF_FACTOR, self.max_interval)
+        submission.next_poll = now + submission.interval * random.uniform(1 - JITTER, 1 + JITTER)
+
+    def _make_event(self, submission: WatchedSubmission, data: dict, now: float) -> dict:
+        event = {"id": submission.id, "status": submission.status, "solution": submission.solution}
+        evaluation = data.get("evaluation")
+        if isinstance(evaluation, dict):
+            event.update({key: evaluation[key] for key in ("score", "points") if key in evaluation})
+        event["elapsed"] = round(now - self.start, 2)
+        return event
+
+
+def watch(
+    client: SharedClient,
+    submission_ids: Iterable[str],
+    interval: float = 2.0,
+    max_interval: float = 30.0,
+    timeout: float | None = None,
+    jobs: int = 4,
+    verbose: bool = False,
+):
+    """Watches the evaluations of multiple submissions and prints the changes of their statuses as NDJSON.
+
+    Args:
+        client (SharedClient): The client shared by all polls.
+        submission_ids (Iterable[str]): The IDs of the submissions (duplicates are watched only once).
+        interval (float, optional): The initial polling interval of every submission in seconds. Defaults to 2.0.
+        max_interval (float, optional): The maximal polling interval in seconds. Defaults to 30.0.
+        timeout (float | None, optional): The maximal number of seconds to watch. Defaults to None (no limit).
+        jobs (int, optional): The maximal number of concurrent requests. Defaults to 4.
+        verbose (bool, optional): Whether the summary is printed to stderr. Defaults to False.
+
+    Raises:
+        Exception: Thrown when some evaluations did not finish before the timeout or some submissions
+            could not be polled.
+    """
+
+    watcher = Watcher(client, submission_ids, interval, max_interval, jobs)
+    total = len(watcher.pending)
+    failed = 0
+    for event in watcher.run(timeout):
+        failed += "error" in event
+        print(json.dumps(event, ensure_ascii=False), flush=True)
+
+    finished = total - failed - len(watcher.pending)
+    if verbose:
+        elapsed = time.monotonic() - watcher.start
+        typer.echo(
+            f"{finished} evaluations finished ({failed} submissions could not be polled) in {elapsed:.1f} s, "
+            f"{watcher.requests} requests sent.",
+            err=True,
+        )
+    if watcher.pending:
+        raise Exception(f"{len(watcher.pending)} of {total} evaluations did not finish in time.")
+    if failed > 0:
+        raise Exception(f"{failed} of {total} submissions could not be polled.")
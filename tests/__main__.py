@@ -1,4 +1,9 @@
+import os
 from .mock_server import create_app
 
-app = create_app()
+# the artificial latency (in milliseconds) and the size of the group list can be set for manual measurements
+app = create_app(
+    latency=float(os.environ.get("MOCK_LATENCY_MS", 0)) / 1000,
+    group_count=int(os.environ.get("MOCK_GROUP_COUNT", 1)),
+)
 app.run(port=8081, debug=False, use_reloader=False)
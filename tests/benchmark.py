@@ -0,0 +1,258 @@
+"""Performance benchmarks of the CLI against the mock server.
+
+The mock server is started in this process (on a free port), the CLI is executed in subprocesses with a separate
+data directory (so the session of the user is not touched). The results are printed as JSON, so that they can be
+compared between versions:
+
+    python3 -m tests.benchmark --output results.json
+    python3 -m tests.benchmark --scenarios call --latency 20 --repeat 20
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import threading
+import statistics
+import subprocess
+from importlib import metadata
+from werkzeug.serving import make_server
+
+from .mock_server import create_app
+from .utils import constants
+
+SCENARIOS = ["cold_start", "call", "upload", "download", "serialization"]
+
+DEFAULT_REPEAT = 5
+# the sizes of the transferred files (in MiB)
+DEFAULT_TRANSFER_SIZES = [1, 16, 64]
+# the number of groups in the large response (about 1 KB per group)
+DEFAULT_GROUP_COUNT = 20000
+
+MIB = 2 ** 20
+
+
+class Benchmark:
+    """Runs the CLI against the mock server and measures the duration of the commands.
+    """
+
+    def __init__(self, app, api_url: str, data_home: str, repeat: int):
+        self.app = app
+        self.api_url = api_url
+        self.data_home = data_home
+        self.repeat = repeat
+        # the daemon would skew the measurements (and it would use the data directory of the user)
+        self.env = {**os.environ, "XDG_DATA_HOME": data_home, "RECODEX_NO_DAEMON": "1"}
+
+    def run_cli(self, args: list[str]) -> float:
+        """Executes the CLI and returns its duration (in seconds).
+
+        Raises:
+            Exception: Thrown when the command failed.
+        """
+
+        started = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-m", "recodex_cli", *args],
+            env=self.env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        elapsed = time.perf_counter() - started
+        if process.returncode != 0:
+            raise Exception(f"The command {' '.join(args)} failed: {process.stderr.decode(errors='replace')}")
+        return elapsed
+
+    def measure(self, args: list[str]) -> dict:
+        """Executes the CLI repeatedly and returns the statistics of the durations.
+        """
+
+        # the first run warms up the caches of the file system (and creates the endpoint index)
+        self.run_cli(args)
+        return get_stats([self.run_cli(args) for _ in range(self.repeat)])
+
+    def login(self):
+        self.run_cli(["login", "--username", "test", "--password", "test", "--api-url", self.api_url])
+
+
+def get_stats(durations: list[float]) -> dict:
+    """Returns the statistics of the measured durations (in seconds).
+    """
+
+    return {
+        "runs": len(durations),
+        "min": min(durations),
+        "median": statistics.median(durations),
+        "mean": statistics.mean(durations),
+        "max": max(durations),
+        "stdev": statistics.stdev(durations) if len(durations) > 1 else 0.0,
+    }
+
+
+def bench_cold_start(benchmark: Benchmark, _) -> dict:
+    # the time until the CLI can do anything (the interpreter startup and the imports)
+    return {"help": benchmark.measure(["--help"])}
+
+
+def bench_call(benchmark: Benchmark, _) -> dict:
+    return {"groups.default": benchmark.measure(["call", "groups.default"])}
+
+
+def bench_upload(benchmark: Benchmark, settings: argparse.Namespace) -> dict:
+    results = {}
+    for size in settings.transfer_sizes:
+        path = os.path.join(benchmark.data_home, f"upload-{size}.bin")
+        with open(path, "wb") as handle:
+            handle.write(os.urandom(size * MIB))
+        stats = benchmark.measure(["file", "upload", path])
+        stats["throughput_mib_s"] = size / stats["median"]
+        results[f"{size} MiB"] = stats
+        os.remove(path)
+    return results
+
+
+def bench_download(benchmark: Benchmark, settings: argparse.Namespace) -> dict:
+    # the mock server returns the content of the last uploaded file
+    from .mockEndpoints import file_mocks
+
+    results = {}
+    out_path = os.path.join(benchmark.data_home, "download.bin")
+    for size in settings.transfer_sizes:
+        file_mocks.uploaded_files[constants.uuid] = os.urandom(size * MIB)
+        stats = benchmark.measure(["file", "download", constants.uuid, "--out-path", out_path, "--no-verify"])
+        stats["throughput_mib_s"] = size / stats["median"]
+        results[f"{size} MiB"] = stats
+    os.remove(out_path)
+
+    with open(constants.uploadTestFilePath, "rb") as handle:
+        file_mocks.uploaded_files[constants.uuid] = handle.read()
+    return results
+
+
+def bench_serialization(benchmark: Benchmark, settings: argparse.Namespace) -> dict:
+    # the serialization of the response is measured by the --timings spans of the CLI itself
+    benchmark.app.config["MOCK_GROUP_COUNT"] = settings.group_count
+    out_path = os.path.join(benchmark.data_home, "response.out")
+    trace_path = os.path.join(benchmark.data_home, "trace.json")
+
+    results = {}
+    for output_format, options in [("json", []), ("yaml", ["--return-yaml"])]:
+        args = ["call", "groups.default", "--out-path", out_path, "--trace-out", trace_path, *options]
+        benchmark.run_cli(args)
+        durations, serialization = [], []
+        for _ in range(benchmark.repeat):
+            durations.append(benchmark.run_cli(args))
+            serialization.append(_get_span_duration(trace_path, "serialize"))
+        results[output_format] = {
+            "response_size": os.path.getsize(out_path),
+            "command": get_stats(durations),
+            "serialize": get_stats(serialization),
+        }
+        os.remove(out_path)
+    os.remove(trace_path)
+
+    benchmark.app.config["MOCK_GROUP_COUNT"] = 1
+    return results
+
+
+def get_environment() -> dict:
+    """Returns the details needed to compare results of different runs (the versions and the machine).
+    """
+
+    try:
+        version = metadata.version("recodex-cli")
+    except metadata.PackageNotFoundError:
+        version = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "version": version,
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def parse_args(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python3 -m tests.benchmark", description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma-separated list of the scenarios ({', '.join(SCENARIOS)})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="The number of measured runs")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="The artificial latency of every response of the mock server (in milliseconds)")
+    parser.add_argument("--transfer-sizes", type=lambda value: [int(size) for size in value.split(",")],
+                        default=DEFAULT_TRANSFER_SIZES, help="Comma-separated sizes of the transferred files in MiB")
+    parser.add_argument("--group-count", type=int, default=DEFAULT_GROUP_COUNT,
+                        help="The number of groups in the large response")
+    parser.add_argument("--output", help="Write the results to this file instead of stdout")
+    settings = parser.parse_args(args)
+
+    settings.scenarios = settings.scenarios.split(",")
+    unknown = [scenario for scenario in settings.scenarios if scenario not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    if settings.repeat < 1:
+        parser.error("--repeat needs to be positive")
+    return settings
+
+
+def main(args: list[str] | None = None):
+    settings = parse_args(args)
+    benchmarks = {
+        "cold_start": bench_cold_start,
+        "call": bench_call,
+        "upload": bench_upload,
+        "download": bench_download,
+        "serialization": bench_serialization,
+    }
+
+    app = create_app(latency=settings.latency / 1000)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory(prefix="recodex-benchmark-") as data_home:
+            benchmark = Benchmark(app, f"http://127.0.0.1:{server.server_port}", data_home, settings.repeat)
+            benchmark.login()
+            for scenario in settings.scenarios:
+                print(f"Running {scenario}...", file=sys.stderr, flush=True)
+                results[scenario] = benchmarks[scenario](benchmark, settings)
+    finally:
+        server.shutdown()
+
+    report = {
+        "environment": get_environment(),
+        "settings": {
+            "repeat": settings.repeat,
+            "latency_ms": settings.latency,
+            "transfer_sizes_mib": settings.transfer_sizes,
+            "group_count": settings.group_count,
+        },
+        "results": results,
+    }
+    if settings.output is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(settings.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+
+def _get_span_duration(trace_path: str, name: str) -> float:
+    # returns the total duration of the spans with the name (in seconds)
+    with open(trace_path) as handle:
+        events = json.load(handle)["traceEvents"]
+    return sum(event["dur"] for event in events if event["name"] == name and event["ph"] == "X") / 1_000_000
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+from flask import Blueprint, jsonify, request
+from ..utils.success_wrapper import wrap
+from ..utils import constants
+from . import file_mocks
+
+api_bp = Blueprint('export', __name__)
+
+
+def export_id(index: int) -> str:
+    return f"10000000-2000-4000-8000-a{index:011d}"
+
+
+# the assignments of the exported group, their solutions, and the files
+assignments = [
+    {"id": export_id(1), "exerciseId": export_id(11), "name": "Hello", "updatedAt": 1700000000},
+    {"id": export_id(2), "exerciseId": export_id(12), "name": "Sort", "updatedAt": 1700000100},
+]
+solutions = {
+    export_id(1): [{"id": export_id(21), "note": ""}, {"id": export_id(22), "note": ""}],
+    export_id(2): [{"id": export_id(23), "note": ""}],
+}
+solution_files = {
+    export_id(21): [{"id": export_id(31), "name": "main.c"}],
+    export_id(22): [{"id": export_id(32), "name": "main.c"}],
+    # the name must not escape the directory of the solution (nor overwrite the other file with the same name)
+    export_id(23): [{"id": export_id(33), "name": "../sort.py"}, {"id": export_id(34), "name": "sort.py"}],
+}
+attachment_files = {
+    export_id(11): [{"id": export_id(41), "name": "task.md"}],
+}
+for files in [*solution_files.values(), *attachment_files.values()]:
+    for file in files:
+        file_mocks.uploaded_files[file["id"]] = f"the content of {file['id']}\n".encode()
+
+
+def find_solution(id: str) -> dict | None:
+    return next((solution for group in solutions.values() for solution in group if solution["id"] == id), None)
+
+
+def get_submissions(solution_id: str) -> list:
+    return [{"id": solution_id[:-2] + "99", "evaluationStatus": "done", "evaluation": {"score": 1, "points": 10}}]
+
+
+@api_bp.route('/v1/groups/<id>/assignments', methods=['GET'])
+def group_assignments(id):
+    return jsonify(wrap(assignments if id == constants.exportGroupId else [])), 200
+
+
+@api_bp.route('/v1/exercise-assignments/<id>/solutions', methods=['GET'])
+def assignment_solutions(id):
+    return jsonify(wrap(solutions.get(id, []))), 200
+
+
+@api_bp.route('/v1/exercises/<id>/attachment-files', methods=['GET'])
+def exercise_attachment_files(id):
+    return jsonify(wrap(attachment_files.get(id, []))), 200
+
+
+@api_bp.route('/v1/assignment-solutions/<id>/files', methods=['GET'])
+def files(id):
+    return jsonify(wrap(solution_files.get(id, []))), 200
+
+
+@api_bp.route('/v1/assignment-solutions/<id>', methods=['POST'])
+def update_solution(id):
+    solution = find_solution(id)
+    if solution is None:
+        return jsonify({"success": False, "code": 404, "error": {"message": "The solution does not exist"}}), 404
+    solution["note"] = request.get_json()["note"]
+    return jsonify(wrap(solution)), 200
@@ -1,25 +1,106 @@
-from flask import Blueprint, jsonify
+import hashlib
+import itertools
+from flask import Blueprint, Response, jsonify, request
 from ..utils.success_wrapper import wrap
 from ..utils import constants
 
 api_bp = Blueprint('files', __name__)
 
+# the states of the partial uploads by their IDs (the uploads of the submit plugin run concurrently)
+partial_uploads = {}
+# the content of the completed uploads (the test file is uploaded by default)
+with open(constants.uploadTestFilePath, "rb") as handle:
+    uploaded_files = {constants.uuid: handle.read()}
+upload_ids = itertools.count(1)
+
 
 @api_bp.route('/v1/uploaded-files/partial', methods=['POST'])
 def start_partial():
-    return jsonify(wrap({"id": constants.uuid})), 200
+    id = f"10000000-2000-4000-8000-2{next(upload_ids):011d}"
+    partial_uploads[id] = {"name": request.get_json()["name"], "content": bytearray(), "interrupted": False}
+    return jsonify(wrap({"id": id})), 200
 
 
 @api_bp.route('/v1/uploaded-files/partial/<id>', methods=['PUT'])
 def append_partial(id):
-    return jsonify(wrap({"id": constants.uuid})), 200
+    offset = int(request.args["offset"])
+    partial_upload = partial_uploads[id]
+
+    # the upload of files with this prefix fails once after the first chunk (to test resumption)
+    if partial_upload["name"].startswith("interrupted") and offset > 0 and not partial_upload["interrupted"]:
+        partial_upload["interrupted"] = True
+        return jsonify({"success": False, "code": 500, "error": {"message": "Connection lost"}}), 500
+
+    # the chunks are appended, the offset only verifies that they are sent in order
+    if offset != len(partial_upload["content"]):
+        return jsonify({"success": False, "code": 400, "error": {"message": "The offset does not match"}}), 400
+    partial_upload["content"] += request.get_data()
+    return jsonify(wrap({"id": id})), 200
 
 
 @api_bp.route('/v1/uploaded-files/partial/<id>', methods=['POST'])
 def complete_partial(id):
-    return jsonify(wrap({"id": constants.uuid})), 200
+    partial_upload = partial_uploads.pop(id)
+
+    # the solutions (see submit_mocks.py) get their own IDs, the other files replace the default file
+    file_id = constants.uuid
+    if partial_upload["name"].startswith("solution"):
+        file_id = f"10000000-2000-4000-8000-3{next(upload_ids):011d}"
+    uploaded_files[file_id] = bytes(partial_upload["content"])
+    return jsonify(wrap({"id": file_id})), 200
 
 
 @api_bp.route('/v1/uploaded-files/<id>/digest', methods=['GET'])
 def digest(id):
-    return jsonify(wrap({"digest": constants.uploadTestFileSHA1})), 200
+    if id == constants.largeFileId:
+        hash = hashlib.sha1()
+        for block in generate_large_file(constants.largeFileSize):
+            hash.update(block)
+        return jsonify(wrap({"digest": hash.hexdigest()})), 200
+
+    return jsonify(wrap({"digest": hashlib.sha1(uploaded_files.get(id, b"")).hexdigest()})), 200
+
+
+@api_bp.route('/v1/uploaded-files/<id>', methods=['GET'])
+def detail(id):
+    name = "large.bin" if id == constants.largeFileId else "uploadTestFile.txt"
+    return jsonify(wrap({"id": id, "name": name})), 200
+
+
+def generate_large_file(size, start=0):
+    # deterministic content, so that the digest can be computed by the tests
+    block = bytes(range(256)) * 512
+    offset = start
+    while offset < size:
+        begin = offset % len(block)
+        piece = block[begin:begin + min(len(block) - begin, size - offset)]
+        yield piece
+        offset += len(piece)
+
+
+def get_range_start():
+    # only the 'bytes=<start>-' ranges are supported
+    range_header = request.headers.get("Range", "")
+    if range_header.startswith("bytes=") and range_header.endswith("-"):
+        return int(range_header[len("bytes="):-1])
+    return None
+
+
+@api_bp.route('/v1/uploaded-files/<id>/download', methods=['GET'])
+def download(id):
+    size = constants.largeFileSize if id == constants.largeFileId else len(uploaded_files.get(id, b""))
+    start = get_range_start()
+    if start is not None and start >= size:
+        return jsonify({"success": False, "code": 416}), 416
+
+    if id == constants.largeFileId:
+        content = generate_large_file(size, start or 0)
+    else:
+        content = uploaded_files.get(id, b"")[start or 0:]
+
+    headers = {"Content-Length": str(size - (start or 0)), "Accept-Ranges": "bytes"}
+    if start is None:
+        return Response(content, mimetype="application/octet-stream", headers=headers)
+
+    headers["Content-Range"] = f"bytes {start}-{size - 1}/{size}"
+    return Response(content, status=206, mimetype="application/octet-stream", headers=headers)
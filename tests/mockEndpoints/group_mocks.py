@@ -1,4 +1,4 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, jsonify
 from ..utils.success_wrapper import wrap
 from ..utils import constants
 
@@ -7,8 +7,40 @@ api_bp = Blueprint('groups', __name__)
 
 @api_bp.route('/v1/groups', methods=['GET'])
 def get_group():
-    return jsonify(wrap([
+    groups = [
         {
             "id": constants.uuid,
         }
-    ])), 200
+    ]
+    # the additional groups make the response arbitrarily large (for the benchmarks)
+    groups += [
+        {
+            "id": f"10000000-2000-4000-8000-{index:012d}",
+            "name": f"Group {index}",
+            "description": "A generated group of the mock server. " * 4,
+            "memberIds": [f"10000000-2000-4000-8000-{member:012d}" for member in range(10)],
+            "public": index % 2 == 0,
+            "points": index * 1.5,
+        }
+        for index in range(1, current_app.config["MOCK_GROUP_COUNT"])
+    ]
+    return jsonify(wrap(groups)), 200
+
+
+# the number of requests for the flaky group
+flaky_requests = 0
+
+
+@api_bp.route('/v1/groups/<id>', methods=['GET'])
+def get_group_detail(id):
+    global flaky_requests
+
+    # the flaky group fails twice in every three requests, the unavailable group always fails
+    if id == constants.flakyGroupId:
+        flaky_requests += 1
+        if flaky_requests % 3 != 0:
+            return jsonify({"success": False, "code": 503}), 503, {"Retry-After": "0"}
+    elif id == constants.unavailableGroupId:
+        return jsonify({"success": False, "code": 503}), 503
+
+    return jsonify(wrap({"id": id})), 200
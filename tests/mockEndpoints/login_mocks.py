@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify
 import time
 import jwt
+from ..utils import constants
 
 api_bp = Blueprint('login', __name__)
 
@@ -10,6 +11,7 @@ def login():
     token = jwt.encode(
         {
             "test": "value",
+            "sub": constants.loggedUserId,
             "iat": time.time(),
             "exp": time.time() + 10000,
         },
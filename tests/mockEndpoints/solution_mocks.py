@@ -0,0 +1,42 @@
+from collections import Counter
+from flask import Blueprint, jsonify
+from ..utils.success_wrapper import wrap
+from ..utils import constants
+from . import export_mocks
+
+api_bp = Blueprint('solution', __name__)
+
+# the number of times each submission was polled (by any endpoint)
+submission_polls: Counter = Counter()
+
+
+def get_solution_id(submission_id: str) -> str:
+    # the submissions differing only in the last digit belong to the same solution
+    return "10000000-2000-4000-8000-8" + submission_id[len(constants.evaluatingSubmissionPrefix):-1] + "0"
+
+
+def poll_submission(submission_id: str) -> dict:
+    submission_polls[submission_id] += 1
+    evaluated = submission_polls[submission_id] >= constants.pollsUntilEvaluated
+    return {
+        "id": submission_id,
+        "assignmentSolutionId": get_solution_id(submission_id),
+        "evaluationStatus": "done" if evaluated else "work-in-progress",
+        "evaluation": {"score": 1, "points": 10} if evaluated else None,
+    }
+
+
+@api_bp.route('/v1/assignment-solutions/submission/<submissionId>', methods=['GET'])
+def submission(submissionId):
+    if not submissionId.startswith(constants.evaluatingSubmissionPrefix):
+        return jsonify({"success": False, "code": 404, "error": {"message": "The submission does not exist"}}), 404
+    return jsonify(wrap(poll_submission(submissionId))), 200
+
+
+@api_bp.route('/v1/assignment-solutions/<id>/submissions', methods=['GET'])
+def submissions(id):
+    if export_mocks.find_solution(id) is not None:
+        return jsonify(wrap(export_mocks.get_submissions(id))), 200
+    # only the submissions polled already are known
+    listed = [submission_id for submission_id in submission_polls if get_solution_id(submission_id) == id]
+    return jsonify(wrap([poll_submission(submission_id) for submission_id in listed])), 200
@@ -0,0 +1,21 @@
+from flask import Blueprint, jsonify, request
+from ..utils.success_wrapper import wrap
+from ..utils import constants
+from . import file_mocks
+
+api_bp = Blueprint('submit', __name__)
+
+
+@api_bp.route('/v1/exercise-assignments/<id>/submit', methods=['POST'])
+def submit(id):
+    body = request.get_json()
+    if id == constants.closedAssignmentId:
+        return jsonify({"success": False, "code": 403, "error": {"message": "The deadline has passed"}}), 403
+
+    # the files need to be uploaded before the submission
+    if not isinstance(body.get("files"), list) or any(file not in file_mocks.uploaded_files for file in body["files"]):
+        return jsonify({"success": False, "code": 400, "error": {"message": "Unknown files"}}), 400
+    if not body.get("runtimeEnvironmentId"):
+        return jsonify({"success": False, "code": 400, "error": {"message": "Missing runtime"}}), 400
+
+    return jsonify(wrap({"submission": {"id": constants.submissionId, "assignmentId": id}})), 200
@@ -0,0 +1,26 @@
+from flask import Blueprint, jsonify, request
+from ..utils.success_wrapper import wrap
+from ..utils import constants
+
+api_bp = Blueprint('users', __name__)
+
+
+@api_bp.route('/v1/users', methods=['GET'])
+def get_users():
+    # a paginated list of users (the same structure as the real API)
+    offset = int(request.args.get("offset", 0))
+    limit = min(int(request.args["limit"]), constants.maxPageSize) if "limit" in request.args else constants.userCount
+    users = [
+        {"id": f"10000000-2000-4000-8000-{index:012d}", "name": f"User {index}"}
+        for index in range(offset, min(offset + limit, constants.userCount))
+    ]
+    response = jsonify(wrap({
+        "items": users,
+        "totalCount": constants.userCount,
+        "offset": offset,
+        "limit": limit,
+    }))
+
+    # the list supports conditional requests (304 Not Modified if the ETag matches)
+    response.add_etag()
+    return response.make_conditional(request)
@@ -1,21 +1,46 @@
-from flask import Flask
+import time
+from flask import Flask, current_app
 
 import logging
 log = logging.getLogger('werkzeug')
 log.setLevel(logging.ERROR)
 
 
-def create_app():
+def create_app(latency: float = 0.0, group_count: int = 1):
+    """Creates the mock server.
+
+    Args:
+        latency (float, optional): The artificial delay of every response (in seconds). Defaults to 0.0.
+        group_count (int, optional): The number of groups returned by the groups endpoint
+            (the size of a large response). Defaults to 1.
+    """
+
     app = Flask(__name__)
+    app.config["MOCK_LATENCY"] = latency
+    app.config["MOCK_GROUP_COUNT"] = group_count
+
+    @app.before_request
+    def delay():
+        # the settings can be changed while the server is running (see benchmark.py)
+        if current_app.config["MOCK_LATENCY"] > 0:
+            time.sleep(current_app.config["MOCK_LATENCY"])
 
     # register mock modules
     from .mockEndpoints import group_mocks
     from .mockEndpoints import login_mocks
     from .mockEndpoints import file_mocks
     from .mockEndpoints import registration_mocks
+    from .mockEndpoints import user_mocks
+    from .mockEndpoints import submit_mocks
+    from .mockEndpoints import solution_mocks
+    from .mockEndpoints import export_mocks
     app.register_blueprint(group_mocks.api_bp)
     app.register_blueprint(login_mocks.api_bp)
     app.register_blueprint(file_mocks.api_bp)
     app.register_blueprint(registration_mocks.api_bp)
+    app.register_blueprint(user_mocks.api_bp)
+    app.register_blueprint(submit_mocks.api_bp)
+    app.register_blueprint(solution_mocks.api_bp)
+    app.register_blueprint(export_mocks.api_bp)
 
     return app
@@ -14,6 +14,42 @@
   [[ "$output" =~ "$expected_uuid" ]]
 }
 
+@test "minimized output is passed through" {
+  # the response bytes are written as they are, both to stdout and to the output file
+  run python3 -m recodex_cli call groups.default --minimized --out-path "$BATS_TMPDIR/minimized.json"
+  [ "$status" -eq 0 ]
+  local saved="$(cat "$BATS_TMPDIR/minimized.json")"
+  rm "$BATS_TMPDIR/minimized.json"
+
+  run python3 -m recodex_cli call groups.default --minimized
+  [ "$status" -eq 0 ]
+  [ "$output" == "$saved" ]
+  [[ "$output" =~ '"id":"10000000-2000-4000-8000-160000000000"' ]]
+}
+
+@test "upload binary file with read-ahead" {
+  # the mock server rejects the chunks sent out of order, the digest check fails if any chunk got corrupted
+  head -c 1000000 /dev/urandom > "$BATS_TMPDIR/binary.bin"
+  run python3 -m recodex_cli file upload "$BATS_TMPDIR/binary.bin" --read-ahead 4 --verbose
+  rm "$BATS_TMPDIR/binary.bin"
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "Server and client file digests match" ]]
+}
+
+@test "resume interrupted upload" {
+  # the mock server fails the second chunk of this file once
+  head -c 300000 /dev/urandom > "$BATS_TMPDIR/interrupted.bin"
+  run python3 -m recodex_cli file upload "$BATS_TMPDIR/interrupted.bin"
+  [ "$status" -ne 0 ]
+
+  run python3 -m recodex_cli file upload "$BATS_TMPDIR/interrupted.bin" --resume --verbose
+  rm "$BATS_TMPDIR/interrupted.bin"
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "Resuming partial upload" ]]
+  [[ "$output" =~ "Skipping 1 chunks sent before" ]]
+  [[ "$output" =~ "Server and client file digests match" ]]
+}
+
 @test "upload file" {
   # check that the response contains the file uuid
   local expected_uuid="10000000-2000-4000-8000-160000000000"
@@ -23,6 +59,165 @@
   [[ "$output" =~ "$expected_uuid" ]]
 }
 
+@test "upload file reuses connections" {
+  # all four requests of the upload (start, chunk, complete, digest) share the connection pool
+  run python3 -m recodex_cli file upload tests/utils/uploadTestFile.txt --verbose
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "Connection pool: 4 requests, 3 hits, 1 misses" ]]
+}
+
+@test "download file" {
+  run python3 -m recodex_cli file download 10000000-2000-4000-8000-160000000000
+  [ "$status" -eq 0 ]
+  [ "$output" == "$(cat tests/utils/uploadTestFile.txt)" ]
+}
+
+@test "download large file in constant memory" {
+  # the 128 MiB file is streamed to the disk, so the peak memory of the process is lower than the file size
+  run python3 -c '
+import resource, subprocess, sys
+subprocess.run([sys.executable, "-m", "recodex_cli", "file", "download", "10000000-2000-4000-8000-170000000000",
+                "--out-path", sys.argv[1]], check=True)
+peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // 1024
+print(f"peak memory {peak} MiB")
+assert peak < 100
+' "$BATS_TMPDIR/large.bin"
+  [ "$status" -eq 0 ]
+  [ "$(stat -c %s "$BATS_TMPDIR/large.bin")" -eq 134217728 ]
+  rm "$BATS_TMPDIR/large.bin"
+}
+
+@test "resume download" {
+  # only the rest of the file is requested, the complete file is verified and renamed
+  printf "cont" > "$BATS_TMPDIR/resumed.txt.part"
+  run python3 -m recodex_cli file download 10000000-2000-4000-8000-160000000000 \
+    --out-path "$BATS_TMPDIR/resumed.txt" --resume --verbose
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "Resuming the download from 4 bytes" ]]
+  [ "$(cat "$BATS_TMPDIR/resumed.txt")" == "$(cat tests/utils/uploadTestFile.txt)" ]
+  [ ! -e "$BATS_TMPDIR/resumed.txt.part" ]
+  rm "$BATS_TMPDIR/resumed.txt"
+}
+
+@test "failed download digest" {
+  # the corrupted part file is detected by the digest and removed
+  printf "XXXX" > "$BATS_TMPDIR/corrupted.txt.part"
+  run python3 -m recodex_cli file download 10000000-2000-4000-8000-160000000000 \
+    --out-path "$BATS_TMPDIR/corrupted.txt" --resume
+  [ "$status" -ne 0 ]
+  [[ "$output" =~ "does not match the server" ]]
+  [ ! -e "$BATS_TMPDIR/corrupted.txt" ]
+  [ ! -e "$BATS_TMPDIR/corrupted.txt.part" ]
+}
+
+@test "download many files" {
+  # the IDs are read from stdin, the names are taken from the file details
+  local out_dir="$BATS_TMPDIR/download-many"
+  rm -rf "$out_dir"
+  run bash -c "printf '10000000-2000-4000-8000-160000000000\n10000000-2000-4000-8000-170000000000\n' \
+    | python3 -m recodex_cli file download-many --out-dir '$out_dir' --name-template '{name}' --jobs 2"
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "2 files downloaded (0 skipped, 0 failed)" ]]
+  [ "$(cat "$out_dir/uploadTestFile.txt")" == "$(cat tests/utils/uploadTestFile.txt)" ]
+  [ "$(stat -c %s "$out_dir/large.bin")" -eq 134217728 ]
+
+  # the files with a matching digest are not downloaded again
+  run python3 -m recodex_cli file download-many 10000000-2000-4000-8000-160000000000 \
+    --out-dir "$out_dir" --name-template '{name}'
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ '"status": "skipped"' ]]
+
+  # a modified file is downloaded again (and verified by the digest fetched for the comparison)
+  echo "modified" > "$out_dir/uploadTestFile.txt"
+  run python3 -m recodex_cli file download-many 10000000-2000-4000-8000-160000000000 \
+    --out-dir "$out_dir" --name-template '{name}'
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ '"status": "downloaded"' ]]
+  [ "$(cat "$out_dir/uploadTestFile.txt")" == "$(cat tests/utils/uploadTestFile.txt)" ]
+
+  # the files with the same name are never downloaded into the same path
+  run python3 -m recodex_cli file download-many 10000000-2000-4000-8000-160000000000 \
+    10000000-2000-4000-8000-a00000000031 --out-dir "$out_dir" --name-template '{name}'
+  [ "$status" -eq 0 ]
+  [ "$(cat "$out_dir/uploadTestFile-10000000-2000-4000-8000-160000000000.txt")" == "$(cat tests/utils/uploadTestFile.txt)" ]
+  [ "$(cat "$out_dir/uploadTestFile-10000000-2000-4000-8000-a00000000031.txt")" == "the content of 10000000-2000-4000-8000-a00000000031" ]
+  rm -rf "$out_dir"
+}
+
+@test "submit solutions" {
+  mkdir -p "$BATS_TMPDIR/solutions"
+  echo "int main() {}" > "$BATS_TMPDIR/solutions/solution.c"
+  head -c 300000 /dev/urandom > "$BATS_TMPDIR/solutions/solution.bin"
+  local manifest="$BATS_TMPDIR/solutions/manifest.jsonl"
+  echo '{"assignment": "10000000-2000-4000-8000-100000000000", "files": ["solution.c", "solution.bin"], "runtime": "c"}' > "$manifest"
+  echo '{"assignment": "10000000-2000-4000-8000-100000000001", "files": ["solution.c"]}' >> "$manifest"
+
+  run python3 -m recodex_cli submit batch "$manifest" --dry-run
+  [ "$status" -ne 0 ]
+  [[ "$output" =~ '"line": 1, "assignment": "10000000-2000-4000-8000-100000000000", "status": "checked"' ]]
+  [[ "$output" =~ "\"line\": 2, \"error\": \"The 'runtime' key is missing" ]]
+
+  # every solution is submitted as soon as its files are uploaded, the failures do not stop the others
+  echo '{"assignment": "10000000-2000-4000-8000-600000000001", "files": ["solution.c"]}' >> "$manifest"
+  run python3 -m recodex_cli submit batch "$manifest" --runtime python3 --jobs 4 --verbose
+  rm -r "$BATS_TMPDIR/solutions"
+  [ "$status" -ne 0 ]
+  [ "$(echo "$output" | grep -c '"status": "submitted", .*"submission": "10000000-2000-4000-8000-600000000000"')" -eq 2 ]
+  [[ "$output" =~ "The deadline has passed" ]]
+  [[ "$output" =~ "2 solutions submitted (1 failed)." ]]
+}
+
+@test "watch evaluations" {
+  # the mock counts the polls of each submission, so every run watches new submissions
+  local run_id=$(printf "%09d" $(( (RANDOM * 32768 + RANDOM) % 1000000000 )))
+  local prefix="10000000-2000-4000-8000-7${run_id}"
+  local solution="10000000-2000-4000-8000-8${run_id}"
+  # the first polls are sent one by one, then the three submissions of the same solution are polled
+  # by a single request (4 + 2 requests)
+  run bash -c "printf '${prefix}01 ${prefix}02\n${prefix}03 ${prefix}11\n' | python3 -m recodex_cli watch --interval 0.1 --verbose"
+  [ "$status" -eq 0 ]
+  [ "$(echo "$output" | grep -c '"status": "work-in-progress"')" -eq 4 ]
+  [ "$(echo "$output" | grep -c "\"status\": \"done\", \"solution\": \"${solution}00\", \"score\": 1, \"points\": 10")" -eq 3 ]
+  [ "$(echo "$output" | grep -c "\"status\": \"done\", \"solution\": \"${solution}10\", \"score\": 1, \"points\": 10")" -eq 1 ]
+  [[ "$output" =~ "4 evaluations finished (0 submissions could not be polled) in" ]]
+  [[ "$output" =~ "6 requests sent." ]]
+
+  run python3 -m recodex_cli watch "${prefix}21" 10000000-2000-4000-8000-900000000000 --interval 5 --timeout 0.5
+  [ "$status" -ne 0 ]
+  [[ "$output" =~ '"id": "10000000-2000-4000-8000-900000000000", "error": "The submission does not exist"' ]]
+  [[ "$output" =~ "1 of 2 evaluations did not finish in time." ]]
+}
+
+@test "export group" {
+  local out_dir="$BATS_TMPDIR/export"
+  local group="10000000-2000-4000-8000-a00000000000"
+  local solution="10000000-2000-4000-8000-a00000000021"
+  rm -rf "$out_dir"
+
+  run python3 -m recodex_cli export group "$group" "$out_dir" --jobs 4 --verbose
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "6 entities exported (0 unchanged), 5 files downloaded (0 unchanged), 0 failed." ]]
+  local files_dir="$out_dir/assignments/10000000-2000-4000-8000-a00000000002/solutions/10000000-2000-4000-8000-a00000000023/files"
+  [ "$(cat "$files_dir/sort-10000000-2000-4000-8000-a00000000033.py")" = "the content of 10000000-2000-4000-8000-a00000000033" ]
+  [ "$(cat "$files_dir/sort-10000000-2000-4000-8000-a00000000034.py")" = "the content of 10000000-2000-4000-8000-a00000000034" ]
+  [ -f "$out_dir/assignments/10000000-2000-4000-8000-a00000000001/solutions/$solution/submissions.json" ]
+  [[ "$(cat "$out_dir/manifest.json")" =~ '"updatedAt": 1700000000' ]]
+
+  # nothing changed, so only the lists are fetched again
+  run python3 -m recodex_cli export group "$group" "$out_dir" --verbose
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "0 entities exported (6 unchanged), 0 files downloaded (5 unchanged), 0 failed." ]]
+
+  # a changed solution is exported again (its file did not change), a deleted file is downloaded again
+  python3 -m recodex_cli call assignment_solutions.update_solution "$solution" --body "{\"note\": \"$(date +%s%N)\"}"
+  rm "$out_dir/assignments/10000000-2000-4000-8000-a00000000001/attachments/task.md"
+  run python3 -m recodex_cli export group "$group" "$out_dir" --verbose
+  rm -rf "$out_dir"
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "{\"type\": \"solution\", \"id\": \"$solution\"" ]]
+  [[ "$output" =~ "1 entities exported (5 unchanged), 1 files downloaded (4 unchanged), 0 failed." ]]
+}
+
 @test "failed validation" {
   # the command has a too long 'locale' parameter
   run python3 -m recodex_cli call registration.create_invitation --body '{"email":"name@domain.tld","firstName":"text","lastName":"text","instanceId":"10000000-2000-4000-8000-160000000000","titlesBeforeName":"text","titlesAfterName":"text","groups":["string"],"locale":"THIS TEXT IS TOO LONG","ignoreNameCollision":true}' 
@@ -38,6 +233,384 @@
   [ "$status" -eq 0 ]
 }
 
+@test "body file formats" {
+  # the format is detected from the extension (or the content), --body-format overrides it
+  printf '%s\n' 'email: name@domain.tld' 'firstName: text' 'lastName: text' 'instanceId: 10000000-2000-4000-8000-160000000000' \
+    'titlesBeforeName: text' 'titlesAfterName: text' 'groups: [string]' 'locale: en' 'ignoreNameCollision: true' > "$BATS_TMPDIR/body.yml"
+  run python3 -m recodex_cli call registration.create_invitation --body-path "$BATS_TMPDIR/body.yml" --verbose
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "Request body parsed in" ]]
+
+  run python3 -m recodex_cli call registration.create_invitation --body-path "$BATS_TMPDIR/body.yml" --body-format json
+  rm "$BATS_TMPDIR/body.yml"
+  [ "$status" -ne 0 ]
+  [[ "$output" =~ "The request body is not a valid JSON." ]]
+}
+
+@test "call batch" {
+  # the results are tagged with line numbers (the empty line is skipped)
+  local expected_uuid="10000000-2000-4000-8000-160000000000"
+
+  run bash -c "printf '%s\n' '{\"endpoint\":\"groups.default\"}' '' '{\"endpoint\":\"groups.default\",\"query\":{\"search\":\"Demo\"}}' | python3 -m recodex_cli call --batch - --jobs 2"
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "\"line\": 1" ]]
+  [[ "$output" =~ "\"line\": 3" ]]
+  [[ "$output" =~ "$expected_uuid" ]]
+}
+
+@test "failed call batch" {
+  # an unknown endpoint is reported with the line number, and the command fails
+  run bash -c "printf '%s\n' '{\"endpoint\":\"groups.default\"}' '{\"endpoint\":\"groups\"}' | python3 -m recodex_cli call --batch -"
+  [ "$status" -ne 0 ]
+  [[ "$output" =~ "\"line\": 2, \"error\"" ]]
+
+  # the number of jobs is validated before any request is sent
+  run python3 -m recodex_cli call --batch - --jobs 0 < /dev/null
+  [ "$status" -eq 2 ]
+  [[ "$output" =~ "Invalid value for '--jobs'" ]]
+
+  # the options of the output format are not silently ignored
+  run python3 -m recodex_cli call --batch - --return-yaml < /dev/null
+  [ "$status" -ne 0 ]
+  [[ "$output" =~ "always printed to stdout as NDJSON" ]]
+  run python3 -m recodex_cli call --batch - --out-path "$BATS_TMPDIR/batch.out" < /dev/null
+  [ "$status" -ne 0 ]
+  [ ! -e "$BATS_TMPDIR/batch.out" ]
+}
+
+@test "call batch with the async engine" {
+  # the same results as with the thread pool, the failed request does not stop the others
+  local expected_uuid="10000000-2000-4000-8000-160000000000"
+
+  run bash -c "printf '%s\n' '{\"endpoint\":\"groups.default\"}' '{\"endpoint\":\"groups\"}' '{\"endpoint\":\"users.default\",\"query\":{\"offset\":24}}' | python3 -m recodex_cli call --batch - --jobs 2 --async-engine"
+  [ "$status" -ne 0 ]
+  [[ "$output" =~ "\"line\": 1, \"status\": 200" ]]
+  [[ "$output" =~ "$expected_uuid" ]]
+  [[ "$output" =~ "\"line\": 2, \"error\"" ]]
+  [[ "$output" =~ "User 24" ]]
+}
+
+@test "validate batch" {
+  # the errors are reported with line numbers, nothing is sent to the server
+  run bash -c "printf '%s\n' '{\"endpoint\":\"groups.default\"}' '{\"endpoint\":\"groups.detail\"}' '{\"endpoint\":\"users.default\",\"query\":{\"offset\":\"x\",\"foo\":1}}' '{\"endpoint\":\"registration.create_invitation\",\"body\":{\"locale\":\"THIS TEXT IS TOO LONG\"}}' | python3 -m recodex_cli validate -"
+  [ "$status" -ne 0 ]
+  [[ "$output" =~ "Line 2: The following PATH parameter is missing: id." ]]
+  [[ "$output" =~ "Line 3: QUERY parameter 'offset': 'x' is not of type 'integer'" ]]
+  [[ "$output" =~ "Line 3: Unknown QUERY parameter: foo." ]]
+  [[ "$output" =~ "Line 4: Body" ]]
+  [[ ! "$output" =~ "Line 1:" ]]
+
+  run bash -c "printf '%s\n' '{\"endpoint\":\"groups.detail\",\"path\":[\"10000000-2000-4000-8000-160000000000\"]}' | python3 -m recodex_cli validate - --verbose"
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "Validated 1 requests (0 not valid)." ]]
+}
+
+@test "call all pages" {
+  # 25 users are fetched in 3 pages and printed one per line
+  run python3 -m recodex_cli call users.default --all-pages --page-size 10 --verbose
+  [ "$status" -eq 0 ]
+  [ "$(echo "$output" | grep -c '"name": "User')" -eq 25 ]
+  [[ "$output" =~ "Fetched 25 items in 3 pages." ]]
+
+  run python3 -m recodex_cli call users.default --all-pages --page-size 10 --max-items 12 --query offset=5
+  [ "$status" -eq 0 ]
+  [ "${#lines[@]}" -eq 12 ]
+  [[ "${lines[0]}" =~ "User 5" ]]
+  [[ "${lines[11]}" =~ "User 16" ]]
+
+  # the server caps the size of the pages, the total count tells that more items remain
+  run python3 -m recodex_cli call users.default --all-pages --page-size 25 --verbose
+  [ "$status" -eq 0 ]
+  [ "$(echo "$output" | grep -c '"name": "User')" -eq 25 ]
+  [[ "$output" =~ "Fetched 25 items in 2 pages." ]]
+}
+
+@test "select and where" {
+  # only the selected fields of the matching users are serialized
+  run python3 -m recodex_cli call users.default --select 'payload.items[].{id,name}' --where 'name~User 1' --minimized
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ '{"id":"10000000-2000-4000-8000-000000000010","name":"User 10"}' ]]
+  [[ ! "$output" =~ "User 2" ]]
+  [[ ! "$output" =~ "totalCount" ]]
+
+  run python3 -m recodex_cli call users.default --select 'payload.items[0].name' --return-yaml
+  [ "$status" -eq 0 ]
+  [[ "${lines[0]}" == "User 0" ]]
+
+  # the projection is applied to every item of all pages
+  run python3 -m recodex_cli call users.default --all-pages --page-size 10 --select name --where 'name>User 7'
+  [ "$status" -eq 0 ]
+  [ "${#lines[@]}" -eq 2 ]
+  [[ "${lines[1]}" == '"User 9"' ]]
+
+  run python3 -m recodex_cli call users.default --where 'name=User 1'
+  [ "$status" -ne 0 ]
+
+  # the projection is applied to every response of a batch, the responses that cannot be projected fail
+  run bash -c "printf '%s\n' '{\"endpoint\":\"groups.default\"}' '{\"endpoint\":\"users.default\"}' \
+    | python3 -m recodex_cli call --batch - --where 'id=10000000-2000-4000-8000-160000000000'"
+  [ "$status" -ne 0 ]
+  [[ "$output" =~ '{"line": 1, "status": 200, "response": {"code": 200, "payload": [{"id": "10000000-2000-4000-8000-160000000000"}]' ]]
+  [[ "$output" =~ '{"line": 2, "error": "The --where conditions can be applied only to a list' ]]
+}
+
+@test "response cache" {
+  python3 -m recodex_cli cache clear
+
+  run python3 -m recodex_cli call users.default --cache-ttl 60 --verbose
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "Response cache: 0 hits, 0 revalidated, 1 misses" ]]
+
+  run python3 -m recodex_cli call users.default --cache-ttl 60 --verbose
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "User 24" ]]
+  [[ "$output" =~ "Response cache: 1 hits, 0 revalidated, 0 misses" ]]
+
+  # an outdated response is revalidated by its ETag
+  run python3 -m recodex_cli call users.default --cache-ttl 0 --verbose
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "User 24" ]]
+  [[ "$output" =~ "Response cache: 0 hits, 1 revalidated, 0 misses" ]]
+
+  run python3 -m recodex_cli cache stats
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "entries: 1" ]]
+
+  run python3 -m recodex_cli cache clear
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "1 cached responses removed" ]]
+}
+
+@test "response cache evicts least recently used" {
+  run python3 -c '
+import sys, time
+from pathlib import Path
+from recodex_cli.utils.response_cache import ResponseCache
+cache = ResponseCache(Path(sys.argv[1]), max_size=2500)
+for key in ["a", "b", "c"]:
+    cache.put(key, 200, "OK", {}, b"x" * 1000)
+    time.sleep(0.01)
+    cache.get("a")
+assert cache.get("a") is not None and cache.get("b") is None and cache.get("c") is not None
+' "$BATS_TMPDIR/cache"
+  [ "$status" -eq 0 ]
+  rm -r "$BATS_TMPDIR/cache"
+}
+
+@test "retry failed requests" {
+  local flaky_id="10000000-2000-4000-8000-500000000000"
+  local unavailable_id="10000000-2000-4000-8000-500000000001"
+
+  # the flaky group fails twice before it succeeds
+  run python3 -m recodex_cli call groups.detail "$flaky_id" --verbose
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "$flaky_id" ]]
+  [[ "$output" =~ "2 retried requests" ]]
+
+  run python3 -m recodex_cli --retries 1 call groups.detail "$flaky_id"
+  [ "$status" -ne 0 ]
+  [[ "$output" =~ "503" ]]
+
+  # once the server failed 5 times in a row, the requests are not sent
+  run bash -c "for i in 1 2 3 4 5 6; do echo '{\"endpoint\":\"groups.detail\",\"path\":[\"$unavailable_id\"]}'; done | python3 -m recodex_cli --retries 0 call --batch - --jobs 1"
+  [ "$status" -ne 0 ]
+  [[ "$output" =~ "The server failed 5 times in a row" ]]
+}
+
+@test "rate limit" {
+  # 13 pages at 4 requests per second (4 of them are sent at once)
+  local started=$(date +%s%N)
+  run python3 -m recodex_cli --rate 4/s call users.default --all-pages --page-size 2
+  local elapsed=$(( ($(date +%s%N) - started) / 1000000 ))
+  [ "$status" -eq 0 ]
+  [ "${#lines[@]}" -eq 25 ]
+  [ "$elapsed" -ge 2000 ]
+
+  run python3 -m recodex_cli --rate 4/hour call groups.default
+  [ "$status" -ne 0 ]
+}
+
+@test "shell" {
+  # the commands are executed by one process, errors do not terminate the shell
+  local expected_uuid="10000000-2000-4000-8000-160000000000"
+
+  run bash -c "printf '%s\n' 'call groups' 'call groups.default --return-yaml' 'exit' | python3 -m recodex_cli shell"
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "<presenter.action> format" ]]
+  [[ "$output" =~ "- id: $expected_uuid" ]]
+}
+
+@test "daemon" {
+  local expected_uuid="10000000-2000-4000-8000-160000000000"
+
+  run python3 -m recodex_cli daemon start
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "Daemon started" ]]
+
+  # the output and the exit code of the forwarded commands are the same as without the daemon
+  run python3 -m recodex_cli call groups.default --minimized
+  local forwarded_status=$status forwarded_output=$output
+  run python3 -m recodex_cli call groups.detail invalid-id
+  local failed_status=$status
+  # the RECODEX_* variables of the client apply to the forwarded command
+  run env RECODEX_RATE=invalid python3 -m recodex_cli call groups.default --minimized
+  local env_status=$status env_output=$output
+
+  run python3 -m recodex_cli daemon stop
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "3 requests served" ]]
+
+  [ "$forwarded_status" -eq 0 ]
+  [[ "$forwarded_output" =~ "$expected_uuid" ]]
+  [ "$failed_status" -ne 0 ]
+  [ "$env_status" -ne 0 ]
+  [[ "$env_output" =~ "The rate 'invalid' needs to be" ]]
+
+  # without the daemon, the commands are executed in the process
+  run python3 -m recodex_cli daemon status
+  [ "$status" -eq 1 ]
+  run python3 -m recodex_cli call groups.default --minimized
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "$expected_uuid" ]]
+}
+
+@test "endpoint index" {
+  # a corrupted index is rebuilt from the swagger document and stored again
+  echo "corrupted" > ~/.local/share/recodex/endpoint_index.json
+  run python3 -m recodex_cli call groups.default
+  [ "$status" -eq 0 ]
+
+  run python3 -m recodex_cli info swagger --index-stats
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "up_to_date: True" ]]
+}
+
+@test "search endpoints" {
+  run python3 -m recodex_cli endpoints search grp mem --verbose
+  [ "$status" -eq 0 ]
+  [[ "${lines[0]}" =~ "groups.members" ]]
+  [[ "$output" =~ "groups.add_member" ]]
+  [[ "$output" =~ "Found 4 endpoints in" ]]
+
+  # the endpoint with the matching name is ranked before the ones with the same words
+  run python3 -m recodex_cli endpoints search groups.default --limit 1
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "groups.default" ]]
+  [ "${#lines[@]}" -eq 1 ]
+
+  run python3 -m recodex_cli endpoints search xyzzy
+  [ "$status" -ne 0 ]
+  [[ "$output" =~ "No endpoint matches the search." ]]
+}
+
+@test "cold start budget" {
+  # importing the CLI must not load the generated client, the swagger document, inquirer or rich
+  run python3 -c '
+import sys
+import recodex_cli.console
+heavy = [name for name in ["recodex.generated.swagger_client", "inquirer", "rich", "yaml"] if name in sys.modules]
+print(heavy)
+assert len(heavy) == 0
+'
+  [ "$status" -eq 0 ]
+
+  # the median import time of the console module in 5 new processes is within the budget
+  # (the startup of the interpreter itself is not measured)
+  run python3 -c '
+import sys, statistics, subprocess
+measure = "import time; started = time.perf_counter(); import recodex_cli.console; print(time.perf_counter() - started)"
+times = [float(subprocess.check_output([sys.executable, "-c", measure])) * 1000 for _ in range(5)]
+median = statistics.median(times)
+print(f"{median:.1f} ms")
+assert median < 100
+'
+  [ "$status" -eq 0 ]
+}
+
+@test "shell completion budget" {
+  # the completion file is written whenever the endpoint index is loaded
+  rm -f ~/.local/share/recodex/endpoint_completion.json
+  run python3 -m recodex_cli endpoints search group
+  [ "$status" -eq 0 ]
+
+  # the endpoints and the QUERY parameters are completed without loading the generated client
+  local completion='
+import sys
+from recodex_cli import console
+try:
+    console.app(prog_name="recodex")
+except SystemExit:
+    pass
+heavy = [name for name in ["recodex.generated.swagger_client", "inquirer", "rich"] if name in sys.modules]
+print(heavy, file=sys.stderr)
+assert len(heavy) == 0
+'
+  _RECODEX_COMPLETE=complete_bash COMP_WORDS="recodex call groups.de" COMP_CWORD=2 run python3 -c "$completion"
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "groups.default" ]]
+  [[ "$output" =~ "groups.detail" ]]
+
+  _RECODEX_COMPLETE=complete_bash COMP_WORDS="recodex call users.default --query offset=1 --query " COMP_CWORD=6 \
+    run python3 -c "$completion"
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "limit=" ]]
+  [[ ! "$output" =~ "offset=" ]]
+
+  # the median time of the completion callbacks (including the load of the completion file,
+  # as every Tab press is a new process) is within the budget
+  run python3 -c '
+import time, types, statistics
+from recodex_cli import console
+from recodex_cli.utils import endpoint_completion
+
+def measure(complete):
+    times = []
+    for _ in range(10):
+        endpoint_completion._completion = None
+        started = time.perf_counter()
+        assert len(complete()) > 0
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+ctx = types.SimpleNamespace(params={"endpoint": "users.default", "query": ["offset=1"]}, args=[])
+endpoint_time = measure(lambda: endpoint_completion.complete_endpoint("groups."))
+query_time = measure(lambda: endpoint_completion.complete_query(ctx, ""))
+print(f"{endpoint_time:.1f} ms, {query_time:.1f} ms")
+assert endpoint_time < 50 and query_time < 50
+'
+  [ "$status" -eq 0 ]
+}
+
+@test "startup profile" {
+  run python3 -m recodex_cli --startup-profile --help
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "Startup profile:" ]]
+  [[ "$output" =~ "cumulative [ms]" ]]
+}
+
+@test "timings" {
+  run python3 -m recodex_cli call groups.default --timings
+  [ "$status" -eq 0 ]
+  [[ "$output" =~ "Timings:" ]]
+  [[ "$output" =~ "load_session" ]]
+  [[ "$output" =~ "serialize" ]]
+
+  # the trace holds one request span per line of the batch
+  run bash -c "printf '%s\n' '{\"endpoint\":\"groups.default\"}' '{\"endpoint\":\"users.default\"}' | python3 -m recodex_cli call --batch - --trace-out '$BATS_TMPDIR/trace.json'"
+  [ "$status" -eq 0 ]
+  run python3 -c "import json, sys; events = json.load(open(sys.argv[1]))['traceEvents']; print(sorted(e['args']['endpoint'] for e in events if e['name'] == 'request'))" "$BATS_TMPDIR/trace.json"
+  rm "$BATS_TMPDIR/trace.json"
+  [ "$output" = "['groups.default', 'users.default']" ]
+}
+
+@test "benchmark" {
+  # a minimal run of the benchmark suite (it starts its own mock server), the results are printed as JSON
+  run bash -c "python3 -m tests.benchmark --repeat 1 --scenarios call,serialization --group-count 100 2>/dev/null"
+  [ "$status" -eq 0 ]
+  run python3 -c "import json, sys; results = json.loads(sys.argv[1])['results']; print(sorted(results), sorted(results['serialization']))" "$output"
+  [ "$output" = "['call', 'serialization'] ['json', 'yaml']" ]
+}
+
 @test "logout" {
   run python3 -m recodex_cli logout
   [ "$status" -eq 0 ]
@@ -1,2 +1,31 @@
 uuid = "10000000-2000-4000-8000-160000000000"
 uploadTestFileSHA1 = "040f06fd774092478d450774f5ba30c5da78acc8"
+uploadTestFilePath = "tests/utils/uploadTestFile.txt"
+
+# the content of this file is generated by the mock server (it is too large to be stored)
+largeFileId = "10000000-2000-4000-8000-170000000000"
+largeFileSize = 128 * 2 ** 20
+
+# the number of users returned by the paginated users endpoint
+userCount = 25
+# the server returns at most this many users per page, even if a larger limit is requested
+maxPageSize = 20
+
+# the ID of the logged-in user (the subject of the issued tokens)
+loggedUserId = "10000000-2000-4000-8000-000000000000"
+
+# the groups whose details fail (see group_mocks.py)
+flakyGroupId = "10000000-2000-4000-8000-500000000000"
+unavailableGroupId = "10000000-2000-4000-8000-500000000001"
+
+# the submissions of the submit plugin (see submit_mocks.py)
+submissionId = "10000000-2000-4000-8000-600000000000"
+closedAssignmentId = "10000000-2000-4000-8000-600000000001"
+
+# the submissions watched by the watch command (see solution_mocks.py), the submissions differing only in the last
+# digit belong to the same solution and their evaluations are finished after the given number of polls
+evaluatingSubmissionPrefix = "10000000-2000-4000-8000-7"
+pollsUntilEvaluated = 2
+
+# the group mirrored by the export plugin (see export_mocks.py)
+exportGroupId = "10000000-2000-4000-8000-a00000000000"